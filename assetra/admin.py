@@ -4,6 +4,7 @@ from .models import (
     Asset,
     AssetCategory,
     AssetStateHistory,
+    AssetTombstone,
     BarcodeBatch,
     BarcodeLabel,
     BarcodeTemplate,
@@ -32,6 +33,7 @@ admin.site.register(Location)
 admin.site.register(AssetCategory)
 admin.site.register(Asset)
 admin.site.register(AssetStateHistory)
+admin.site.register(AssetTombstone)
 admin.site.register(ScanEvent)
 admin.site.register(InventorySession)
 admin.site.register(InventoryCountLine)
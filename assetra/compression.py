@@ -0,0 +1,84 @@
+"""Content-Encoding negotiation and bounded (de)compression for API payloads.
+
+gzip is always available; zstd needs the optional ``zstandard`` package.
+Request bodies are decompressed through a size cap, so a small compressed
+upload cannot expand without bound.
+"""
+
+import gzip
+import zlib
+
+try:
+    import zstandard
+except ImportError:  # zstd is optional; gzip is still negotiated.
+    zstandard = None
+
+IDENTITY = "identity"
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+_READ_CHUNK_BYTES = 64 * 1024
+
+
+class DecompressionError(ValueError):
+    """Raised when a request body is not valid data for its Content-Encoding."""
+
+
+class DecompressedSizeExceeded(DecompressionError):
+    """Raised when a request body expands past the configured limit."""
+
+
+def available_encodings() -> tuple[str, ...]:
+    """Return the supported content codings, most preferred first."""
+    return ("zstd", "gzip") if zstandard is not None else ("gzip",)
+
+
+def negotiate_encoding(accept_encoding: str) -> str | None:
+    """Pick the best supported coding from an ``Accept-Encoding`` header, or ``None`` for identity."""
+    weights = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        weight = 1.0
+        params = params.strip().lower()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[coding.strip().lower()] = weight
+    best, best_weight = None, 0.0
+    for coding in available_encodings():
+        weight = weights.get(coding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = coding, weight
+    return best
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    if encoding == "zstd" and zstandard is not None:
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    if encoding == "gzip":
+        # mtime=0 keeps the output deterministic for identical bodies.
+        return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+    raise ValueError(f"unsupported content coding: {encoding}")
+
+
+def decompress_stream(stream, encoding: str, max_size: int) -> bytes:
+    """Read and decode ``stream``, raising ``DecompressedSizeExceeded`` past ``max_size`` bytes."""
+    if encoding == "gzip":
+        reader = gzip.GzipFile(fileobj=stream, mode="rb")
+        errors = (OSError, EOFError, zlib.error)
+    elif encoding == "zstd" and zstandard is not None:
+        reader = zstandard.ZstdDecompressor().stream_reader(stream, read_across_frames=True)
+        errors = (zstandard.ZstdError,)
+    else:
+        raise ValueError(f"unsupported content coding: {encoding}")
+
+    data = bytearray()
+    try:
+        while chunk := reader.read(min(_READ_CHUNK_BYTES, max_size + 1 - len(data))):
+            data += chunk
+            if len(data) > max_size:
+                raise DecompressedSizeExceeded(f"decompressed body exceeds {max_size} bytes")
+    except errors as exc:
+        raise DecompressionError(f"invalid {encoding} body: {exc}") from exc
+    return bytes(data)
@@ -0,0 +1,228 @@
+"""GS1 element string decoding driven by a precomputed Application Identifier table.
+
+Both transfer forms are parsed in a single left-to-right pass:
+
+* the human-readable form, ``(01)09501101530003(17)250101(10)ABC``;
+* the raw scanner form, ``]C101095011015300031725010110ABC<GS>21X9``, where a GS
+  character (``\\x1d``, the transmitted FNC1) ends every variable-length
+  element that is not last. An optional symbology identifier (``]C1``,
+  ``]e0``, ``]d2``, ``]Q3``, ``]J1``) and leading GS are skipped.
+
+The AI length is resolved from the first two digits, which GS1 guarantees
+determine it, so the raw form needs no backtracking.
+"""
+
+import calendar
+import re
+from datetime import date
+from decimal import Decimal
+
+GS = "\x1d"
+SYMBOLOGY_IDENTIFIERS = ("]C1", "]e0", "]d2", "]Q3", "]J1")
+
+# Element formats: N numeric, X GS1 alphanumeric (CSET 82), D date YYMMDD,
+# M numeric measure with the implied decimal point in the AI's last digit,
+# I numeric count.
+NUMERIC, ALPHANUMERIC, DATE, MEASURE, COUNT = "N", "X", "D", "M", "I"
+
+
+class GS1Error(ValueError):
+    """Raised when an element string is not valid GS1."""
+
+
+class ApplicationIdentifier:
+    __slots__ = ("ai", "name", "length", "fixed", "kind", "check_digit")
+
+    def __init__(self, ai: str, name: str, length: int, *, fixed: bool, kind: str, check_digit: bool = False):
+        self.ai = ai
+        self.name = name
+        self.length = length
+        self.fixed = fixed
+        self.kind = kind
+        self.check_digit = check_digit
+
+
+def _fixed(ai: str, name: str, length: int, kind: str = NUMERIC, *, check_digit: bool = False) -> ApplicationIdentifier:
+    return ApplicationIdentifier(ai, name, length, fixed=True, kind=kind, check_digit=check_digit)
+
+
+def _variable(ai: str, name: str, length: int, kind: str = ALPHANUMERIC) -> ApplicationIdentifier:
+    return ApplicationIdentifier(ai, name, length, fixed=False, kind=kind)
+
+
+def _build_ai_table() -> dict[str, ApplicationIdentifier]:
+    definitions = [
+        _fixed("00", "sscc", 18, check_digit=True),
+        _fixed("01", "gtin", 14, check_digit=True),
+        _fixed("02", "content_gtin", 14, check_digit=True),
+        _variable("10", "lot", 20),
+        _fixed("11", "production_date", 6, DATE),
+        _fixed("12", "due_date", 6, DATE),
+        _fixed("13", "packaging_date", 6, DATE),
+        _fixed("15", "best_before", 6, DATE),
+        _fixed("16", "sell_by", 6, DATE),
+        _fixed("17", "expiry", 6, DATE),
+        _fixed("20", "variant", 2),
+        _variable("21", "serial", 20),
+        _variable("22", "consumer_product_variant", 20),
+        _variable("240", "additional_id", 30),
+        _variable("241", "customer_part_number", 30),
+        _variable("250", "secondary_serial", 30),
+        _variable("251", "source_entity_reference", 30),
+        _variable("30", "variable_count", 8, COUNT),
+        _variable("37", "count", 8, COUNT),
+        _variable("400", "order_number", 30),
+        _variable("401", "consignment_number", 30),
+        _fixed("402", "shipment_id", 17, check_digit=True),
+        _fixed("410", "ship_to_gln", 13, check_digit=True),
+        _fixed("411", "bill_to_gln", 13, check_digit=True),
+        _fixed("412", "purchased_from_gln", 13, check_digit=True),
+        _fixed("413", "ship_for_gln", 13, check_digit=True),
+        _fixed("414", "location_gln", 13, check_digit=True),
+        _fixed("415", "invoicing_party_gln", 13, check_digit=True),
+        _variable("420", "ship_to_postal_code", 20),
+        _fixed("422", "origin_country", 3),
+        _variable("8004", "giai", 30),
+        _fixed("8005", "price_per_unit", 6),
+        _variable("8020", "payment_slip_reference", 25),
+        _variable("90", "mutually_agreed", 30),
+    ]
+    for family, name in (("310", "net_weight_kg"), ("320", "net_weight_lb"), ("330", "gross_weight_kg"), ("311", "length_m")):
+        definitions += [_fixed(f"{family}{decimals}", name, 6, MEASURE) for decimals in range(6)]
+    definitions += [_variable(f"9{digit}", f"company_internal_{digit}", 90) for digit in range(1, 10)]
+    return {definition.ai: definition for definition in definitions}
+
+
+AI_TABLE = _build_ai_table()
+
+# AI length by its first two digits (GS1 General Specifications, figure 3.2-1);
+# unlisted prefixes are not assigned.
+AI_LENGTH_BY_PREFIX = {
+    **{f"{prefix:02d}": 2 for prefix in (0, 1, 2, 10, 11, 12, 13, 15, 16, 17, 20, 21, 22, 30, 37, *range(90, 100))},
+    **{f"{prefix:02d}": 3 for prefix in (23, 24, 25, 40, 41, 42)},
+    **{f"{prefix:02d}": 4 for prefix in (31, 32, 33, 34, 35, 36, 39, 43, 70, 71, 72, 80, 81, 82)},
+}
+
+_NUMERIC = re.compile(r"\d+")
+_CSET82 = re.compile(r"[!\"%&'()*+,\-./0-9:;<=>?A-Z_a-z]+")
+
+
+def gs1_check_digit(digits: str) -> int:
+    """Return the GS1 mod-10 check digit for ``digits`` (all digits before the check digit)."""
+    total = sum(int(digit) * (3 if index % 2 == 0 else 1) for index, digit in enumerate(reversed(digits)))
+    return (10 - total % 10) % 10
+
+
+def _parse_date(raw: str, today: date) -> date:
+    year, month, day = int(raw[:2]), int(raw[2:4]), int(raw[4:6])
+    # GS1 century rule: resolve YY to within 49 years behind / 50 years ahead of today.
+    century = today.year - today.year % 100
+    difference = year - today.year % 100
+    if difference >= 51:
+        century -= 100
+    elif difference <= -50:
+        century += 100
+    if not 1 <= month <= 12:
+        raise ValueError
+    year += century
+    return date(year, month, day or calendar.monthrange(year, month)[1])
+
+
+def _element_value(definition: ApplicationIdentifier, raw: str, today: date):
+    if not raw or len(raw) > definition.length or (definition.fixed and len(raw) != definition.length):
+        raise GS1Error(f"AI ({definition.ai}) expects {'' if definition.fixed else 'up to '}{definition.length} characters")
+    if definition.kind == ALPHANUMERIC:
+        if not _CSET82.fullmatch(raw):
+            raise GS1Error(f"AI ({definition.ai}) contains characters outside GS1 CSET 82")
+        return raw
+    if not _NUMERIC.fullmatch(raw):
+        raise GS1Error(f"AI ({definition.ai}) must be numeric")
+    if definition.check_digit and gs1_check_digit(raw[:-1]) != int(raw[-1]):
+        raise GS1Error(f"AI ({definition.ai}) has an invalid check digit")
+    if definition.kind == DATE:
+        try:
+            return _parse_date(raw, today)
+        except ValueError:
+            raise GS1Error(f"AI ({definition.ai}) is not a valid YYMMDD date") from None
+    if definition.kind == MEASURE:
+        return Decimal(raw).scaleb(-int(definition.ai[3]))
+    if definition.kind == COUNT:
+        return int(raw)
+    return raw
+
+
+def _lookup(ai: str) -> ApplicationIdentifier:
+    definition = AI_TABLE.get(ai)
+    if definition is None:
+        if not ai.isdigit() or AI_LENGTH_BY_PREFIX.get(ai[:2]) != len(ai):
+            raise GS1Error(f"unknown application identifier ({ai})")
+        # Assigned but not tabulated: keep the raw value under the AI itself.
+        definition = _variable(ai, ai, 90)
+    return definition
+
+
+def iter_elements(data: str):
+    """Yield ``(ApplicationIdentifier, raw_value)`` pairs from either transfer form in one pass.
+
+    ``data`` must not carry a symbology identifier. Values are not validated
+    beyond their framing; ``parse_gs1`` checks formats and check digits.
+    Encoders use ``ApplicationIdentifier.fixed`` to decide where an FNC1
+    separator is needed. Raises ``GS1Error`` on unknown AIs.
+    """
+    length = len(data)
+    position = 0
+    if data.startswith("("):
+        while position < length:
+            if data[position] != "(":
+                raise GS1Error(f"expected '(' at position {position}")
+            close = data.find(")", position)
+            if close == -1:
+                raise GS1Error("unterminated application identifier")
+            definition = _lookup(data[position + 1 : close])
+            if definition.fixed:
+                end = close + 1 + definition.length
+            else:
+                end = data.find("(", close + 1)
+                end = length if end == -1 else end
+            yield definition, data[close + 1 : end]
+            position = end
+        return
+
+    while position < length:
+        if data[position] == GS:
+            position += 1
+            continue
+        ai_length = AI_LENGTH_BY_PREFIX.get(data[position : position + 2])
+        if ai_length is None:
+            raise GS1Error(f"unknown application identifier at position {position}")
+        definition = _lookup(data[position : position + ai_length])
+        start = position + ai_length
+        if definition.fixed:
+            end = start + definition.length
+        else:
+            end = data.find(GS, start)
+            end = length if end == -1 else end
+        yield definition, data[start:end]
+        position = end
+
+
+def parse_gs1(data: str, *, today: date | None = None) -> dict:
+    """Decode a GS1 element string into ``{"ai": {ai: raw}, "fields": {name: typed value}}``.
+
+    Typed values are ``date`` for date AIs (``DD=00`` is the month's last day),
+    ``Decimal`` for measures, ``int`` for counts and ``str`` otherwise. Raises
+    ``GS1Error`` on unknown AIs, bad lengths, formats or check digits.
+    """
+    if data.startswith(SYMBOLOGY_IDENTIFIERS):
+        data = data[3:]
+    if not data:
+        raise GS1Error("empty GS1 element string")
+    today = today or date.today()
+    ais: dict[str, str] = {}
+    fields: dict[str, object] = {}
+    for definition, raw in iter_elements(data):
+        if definition.ai in ais:
+            raise GS1Error(f"AI ({definition.ai}) occurs more than once")
+        ais[definition.ai] = raw
+        fields[definition.name] = _element_value(definition, raw, today)
+    return {"ai": ais, "fields": fields}
@@ -0,0 +1,387 @@
+"""Label rendering: compiled ZPL templates and streamed PDF label sheets.
+
+A ZPL template is parsed once into literal segments and ``{{key}}`` slots, so
+rendering a label is a single ``str.join`` instead of one full-string replace
+per context key. ``\\{{`` renders a literal ``{{``; placeholders missing from
+the context are left in place, as ``render_zpl`` always did.
+"""
+
+import re
+import zlib
+from functools import lru_cache
+from pathlib import Path
+
+from django.conf import settings
+
+from .gs1 import SYMBOLOGY_IDENTIFIERS, iter_elements
+from .models import Asset, BarcodeBatch, BarcodeTemplate
+
+_PLACEHOLDER = re.compile(r"\\\{\{|\{\{([^{}]*)\}\}")
+
+
+class CompiledZPLTemplate:
+    __slots__ = ("segments", "slots")
+
+    def __init__(self, source: str):
+        segments: list[str] = []
+        slots: list[tuple[int, str]] = []
+        literal: list[str] = []
+        position = 0
+        for match in _PLACEHOLDER.finditer(source):
+            literal.append(source[position : match.start()])
+            key = match.group(1)
+            if key is None:
+                literal.append("{{")
+            else:
+                segments.append("".join(literal))
+                literal = []
+                slots.append((len(segments), key))
+                segments.append(match.group(0))
+            position = match.end()
+        literal.append(source[position:])
+        segments.append("".join(literal))
+        self.segments = segments
+        self.slots = tuple(slots)
+
+    def render(self, context: dict) -> str:
+        output = self.segments.copy()
+        for index, key in self.slots:
+            if key in context:
+                output[index] = str(context[key])
+        return "".join(output)
+
+
+@lru_cache(maxsize=512)
+def compile_zpl(source: str) -> CompiledZPLTemplate:
+    return CompiledZPLTemplate(source)
+
+
+@lru_cache(maxsize=512)
+def _compile_template_revision(pk: int, updated_at, source: str) -> CompiledZPLTemplate:
+    return CompiledZPLTemplate(source)
+
+
+def get_compiled_zpl_template(template: BarcodeTemplate) -> CompiledZPLTemplate:
+    """Return the template's compiled ZPL, recompiling only when ``updated_at`` changes.
+
+    Revisions live in a per-process LRU, so edited and deleted templates age
+    out instead of accumulating in long-lived workers.
+    """
+    return _compile_template_revision(template.pk, template.updated_at, template.zpl_template)
+
+
+# --- PDF label sheets -------------------------------------------------------
+#
+# Sheets are written by a minimal PDF 1.4 writer that yields one page at a time,
+# so memory stays flat regardless of batch size: labels are read with a
+# chunked iterator and only per-object byte offsets are kept for the xref table.
+
+try:
+    import segno
+except ImportError:  # QR glyphs are optional; labels fall back to their human-readable text.
+    segno = None
+
+PAGE_SIZES_PT = {"a4": (595.28, 841.89), "letter": (612.0, 792.0)}
+SHEET_MARGIN_PT = 28.35  # 10 mm
+LABEL_PADDING_PT = 4.0
+TEXT_SIZE_PT = 7.0
+LABEL_QUERY_CHUNK_SIZE = 2000
+
+# Code 128 bar/space widths for symbol values 0..106 (106 is the stop pattern).
+CODE128_PATTERNS = (
+    "212222 222122 222221 121223 121322 131222 122213 122312 132212 221213 "
+    "221312 231212 112232 122132 122231 113222 123122 123221 223211 221132 "
+    "221231 213212 223112 312131 311222 321122 321221 312212 322112 322211 "
+    "212123 212321 232121 111323 131123 131321 112313 132113 132311 211313 "
+    "231113 231311 112133 112331 132131 113123 113321 133121 313121 211331 "
+    "231131 213113 213311 213131 311123 311321 331121 312113 312311 332111 "
+    "314111 221411 431111 111224 111422 121124 121421 141122 141221 112214 "
+    "112412 122114 122411 142112 142211 241211 221114 413111 241112 134111 "
+    "111242 121142 121241 114212 124112 124211 411212 421112 421211 212141 "
+    "214121 412121 111143 111341 131141 114113 114311 411113 411311 113141 "
+    "114131 311141 411131 211412 211214 211232 2331112"
+).split()
+CODE128_START_B = 104
+CODE128_START_C = 105
+CODE128_FNC1 = 102
+CODE128_STOP = 106
+CODE128_QUIET_ZONE = 10
+
+
+class BarcodeGlyph:
+    """Barcode drawing operators in module units, scaled onto a label with one ``cm``.
+
+    Linear glyphs are one unit tall and stretched to the bar height; matrix
+    glyphs are ``width`` modules square.
+    """
+
+    __slots__ = ("kind", "width", "operators")
+
+    def __init__(self, kind: str, width: int, operators: bytes):
+        self.kind = kind
+        self.width = width
+        self.operators = operators
+
+
+def _code128_values(symbology: str, value: str) -> list[int]:
+    if symbology == "gs1":
+        return _gs1_128_values(value)
+    if value.isdigit() and len(value) % 2 == 0:
+        return [CODE128_START_C] + [int(value[index : index + 2]) for index in range(0, len(value), 2)]
+    return [CODE128_START_B] + [_code128_set_b(char) for char in value]
+
+
+def _gs1_128_values(value: str) -> list[int]:
+    # A leading FNC1 marks GS1-128; another one ends each variable-length element that is not last.
+    if value.startswith(SYMBOLOGY_IDENTIFIERS):
+        value = value[3:]
+    elements = list(iter_elements(value))
+    values = [CODE128_START_B, CODE128_FNC1]
+    for position, (definition, raw) in enumerate(elements, start=1):
+        values += [_code128_set_b(char) for char in definition.ai + raw]
+        if not definition.fixed and position < len(elements):
+            values.append(CODE128_FNC1)
+    return values
+
+
+def _code128_set_b(char: str) -> int:
+    code = ord(char)
+    if not 32 <= code <= 127:
+        raise ValueError(f"character {char!r} is not encodable in Code 128 set B")
+    return code - 32
+
+
+def _code128_glyph(symbology: str, value: str) -> BarcodeGlyph:
+    values = _code128_values(symbology, value)
+    checksum = (values[0] + sum(position * symbol for position, symbol in enumerate(values[1:], start=1))) % 103
+    rects = []
+    x = CODE128_QUIET_ZONE
+    for symbol in [*values, checksum, CODE128_STOP]:
+        for index, width in enumerate(CODE128_PATTERNS[symbol]):
+            width = int(width)
+            if index % 2 == 0:
+                rects.append(f"{x} 0 {width} 1 re")
+            x += width
+    return BarcodeGlyph("linear", x + CODE128_QUIET_ZONE, (" ".join(rects) + " f").encode("ascii"))
+
+
+def _qr_glyph(value: str) -> BarcodeGlyph | None:
+    if segno is None:
+        return None
+    rows = list(segno.make(value, error="m").matrix)
+    size = len(rows)
+    rects = []
+    for row_index, row in enumerate(rows):
+        y = size - row_index - 1
+        run_start = None
+        for column, dark in enumerate([*row, 0]):
+            if dark and run_start is None:
+                run_start = column
+            elif not dark and run_start is not None:
+                rects.append(f"{run_start} {y} {column - run_start} 1 re")
+                run_start = None
+    return BarcodeGlyph("matrix", size, (" ".join(rects) + " f").encode("ascii"))
+
+
+@lru_cache(maxsize=4096)
+def barcode_glyph(symbology: str, value: str) -> BarcodeGlyph | None:
+    """Return the cached glyph for ``value``, or None when the symbology cannot be drawn here."""
+    symbology = (symbology or "code128").lower()
+    if symbology == "qr":
+        return _qr_glyph(value)
+    if symbology in {"code128", "gs1"}:
+        try:
+            return _code128_glyph(symbology, value)
+        except ValueError:
+            return None
+    return None
+
+
+def _pdf_text(value: str) -> bytes:
+    escaped = value.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+    return escaped.encode("latin-1", "replace")
+
+
+class LabelSheetLayout:
+    """Grid of labels on a page, sized from a ``BarcodeTemplate`` (millimetres and printer dpi)."""
+
+    def __init__(self, *, width_mm, height_mm, dpi: int, page_size: str = "a4"):
+        self.page_width, self.page_height = PAGE_SIZES_PT[page_size]
+        self.label_width = float(width_mm) * 72 / 25.4
+        self.label_height = float(height_mm) * 72 / 25.4
+        self.dpi = dpi or 300
+        self.columns = max(int((self.page_width - 2 * SHEET_MARGIN_PT) // self.label_width), 1)
+        self.rows = max(int((self.page_height - 2 * SHEET_MARGIN_PT) // self.label_height), 1)
+        self.per_page = self.columns * self.rows
+
+    def label_operators(self, slot: int, glyph: BarcodeGlyph | None, text: str) -> bytes:
+        left = SHEET_MARGIN_PT + (slot % self.columns) * self.label_width
+        bottom = self.page_height - SHEET_MARGIN_PT - (slot // self.columns + 1) * self.label_height
+        inner_width = self.label_width - 2 * LABEL_PADDING_PT
+        text_y = bottom + LABEL_PADDING_PT
+        operators = [f"BT /F1 {TEXT_SIZE_PT} Tf {left + LABEL_PADDING_PT:.2f} {text_y:.2f} Td (".encode("ascii"), _pdf_text(text), b") Tj ET"]
+        if glyph is not None:
+            glyph_bottom = text_y + TEXT_SIZE_PT + 2
+            glyph_height = bottom + self.label_height - LABEL_PADDING_PT - glyph_bottom
+            # Snap modules to whole printer dots so bars print crisply at the template dpi.
+            dots = int(inner_width * self.dpi / 72 // glyph.width)
+            module = dots * 72 / self.dpi if dots else inner_width / glyph.width
+            if glyph.kind == "matrix":
+                module = min(module, glyph_height / glyph.width)
+                scale_y = module
+            else:
+                scale_y = glyph_height
+            operators.append(
+                f" q {module:.4f} 0 0 {scale_y:.4f} {left + LABEL_PADDING_PT:.2f} {glyph_bottom:.2f} cm ".encode("ascii")
+                + glyph.operators
+                + b" Q"
+            )
+        return b"".join(operators)
+
+
+def _pdf_object(number: int, body: bytes) -> bytes:
+    return b"%d 0 obj\n" % number + body + b"\nendobj\n"
+
+
+def iter_pdf_pages(page_contents, *, page_width: float, page_height: float):
+    """Yield a PDF document as bytes, one page per content stream from ``page_contents``.
+
+    Objects 1-3 are the catalog, page tree and font; the catalog and page tree
+    are written last, once the page count is known. Page ``n`` (0-based) uses
+    objects ``4 + 2n`` (content) and ``5 + 2n`` (page).
+    """
+    header = b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n"
+    offsets = [0, 0, 0]  # free entry, catalog and page tree; filled in at the end
+    position = len(header)
+    yield header
+
+    font = _pdf_object(3, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+    offsets.append(position)
+    position += len(font)
+    yield font
+
+    media_box = f"[0 0 {page_width:.2f} {page_height:.2f}]".encode("ascii")
+    page_count = 0
+    for content in page_contents:
+        data = zlib.compress(content)
+        content_number = len(offsets)
+        stream = _pdf_object(content_number, b"<< /Length %d /Filter /FlateDecode >>\nstream\n" % len(data) + data + b"\nendstream")
+        page = _pdf_object(
+            content_number + 1,
+            b"<< /Type /Page /Parent 2 0 R /MediaBox " + media_box + b" /Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_number,
+        )
+        offsets.append(position)
+        offsets.append(position + len(stream))
+        position += len(stream) + len(page)
+        page_count += 1
+        yield stream + page
+
+    kids = b" ".join(b"%d 0 R" % (5 + 2 * index) for index in range(page_count))
+    tail = []
+    offsets[2] = position
+    tail.append(_pdf_object(2, b"<< /Type /Pages /Kids [" + kids + b"] /Count %d >>" % page_count))
+    position += len(tail[-1])
+    offsets[1] = position
+    tail.append(_pdf_object(1, b"<< /Type /Catalog /Pages 2 0 R >>"))
+    position += len(tail[-1])
+
+    # offsets[0] stands in for the free-list head, so the table covers objects 0..len(offsets) - 1.
+    xref = [b"xref\n0 %d\n0000000000 65535 f \n" % len(offsets)]
+    xref.extend(b"%010d 00000 n \n" % offset for offset in offsets[1:])
+    tail.append(b"".join(xref))
+    tail.append(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(offsets), position))
+    yield b"".join(tail)
+
+
+def _label_sheet_pages(batch: BarcodeBatch, layout: LabelSheetLayout, symbology: str):
+    values = batch.labels.order_by("sequence", "id").values_list("code_value", flat=True).iterator(chunk_size=LABEL_QUERY_CHUNK_SIZE)
+    page: list[bytes] = []
+    for code_value in values:
+        page.append(layout.label_operators(len(page), barcode_glyph(symbology, code_value), code_value))
+        if len(page) == layout.per_page:
+            yield b"\n".join(page)
+            page = []
+    if page:
+        yield b"\n".join(page)
+
+
+def iter_label_sheet_pdf(batch: BarcodeBatch, *, page_size: str | None = None):
+    """Yield the batch's label sheet PDF page by page, laid out from its template."""
+    template = batch.template
+    layout = LabelSheetLayout(
+        width_mm=template.width_mm if template else 50,
+        height_mm=template.height_mm if template else 25,
+        dpi=template.dpi if template else 300,
+        page_size=page_size or settings.LABEL_SHEET_PAGE_SIZE,
+    )
+    symbology = template.symbology if template else Asset.BarcodeType.CODE128
+    yield from iter_pdf_pages(
+        _label_sheet_pages(batch, layout, symbology),
+        page_width=layout.page_width,
+        page_height=layout.page_height,
+    )
+
+
+def write_label_sheet_pdf(batch: BarcodeBatch, path) -> int:
+    """Stream the batch's label sheet into ``path`` (via a temporary file); return bytes written."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = path.with_name(path.name + ".partial")
+    written = 0
+    with partial.open("wb") as handle:
+        for chunk in iter_label_sheet_pdf(batch):
+            handle.write(chunk)
+            written += len(chunk)
+    partial.replace(path)
+    return written
+
+
+# --- ZPL print jobs ---------------------------------------------------------
+#
+# A print job is the batch's stored ``zpl_payload`` values concatenated in
+# sequence order. Jobs are addressed in whole labels rather than bytes, so a
+# print station can resume from the next label it has not yet printed.
+
+LABEL_RANGE_UNIT = "labels"
+
+
+def parse_label_range(header: str, first: int, last: int) -> tuple[int, int] | None:
+    """Resolve a ``labels=a-b`` / ``labels=a-`` / ``labels=-n`` Range header against ``first..last``.
+
+    Returns ``None`` when the header should be ignored (absent, another unit,
+    several ranges or malformed) and raises ``ValueError`` when it names no
+    label in the batch.
+    """
+    unit, _, spec = (header or "").partition("=")
+    match = re.fullmatch(r"\s*(\d*)-(\d*)\s*", spec)
+    if unit.strip() != LABEL_RANGE_UNIT or match is None or match.group(1) == match.group(2) == "":
+        return None
+    start, end = match.groups()
+    if not start:
+        start, end = max(last - int(end) + 1, first), last if int(end) else first - 1
+    else:
+        start, end = int(start), min(int(end), last) if end else last
+    if start > end or start < first:
+        raise ValueError("label range not satisfiable")
+    return start, end
+
+
+def iter_label_zpl(batch: BarcodeBatch, *, first: int | None = None, last: int | None = None):
+    """Yield the batch's ZPL payloads in sequence order, ``LABEL_QUERY_CHUNK_SIZE`` labels per chunk.
+
+    Rows are read through a server-side cursor and each payload is terminated
+    with a newline, so a chunk always ends on a label boundary.
+    """
+    labels = batch.labels.order_by("sequence", "id")
+    if first is not None:
+        labels = labels.filter(sequence__gte=first)
+    if last is not None:
+        labels = labels.filter(sequence__lte=last)
+    chunk: list[str] = []
+    for payload in labels.values_list("zpl_payload", flat=True).iterator(chunk_size=LABEL_QUERY_CHUNK_SIZE):
+        chunk.append(payload)
+        if len(chunk) == LABEL_QUERY_CHUNK_SIZE:
+            yield ("\n".join(chunk) + "\n").encode()
+            chunk = []
+    if chunk:
+        yield ("\n".join(chunk) + "\n").encode()
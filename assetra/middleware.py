@@ -4,9 +4,12 @@ import logging
 import time
 import uuid
 
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
 from django.utils.deprecation import MiddlewareMixin
 
-from assetra.observability import api_requests_total, api_request_duration_seconds
+from assetra.compression import IDENTITY, compress, negotiate_encoding
+from assetra.observability import api_requests_total, api_request_duration_seconds, sync_payload_bytes, sync_payload_decoded_bytes
 
 
 class RequestTrackingMiddleware(MiddlewareMixin):
@@ -72,3 +75,62 @@ class RequestTrackingMiddleware(MiddlewareMixin):
         )
         
         return response
+
+
+class PayloadCompressionMiddleware(MiddlewareMixin):
+    """Compress JSON responses of opted-in views and record payload sizes.
+
+    Views that set ``compress_payloads = True`` have JSON responses of at
+    least ``API_COMPRESSION_MIN_BYTES`` encoded with the best coding from
+    ``Accept-Encoding``; other responses are small or served on fast links, so
+    they are not worth the CPU. Views that set ``track_payload_sizes = True``
+    also report request and response sizes, compressed and decoded, to the
+    sync payload histograms.
+    """
+
+    compressible_media_types = ('application/json',)
+
+    def process_response(self, request, response):
+        track = self._view_flag(request, 'track_payload_sizes')
+        if track:
+            request_coding = request.META.get('HTTP_CONTENT_ENCODING', '').strip().lower() or IDENTITY
+            try:
+                wire_length = int(request.META.get('CONTENT_LENGTH') or 0)
+            except ValueError:
+                wire_length = 0
+            sync_payload_bytes.labels(direction='request', encoding=request_coding).observe(wire_length)
+            sync_payload_decoded_bytes.labels(direction='request').observe(getattr(request, 'decoded_content_length', wire_length))
+
+        if response.streaming or response.has_header('Content-Encoding'):
+            return response
+
+        compressible = self._view_flag(request, 'compress_payloads')
+        decoded_length = len(response.content)
+        coding = IDENTITY
+        media_type = response.get('Content-Type', '').split(';')[0].strip()
+        if compressible and media_type in self.compressible_media_types and decoded_length >= settings.API_COMPRESSION_MIN_BYTES:
+            patch_vary_headers(response, ('Accept-Encoding',))
+            coding = negotiate_encoding(request.META.get('HTTP_ACCEPT_ENCODING', '')) or IDENTITY
+            if coding != IDENTITY:
+                compressed = compress(response.content, coding)
+                if len(compressed) < decoded_length:
+                    response.content = compressed
+                    response.headers['Content-Encoding'] = coding
+                    response.headers['Content-Length'] = str(len(compressed))
+                    # The body's bytes changed, so a strong ETag no longer holds (as in GZipMiddleware).
+                    etag = response.get('ETag')
+                    if etag and etag.startswith('"'):
+                        response.headers['ETag'] = 'W/' + etag
+                else:
+                    coding = IDENTITY
+
+        if track:
+            sync_payload_bytes.labels(direction='response', encoding=coding).observe(len(response.content))
+            sync_payload_decoded_bytes.labels(direction='response').observe(decoded_length)
+        return response
+
+    @staticmethod
+    def _view_flag(request, name):
+        match = getattr(request, 'resolver_match', None)
+        view_class = getattr(match.func, 'view_class', None) if match else None
+        return getattr(view_class, name, False)
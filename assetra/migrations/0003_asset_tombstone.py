@@ -0,0 +1,26 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("assetra", "0002_webhook_reliability"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AssetTombstone",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("asset_id", models.BigIntegerField()),
+                ("asset_tag", models.CharField(max_length=80)),
+                ("reason", models.CharField(choices=[("deleted", "Deleted"), ("retired", "Retired")], max_length=20)),
+                ("tenant", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to="assetra.tenant")),
+            ],
+            options={
+                "unique_together": {("tenant", "asset_id")},
+            },
+        ),
+    ]
@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("assetra", "0003_asset_tombstone"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="scanevent",
+            name="pending_post_processing",
+            field=models.BooleanField(default=False),
+        ),
+    ]
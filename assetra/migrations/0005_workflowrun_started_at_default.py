@@ -0,0 +1,16 @@
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("assetra", "0004_scanevent_pending_post_processing"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="workflowrun",
+            name="started_at",
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+    ]
@@ -0,0 +1,29 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("assetra", "0005_workflowrun_started_at_default"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="workflowdefinition",
+            name="schedule_interval_seconds",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="workflowdefinition",
+            name="next_run_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="workflowdefinition",
+            name="schedule_cursor",
+            field=models.BigIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="workflowdefinition",
+            index=models.Index(fields=["trigger_type", "is_active", "next_run_at"], name="assetra_workflow_due_idx"),
+        ),
+    ]
@@ -0,0 +1,75 @@
+from django.db import migrations, models
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+BACKFILL_BATCH_SIZE = 2000
+
+
+def backfill_label_sequence(apps, schema_editor):
+    BarcodeLabel = apps.get_model("assetra", "BarcodeLabel")
+    labels = BarcodeLabel.objects.filter(sequence__isnull=True).only("id", "batch_id", "render_payload").order_by("batch_id", "id")
+    current_batch, seen, pending = None, set(), []
+    for label in labels.iterator(chunk_size=BACKFILL_BATCH_SIZE):
+        if label.batch_id != current_batch:
+            current_batch, seen = label.batch_id, set()
+        sequence = (label.render_payload or {}).get("sequence")
+        # Labels duplicated by an earlier retried generation keep a null sequence.
+        if isinstance(sequence, int) and sequence not in seen:
+            seen.add(sequence)
+            label.sequence = sequence
+            pending.append(label)
+        if len(pending) >= BACKFILL_BATCH_SIZE:
+            BarcodeLabel.objects.bulk_update(pending, ["sequence"])
+            pending = []
+    if pending:
+        BarcodeLabel.objects.bulk_update(pending, ["sequence"])
+
+
+def mark_existing_batches_completed(apps, schema_editor):
+    BarcodeBatch = apps.get_model("assetra", "BarcodeBatch")
+    BarcodeLabel = apps.get_model("assetra", "BarcodeLabel")
+    label_counts = BarcodeLabel.objects.filter(batch=OuterRef("pk")).order_by().values("batch").annotate(total=Count("id")).values("total")
+    BarcodeBatch.objects.update(
+        status="completed",
+        labels_generated=Coalesce(Subquery(label_counts), 0),
+        completed_at=F("generated_at"),
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("assetra", "0006_workflowdefinition_schedule"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="barcodebatch",
+            name="status",
+            field=models.CharField(
+                choices=[("pending", "Pending"), ("generating", "Generating"), ("completed", "Completed"), ("failed", "Failed")],
+                default="pending",
+                max_length=20,
+            ),
+        ),
+        migrations.AddField(
+            model_name="barcodebatch",
+            name="labels_generated",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="barcodebatch",
+            name="completed_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="barcodelabel",
+            name="sequence",
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_label_sequence, migrations.RunPython.noop),
+        migrations.RunPython(mark_existing_batches_completed, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="barcodelabel",
+            constraint=models.UniqueConstraint(fields=["batch", "sequence"], name="assetra_label_batch_sequence_uniq"),
+        ),
+    ]
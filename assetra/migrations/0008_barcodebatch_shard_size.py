@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("assetra", "0007_barcode_batch_progress"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="barcodebatch",
+            name="shard_size",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+    ]
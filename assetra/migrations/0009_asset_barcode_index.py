@@ -0,0 +1,14 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("assetra", "0008_barcodebatch_shard_size"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="asset",
+            index=models.Index(fields=["tenant", "barcode_value"], name="assetra_asset_barcode_idx"),
+        ),
+    ]
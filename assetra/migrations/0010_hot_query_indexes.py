@@ -0,0 +1,46 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("assetra", "0009_asset_barcode_index"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="asset",
+            index=models.Index(fields=["tenant", "updated_at", "id"], name="assetra_asset_sync_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="asset",
+            index=models.Index(fields=["tenant", "status"], name="assetra_asset_status_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="assettombstone",
+            index=models.Index(fields=["tenant", "updated_at", "id"], name="assetra_tombstone_sync_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="scanevent",
+            index=models.Index(fields=["tenant", "created_at"], name="assetra_scan_created_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="scanevent",
+            index=models.Index(fields=["tenant", "status"], name="assetra_scan_status_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="workflowdefinition",
+            index=models.Index(fields=["tenant", "is_active", "trigger_type"], name="assetra_workflow_active_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="workflowrun",
+            index=models.Index(fields=["tenant", "started_at"], name="assetra_run_started_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="workflowrun",
+            index=models.Index(fields=["tenant", "status"], name="assetra_run_status_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="webhookdelivery",
+            index=models.Index(fields=["status", "next_attempt_at"], name="assetra_delivery_retry_idx"),
+        ),
+    ]
@@ -0,0 +1,27 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("assetra", "0010_hot_query_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="asset",
+            index=models.Index(fields=["tenant", "id"], name="assetra_asset_page_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="scanevent",
+            index=models.Index(fields=["tenant", "id"], name="assetra_scan_page_idx"),
+        ),
+        # Run lists now page by -id, which never changes; started_at is reset when a run starts.
+        migrations.RemoveIndex(
+            model_name="workflowrun",
+            name="assetra_run_started_idx",
+        ),
+        migrations.AddIndex(
+            model_name="workflowrun",
+            index=models.Index(fields=["tenant", "id"], name="assetra_run_page_idx"),
+        ),
+    ]
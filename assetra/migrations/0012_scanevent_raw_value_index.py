@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("assetra", "0011_cursor_pagination_indexes"),
+    ]
+
+    operations = [
+        # Portal batches look up earlier reads of the same values inside the dedupe window.
+        migrations.AddIndex(
+            model_name="scanevent",
+            index=models.Index(fields=["tenant", "raw_value", "created_at"], name="assetra_scan_raw_value_idx"),
+        ),
+    ]
@@ -4,6 +4,7 @@ import uuid
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
 from django.db import models
+from django.utils import timezone
 
 User = get_user_model()
 
@@ -102,10 +103,39 @@ class Asset(TenantScopedModel):
 
     class Meta:
         unique_together = ("tenant", "asset_tag")
+        indexes = [
+            models.Index(fields=["tenant", "barcode_value"], name="assetra_asset_barcode_idx"),
+            models.Index(fields=["tenant", "updated_at", "id"], name="assetra_asset_sync_idx"),
+            models.Index(fields=["tenant", "status"], name="assetra_asset_status_idx"),
+            models.Index(fields=["tenant", "id"], name="assetra_asset_page_idx"),
+        ]
 
     def __str__(self) -> str:
         return self.asset_tag
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored barcode so a rename also evicts the old lookup cache entry.
+        instance._loaded_barcode_value = instance.__dict__.get("barcode_value")
+        return instance
+
+
+class AssetTombstone(TenantScopedModel):
+    """Compact record of an asset removed from offline stores, streamed through sync."""
+
+    class Reason(models.TextChoices):
+        DELETED = "deleted", "Deleted"
+        RETIRED = "retired", "Retired"
+
+    asset_id = models.BigIntegerField()
+    asset_tag = models.CharField(max_length=80)
+    reason = models.CharField(max_length=20, choices=Reason.choices)
+
+    class Meta:
+        unique_together = ("tenant", "asset_id")
+        indexes = [models.Index(fields=["tenant", "updated_at", "id"], name="assetra_tombstone_sync_idx")]
+
 
 class AssetStateHistory(TenantScopedModel):
     class EventType(models.TextChoices):
@@ -128,11 +158,14 @@ class AssetStateHistory(TenantScopedModel):
     new_state = models.JSONField(default=dict)
     checksum = models.CharField(max_length=64, editable=False)
 
+    def compute_checksum(self) -> str:
+        digest_payload = f"{self.asset_id}:{self.event_type}:{self.previous_state}:{self.new_state}"
+        return hashlib.sha256(digest_payload.encode("utf-8")).hexdigest()
+
     def save(self, *args, **kwargs):
         if self.pk:
             raise ValidationError("AssetStateHistory is immutable")
-        digest_payload = f"{self.asset_id}:{self.event_type}:{self.previous_state}:{self.new_state}"
-        self.checksum = hashlib.sha256(digest_payload.encode("utf-8")).hexdigest()
+        self.checksum = self.compute_checksum()
         return super().save(*args, **kwargs)
 
 
@@ -162,9 +195,17 @@ class ScanEvent(TenantScopedModel):
     synced_at = models.DateTimeField(null=True, blank=True)
     status = models.CharField(max_length=20, choices=ScanStatus.choices, default=ScanStatus.PENDING)
     validation_errors = models.JSONField(default=list, blank=True)
+    # Set while history/workflow stages are queued in the async scan pipeline.
+    pending_post_processing = models.BooleanField(default=False)
 
     class Meta:
         unique_together = ("tenant", "client_event_id")
+        indexes = [
+            models.Index(fields=["tenant", "created_at"], name="assetra_scan_created_idx"),
+            models.Index(fields=["tenant", "status"], name="assetra_scan_status_idx"),
+            models.Index(fields=["tenant", "id"], name="assetra_scan_page_idx"),
+            models.Index(fields=["tenant", "raw_value", "created_at"], name="assetra_scan_raw_value_idx"),
+        ]
 
 
 class InventorySession(TenantScopedModel):
@@ -222,6 +263,12 @@ class BarcodeTemplate(TenantScopedModel):
 
 
 class BarcodeBatch(TenantScopedModel):
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        GENERATING = "generating", "Generating"
+        COMPLETED = "completed", "Completed"
+        FAILED = "failed", "Failed"
+
     template = models.ForeignKey(BarcodeTemplate, null=True, blank=True, on_delete=models.SET_NULL)
     prefix = models.CharField(max_length=20, blank=True)
     start_sequence = models.IntegerField(default=1)
@@ -229,16 +276,29 @@ class BarcodeBatch(TenantScopedModel):
     payload_schema = models.JSONField(default=dict, blank=True)
     generated_by = models.ForeignKey(User, null=True, blank=True, on_delete=models.SET_NULL)
     generated_at = models.DateTimeField(auto_now_add=True)
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING)
+    labels_generated = models.PositiveIntegerField(default=0)
+    completed_at = models.DateTimeField(null=True, blank=True)
+    # Fixed the first time a batch is split so reruns produce the same shards.
+    shard_size = models.PositiveIntegerField(null=True, blank=True)
+
+    @property
+    def labels_total(self) -> int:
+        return max(self.end_sequence - self.start_sequence + 1, 0)
 
 
 class BarcodeLabel(TenantScopedModel):
     batch = models.ForeignKey(BarcodeBatch, on_delete=models.CASCADE, related_name="labels")
     asset = models.ForeignKey(Asset, null=True, blank=True, on_delete=models.SET_NULL)
+    sequence = models.IntegerField(null=True, blank=True)
     code_value = models.CharField(max_length=255)
     render_payload = models.JSONField(default=dict, blank=True)
     pdf_path = models.CharField(max_length=255, blank=True)
     zpl_payload = models.TextField(blank=True)
 
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=["batch", "sequence"], name="assetra_label_batch_sequence_uniq")]
+
 
 class NoCodeFormDefinition(TenantScopedModel):
     name = models.CharField(max_length=150)
@@ -261,6 +321,17 @@ class WorkflowDefinition(TenantScopedModel):
     entry_conditions = models.JSONField(default=dict, blank=True)
     steps = models.JSONField(default=list)
     is_active = models.BooleanField(default=True)
+    # ON_TIME workflows fire every schedule_interval_seconds; next_run_at is their due-time index
+    # and schedule_cursor the last asset id handled when a tick stopped at the tenant's run cap.
+    schedule_interval_seconds = models.PositiveIntegerField(null=True, blank=True)
+    next_run_at = models.DateTimeField(null=True, blank=True)
+    schedule_cursor = models.BigIntegerField(null=True, blank=True, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["trigger_type", "is_active", "next_run_at"], name="assetra_workflow_due_idx"),
+            models.Index(fields=["tenant", "is_active", "trigger_type"], name="assetra_workflow_active_idx"),
+        ]
 
 
 class WorkflowRun(TenantScopedModel):
@@ -277,9 +348,15 @@ class WorkflowRun(TenantScopedModel):
     context = models.JSONField(default=dict, blank=True)
     input_data = models.JSONField(default=dict, blank=True)
     output_data = models.JSONField(default=dict, blank=True)
-    started_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(default=timezone.now)
     completed_at = models.DateTimeField(null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["tenant", "id"], name="assetra_run_page_idx"),
+            models.Index(fields=["tenant", "status"], name="assetra_run_status_idx"),
+        ]
+
 
 class WebhookEndpoint(TenantScopedModel):
     class Direction(models.TextChoices):
@@ -314,6 +391,9 @@ class WebhookDelivery(TenantScopedModel):
     delivered_at = models.DateTimeField(null=True, blank=True)
     status = models.CharField(max_length=20, choices=DeliveryStatus.choices, default=DeliveryStatus.PENDING)
 
+    class Meta:
+        indexes = [models.Index(fields=["status", "next_attempt_at"], name="assetra_delivery_retry_idx")]
+
 
 class IntegrationConnector(TenantScopedModel):
     class ConnectorType(models.TextChoices):
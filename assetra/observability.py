@@ -91,6 +91,19 @@ workflow_execution_duration_seconds = Histogram(
     buckets=(0.1, 0.5, 1.0, 2.5, 5.0, 10.0)
 )
 
+# Workflow scheduler metrics
+workflow_schedule_lag_seconds = Histogram(
+    'assetra_workflow_schedule_lag_seconds',
+    'Delay between an ON_TIME workflow falling due and the scheduler firing it',
+    buckets=(1.0, 5.0, 15.0, 30.0, 60.0, 120.0, 300.0, 900.0, 3600.0)
+)
+
+workflow_scheduler_assets_per_tick = Histogram(
+    'assetra_workflow_scheduler_assets_per_tick',
+    'Assets evaluated against ON_TIME workflows in one scheduler tick',
+    buckets=(0, 10, 100, 1000, 10000, 100000, 1000000)
+)
+
 # Webhook metrics
 webhook_deliveries_total = Counter(
     'assetra_webhook_deliveries_total',
@@ -111,6 +124,28 @@ webhook_dead_letters_total = Counter(
     ['endpoint_id']
 )
 
+# Scan pipeline metrics
+scan_pipeline_lag_seconds = Histogram(
+    'assetra_scan_pipeline_lag_seconds',
+    'Delay between acknowledging a scan and running its async post-processing',
+    buckets=(0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+)
+
+# Sync payload metrics
+sync_payload_bytes = Histogram(
+    'assetra_sync_payload_bytes',
+    'Sync request/response body size as sent on the wire',
+    ['direction', 'encoding'],
+    buckets=(256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+)
+
+sync_payload_decoded_bytes = Histogram(
+    'assetra_sync_payload_decoded_bytes',
+    'Sync request/response JSON body size before compression',
+    ['direction'],
+    buckets=(256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+)
+
 # Task queue metrics
 celery_tasks_total = Counter(
     'assetra_celery_tasks_total',
@@ -0,0 +1,25 @@
+from django.conf import settings
+from rest_framework.pagination import CursorPagination
+
+
+class TenantCursorPagination(CursorPagination):
+    """Keyset pagination for tenant list endpoints.
+
+    Pages are ordered by ``-id``: ids never change and new rows sort ahead of
+    every open cursor, so concurrent inserts neither shift nor repeat rows on
+    later pages. ``?ordering=`` still applies through ``OrderingFilter``; the
+    cursor then holds the first ordering value plus an offset into the rows
+    tied on it, so ``id`` is appended as a tiebreaker to keep those rows in a
+    fixed order from page to page.
+    """
+
+    ordering = "-id"
+    page_size = settings.API_PAGE_SIZE
+    page_size_query_param = "page_size"
+    max_page_size = settings.API_PAGE_SIZE_MAX
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if any(field.lstrip("-") in ("id", "pk") for field in ordering):
+            return ordering
+        return (*ordering, "-id" if ordering[0].startswith("-") else "id")
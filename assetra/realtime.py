@@ -0,0 +1,217 @@
+"""Per-tenant pub/sub fan-out for the live-data server-sent events stream.
+
+An event is rendered to its SSE frame once, in ``publish_event``; every
+subscriber receives that same ``bytes`` object. ``InMemoryBackend`` fans out
+inside one process. ``RedisBackend`` publishes each frame to a Redis channel;
+every ASGI process runs a single listener that fans it out to its local
+subscribers, so N dashboards cost one Redis message per process.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from contextlib import suppress
+from functools import lru_cache
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from .renderers import EventStreamRenderer
+
+logger = logging.getLogger("assetra.realtime")
+
+CHANNEL_PREFIX = "assetra:realtime:"
+PRESENCE_KEY = "assetra:realtime-presence:{tenant_id}"
+HEARTBEAT_FRAME = b": keep-alive\n\n"
+# EventSource reconnect delay after a stream ends (e.g. a subscriber overflowed).
+RETRY_FRAME = b"retry: 3000\n\n"
+
+
+class Subscription:
+    """One stream's bounded queue of frames, bound to the event loop that created it."""
+
+    def __init__(self, hub: "LocalHub", tenant_id: str, max_queued: int):
+        self.hub = hub
+        self.tenant_id = tenant_id
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue[bytes] = asyncio.Queue(max_queued)
+        self.overflowed = False
+
+    def deliver(self, frame: bytes) -> None:
+        # Runs on self.loop. A consumer this far behind has already lost
+        # deltas, so its stream ends and the client reconnects for a snapshot.
+        try:
+            self.queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    async def frames(self, heartbeat_seconds: float):
+        while not self.overflowed:
+            try:
+                yield await asyncio.wait_for(self.queue.get(), heartbeat_seconds)
+            except asyncio.TimeoutError:
+                yield HEARTBEAT_FRAME
+
+    def close(self) -> None:
+        self.hub.unsubscribe(self)
+
+
+class LocalHub:
+    """Process-local registry of subscriptions by tenant."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscriptions: dict[str, set[Subscription]] = {}
+
+    def subscribe(self, tenant_id: str, max_queued: int) -> Subscription:
+        subscription = Subscription(self, tenant_id, max_queued)
+        with self._lock:
+            self._subscriptions.setdefault(tenant_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.tenant_id, set())
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                self._subscriptions.pop(subscription.tenant_id, None)
+
+    def tenants(self) -> list[str]:
+        with self._lock:
+            return list(self._subscriptions)
+
+    def has_subscribers(self, tenant_id: str) -> bool:
+        return tenant_id in self._subscriptions
+
+    def fan_out(self, tenant_id: str, frame: bytes) -> None:
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(tenant_id, ()))
+        for subscription in subscriptions:
+            try:
+                # Publishers run in request threads; subscriptions live on the ASGI loop.
+                subscription.loop.call_soon_threadsafe(subscription.deliver, frame)
+            except RuntimeError:  # The subscriber's event loop has closed.
+                self.unsubscribe(subscription)
+
+
+class InMemoryBackend:
+    """Fan-out within the current process; enough for a single ASGI worker."""
+
+    def __init__(self):
+        self.hub = LocalHub()
+
+    def has_subscribers(self, tenant_id: str) -> bool:
+        return self.hub.has_subscribers(tenant_id)
+
+    def publish(self, tenant_id: str, frame: bytes) -> None:
+        self.hub.fan_out(tenant_id, frame)
+
+    async def subscribe(self, tenant_id: str) -> Subscription:
+        return self.hub.subscribe(tenant_id, settings.REALTIME_SUBSCRIBER_QUEUE_SIZE)
+
+
+class RedisBackend(InMemoryBackend):
+    """Fan-out across processes through Redis pub/sub (``REALTIME_REDIS_URL``).
+
+    Processes with subscribers for a tenant keep a presence key alive, so
+    writers skip serializing events nobody is listening to.
+    """
+
+    def __init__(self):
+        import redis
+
+        super().__init__()
+        self.url = settings.REALTIME_REDIS_URL
+        self.errors = (redis.RedisError, OSError)
+        self.client = redis.Redis.from_url(self.url)
+        self.presence_seconds = 2 * settings.REALTIME_HEARTBEAT_SECONDS
+        self._listener: asyncio.Task | None = None
+
+    def has_subscribers(self, tenant_id: str) -> bool:
+        try:
+            return bool(self.client.exists(PRESENCE_KEY.format(tenant_id=tenant_id)))
+        except self.errors:
+            logger.warning("Realtime presence check failed", exc_info=True)
+            return False
+
+    def publish(self, tenant_id: str, frame: bytes) -> None:
+        try:
+            self.client.publish(CHANNEL_PREFIX + tenant_id, frame)
+        except self.errors:
+            logger.warning("Realtime publish failed", exc_info=True)
+
+    async def subscribe(self, tenant_id: str) -> Subscription:
+        loop = asyncio.get_running_loop()
+        if self._listener is None or self._listener.done() or self._listener.get_loop() is not loop:
+            self._listener = loop.create_task(self._listen())
+        subscription = await super().subscribe(tenant_id)
+        await sync_to_async(self._mark_present, thread_sensitive=False)([tenant_id])
+        return subscription
+
+    def _mark_present(self, tenant_ids: list[str]) -> None:
+        try:
+            with self.client.pipeline(transaction=False) as pipeline:
+                for tenant_id in tenant_ids:
+                    pipeline.set(PRESENCE_KEY.format(tenant_id=tenant_id), 1, ex=self.presence_seconds)
+                pipeline.execute()
+        except self.errors:
+            logger.warning("Realtime presence refresh failed", exc_info=True)
+
+    async def _listen(self) -> None:
+        import redis.asyncio
+
+        heartbeat = settings.REALTIME_HEARTBEAT_SECONDS
+        while True:
+            client = redis.asyncio.Redis.from_url(self.url)
+            pubsub = client.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.psubscribe(CHANNEL_PREFIX + "*")
+                refreshed_at = time.monotonic()
+                while True:
+                    message = await pubsub.get_message(timeout=heartbeat)
+                    if message is not None:
+                        self.hub.fan_out(message["channel"].decode()[len(CHANNEL_PREFIX) :], message["data"])
+                    if time.monotonic() - refreshed_at >= heartbeat:
+                        refreshed_at = time.monotonic()
+                        await sync_to_async(self._mark_present, thread_sensitive=False)(self.hub.tenants())
+            except self.errors:
+                logger.warning("Realtime listener lost its Redis connection; reconnecting", exc_info=True)
+            finally:
+                with suppress(*self.errors):
+                    await pubsub.aclose()
+                with suppress(*self.errors):
+                    await client.aclose()
+            await asyncio.sleep(1)
+
+
+@lru_cache(maxsize=1)
+def get_backend() -> InMemoryBackend:
+    return import_string(settings.REALTIME_BACKEND)()
+
+
+def has_subscribers(tenant_id) -> bool:
+    return get_backend().has_subscribers(str(tenant_id))
+
+
+def publish_event(tenant_id, event: str, data) -> None:
+    """Render ``data`` once and deliver it to every subscriber of ``tenant_id``."""
+    get_backend().publish(str(tenant_id), EventStreamRenderer.frame(event, data))
+
+
+async def stream_events(tenant_id, *, snapshot=None):
+    """Yield SSE frames for ``tenant_id``: ``snapshot()``'s payload first, then published deltas.
+
+    The subscription is registered before the snapshot is read, so no change
+    committed in between is lost (at worst it is delivered twice).
+    """
+    subscription = await get_backend().subscribe(str(tenant_id))
+    try:
+        yield RETRY_FRAME
+        if snapshot is not None:
+            yield EventStreamRenderer.frame("snapshot", await sync_to_async(snapshot)())
+        async for frame in subscription.frames(settings.REALTIME_HEARTBEAT_SECONDS):
+            yield frame
+    finally:
+        subscription.close()
@@ -0,0 +1,100 @@
+import codecs
+import io
+
+from django.conf import settings
+from rest_framework import status
+from rest_framework.exceptions import APIException, ParseError, UnsupportedMediaType
+from rest_framework.parsers import JSONParser, get_encoding
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils import encoders
+
+from .compression import IDENTITY, DecompressedSizeExceeded, DecompressionError, available_encodings, decompress_stream
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; the stdlib json renderer and parser are used instead.
+    orjson = None
+
+
+class ORJSONRenderer(JSONRenderer):
+    """``JSONRenderer`` that serializes with orjson, byte-for-byte compatible with DRF's output.
+
+    orjson writes str/int/float/dict/list/UUID natively; datetimes, Decimals,
+    lazy strings and other types DRF knows go through DRF's own encoder, so the
+    wire format does not change. Indented output (browsable API,
+    ``; indent=``), non-default ``UNICODE_JSON``/``COMPACT_JSON`` settings and
+    a missing orjson all fall back to ``JSONRenderer``.
+    """
+
+    options = (orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME) if orjson else 0
+    default = staticmethod(encoders.JSONEncoder().default)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or self.ensure_ascii or not self.compact or self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b""
+        # Same escaping as JSONRenderer, so the output stays a strict JavaScript subset.
+        return orjson.dumps(data, default=self.default, option=self.options).replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+
+
+class EventStreamRenderer(BaseRenderer):
+    """``text/event-stream`` frames with JSON data; lets views negotiate ``Accept: text/event-stream``.
+
+    Streaming views return the frames themselves; only error responses are
+    rendered here, as a single ``error`` event.
+    """
+
+    media_type = "text/event-stream"
+    format = "event-stream"
+    json_renderer = ORJSONRenderer()
+
+    @classmethod
+    def frame(cls, event: str, data) -> bytes:
+        # Compact JSON never contains a raw newline, so one data line suffices.
+        return b"event: " + event.encode() + b"\ndata: " + cls.json_renderer.render(data) + b"\n\n"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return b"" if data is None else self.frame("error", data)
+
+
+class RequestBodyTooLarge(APIException):
+    status_code = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    default_detail = "Request body is too large."
+    default_code = "request_body_too_large"
+
+
+class ORJSONParser(JSONParser):
+    """``JSONParser`` that decodes UTF-8 bodies with orjson; other encodings use the stdlib parser.
+
+    Bodies sent with ``Content-Encoding: gzip`` (or ``zstd`` when available)
+    are decompressed first, up to ``API_MAX_DECOMPRESSED_BYTES``.
+    """
+
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        stream = self.decode_content(stream, parser_context.get("request"))
+        if orjson is None or not self.strict or codecs.lookup(get_encoding(parser_context)).name != "utf-8":
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f"JSON parse error - {exc}") from exc
+
+    def decode_content(self, stream, request):
+        coding = (request.META.get("HTTP_CONTENT_ENCODING", "") if request is not None else "").strip().lower() or IDENTITY
+        if coding == IDENTITY:
+            return stream
+        if coding not in available_encodings():
+            raise UnsupportedMediaType(request.content_type, detail=f'Unsupported Content-Encoding "{coding}".')
+        try:
+            body = decompress_stream(stream, coding, settings.API_MAX_DECOMPRESSED_BYTES)
+        except DecompressedSizeExceeded as exc:
+            raise RequestBodyTooLarge(str(exc)) from exc
+        except DecompressionError as exc:
+            raise ParseError(str(exc)) from exc
+        # Read back by PayloadCompressionMiddleware for the payload-size metrics.
+        request._request.decoded_content_length = len(body)
+        return io.BytesIO(body)
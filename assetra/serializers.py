@@ -1,9 +1,16 @@
-from rest_framework import serializers
+from functools import cached_property
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import ISO_8601, serializers
+from rest_framework.relations import PrimaryKeyRelatedField
+from rest_framework.settings import api_settings
 
 from .models import (
     Asset,
     AssetCategory,
     AssetStateHistory,
+    AssetTombstone,
     BarcodeBatch,
     DeviceProfile,
     IndustryPreset,
@@ -13,12 +20,11 @@ from .models import (
     NoCodeFormDefinition,
     ScanEvent,
     Tenant,
-    TenantMembership,
     WebhookEndpoint,
     WorkflowDefinition,
     WorkflowRun,
 )
-from .services import validate_workflow_definition
+from .services import decode_sync_cursor, get_tenant_role, validate_workflow_definition
 
 
 class TenantSerializer(serializers.ModelSerializer):
@@ -62,8 +68,7 @@ class AssetSerializer(serializers.ModelSerializer):
 
         assigned_to = attrs.get("assigned_to")
         if assigned_to and tenant_id:
-            is_member = TenantMembership.objects.filter(tenant_id=tenant_id, user=assigned_to).exists()
-            if not is_member:
+            if not get_tenant_role(tenant_id, assigned_to.pk):
                 raise serializers.ValidationError({"assigned_to": "user must be a member of current tenant"})
 
         return attrs
@@ -76,12 +81,21 @@ class AssetStateHistorySerializer(serializers.ModelSerializer):
         read_only_fields = ("checksum", "created_at")
 
 
+class AssetTombstoneSerializer(serializers.ModelSerializer):
+    removed_at = serializers.DateTimeField(source="updated_at", read_only=True)
+
+    class Meta:
+        model = AssetTombstone
+        fields = ("asset_id", "asset_tag", "reason", "removed_at")
+
+
 class ScanEventSerializer(serializers.ModelSerializer):
     tenant = serializers.PrimaryKeyRelatedField(read_only=True)
 
     class Meta:
         model = ScanEvent
         fields = "__all__"
+        read_only_fields = ("pending_post_processing",)
 
     def validate(self, attrs):
         request = self.context.get("request")
@@ -115,11 +129,13 @@ class WorkflowDefinitionSerializer(serializers.ModelSerializer):
         trigger_type = attrs.get("trigger_type", getattr(self.instance, "trigger_type", None))
         entry_conditions = attrs.get("entry_conditions", getattr(self.instance, "entry_conditions", {}))
         steps = attrs.get("steps", getattr(self.instance, "steps", []))
+        schedule_interval_seconds = attrs.get("schedule_interval_seconds", getattr(self.instance, "schedule_interval_seconds", None))
 
         errors = validate_workflow_definition(
             trigger_type=trigger_type,
             entry_conditions=entry_conditions,
             steps=steps,
+            schedule_interval_seconds=schedule_interval_seconds,
         )
         if errors:
             raise serializers.ValidationError({"workflow": errors})
@@ -144,9 +160,12 @@ class NoCodeFormDefinitionSerializer(serializers.ModelSerializer):
 
 
 class BarcodeBatchSerializer(serializers.ModelSerializer):
+    labels_total = serializers.IntegerField(read_only=True)
+
     class Meta:
         model = BarcodeBatch
         fields = "__all__"
+        read_only_fields = ("status", "labels_generated", "completed_at", "shard_size")
         extra_kwargs = {"tenant": {"required": False}, "generated_by": {"required": False}}
 
 
@@ -180,5 +199,144 @@ class IndustryPresetSerializer(serializers.ModelSerializer):
 
 class SyncPayloadSerializer(serializers.Serializer):
     last_sync_at = serializers.DateTimeField(required=False)
+    cursor = serializers.CharField(required=False)
+    page_size = serializers.IntegerField(required=False, min_value=1, max_value=settings.SYNC_PAGE_SIZE_MAX)
     scan_events = ScanEventSerializer(many=True, required=False)
     conflict_acknowledgements = serializers.ListField(child=serializers.DictField(), required=False)
+    asset_fields = serializers.ListField(child=serializers.CharField(), required=False, allow_empty=False)
+
+    def validate_cursor(self, value):
+        try:
+            return decode_sync_cursor(value)
+        except ValueError as error:
+            raise serializers.ValidationError(str(error)) from error
+
+    def validate_asset_fields(self, value):
+        unknown = sorted(set(value) - set(asset_values_serializer.field_names))
+        if unknown:
+            raise serializers.ValidationError(f"unknown asset fields: {', '.join(unknown)}")
+        # Clients key their offline store by id, so it is always sent.
+        return {"id", *value}
+
+
+class BarcodeValidationBatchSerializer(serializers.Serializer):
+    barcodes = serializers.ListField(
+        child=serializers.DictField(child=serializers.CharField(allow_blank=True)),
+        allow_empty=False,
+        max_length=settings.BARCODE_VALIDATION_BATCH_MAX,
+    )
+
+
+class ScanBatchItemSerializer(serializers.Serializer):
+    client_event_id = serializers.UUIDField(required=False)
+    symbology = serializers.CharField(max_length=50)
+    raw_value = serializers.CharField(max_length=512)
+    source_type = serializers.ChoiceField(choices=ScanEvent.SourceType.choices, default=ScanEvent.SourceType.RFID)
+    asset = serializers.IntegerField(required=False, allow_null=True)
+    location = serializers.IntegerField(required=False, allow_null=True)
+    gps_latitude = serializers.DecimalField(max_digits=9, decimal_places=6, required=False, allow_null=True)
+    gps_longitude = serializers.DecimalField(max_digits=9, decimal_places=6, required=False, allow_null=True)
+    offline_captured_at = serializers.DateTimeField(required=False, allow_null=True)
+
+
+class ScanBatchSerializer(serializers.Serializer):
+    scan_events = serializers.ListField(child=serializers.DictField(), allow_empty=False, max_length=settings.SCAN_BATCH_MAX_EVENTS)
+    dedupe_window_seconds = serializers.IntegerField(required=False, min_value=0, max_value=3600)
+
+
+class ValuesSerializer:
+    """Read-only fast path that renders ``values_list`` rows exactly as ``serializer_class(many=True)`` would.
+
+    The serializer's fields are bound once into column and key maps, so a row
+    costs one converter call per non-trivial column instead of DRF's
+    per-field attribute lookup. Only model-field sources and primary-key
+    relations are supported.
+    """
+
+    # Field types whose ``to_representation`` returns database values unchanged.
+    identity_fields = (serializers.CharField, serializers.IntegerField, serializers.BooleanField)
+
+    def __init__(self, serializer_class):
+        self.serializer_class = serializer_class
+
+    @cached_property
+    def _columns(self) -> tuple[tuple[str, ...], tuple[str, ...], tuple]:
+        model = self.serializer_class.Meta.model
+        keys, columns, fields = [], [], []
+        for key, field in self.serializer_class().fields.items():
+            if field.write_only:
+                continue
+            if "." in field.source or field.source == "*":
+                raise ImproperlyConfigured(f"{self.serializer_class.__name__}.{key} has no single model column")
+            if isinstance(field, serializers.RelatedField) and not (isinstance(field, PrimaryKeyRelatedField) and field.pk_field is None):
+                raise ImproperlyConfigured(f"{self.serializer_class.__name__}.{key} is not a primary-key relation")
+            keys.append(key)
+            columns.append(model._meta.get_field(field.source).attname)
+            fields.append(field)
+        return tuple(keys), tuple(columns), tuple(fields)
+
+    @classmethod
+    def _converter(cls, field):
+        if isinstance(field, PrimaryKeyRelatedField) or type(field) in cls.identity_fields:
+            return None
+        if isinstance(field, serializers.JSONField) and not field.binary:
+            return None
+        if isinstance(field, serializers.DateTimeField):
+            return _datetime_converter(field)
+        return field.to_representation
+
+    @property
+    def field_names(self) -> tuple[str, ...]:
+        return self._columns[0]
+
+    def only(self, field_names) -> "ValuesSerializer":
+        """Return a projection rendering just ``field_names``, in this serializer's key order."""
+        keys, columns, fields = self._columns
+        kept = [index for index, key in enumerate(keys) if key in field_names]
+        projection = ValuesSerializer(self.serializer_class)
+        projection._columns = (
+            tuple(keys[index] for index in kept),
+            tuple(columns[index] for index in kept),
+            tuple(fields[index] for index in kept),
+        )
+        return projection
+
+    def values_list(self, queryset, *extra_columns):
+        """Select the serialized columns (plus ``extra_columns``) as named rows."""
+        columns = self._columns[1]
+        return queryset.values_list(*columns, *(column for column in extra_columns if column not in columns), named=True)
+
+    def to_representation(self, rows) -> list[dict]:
+        keys, _columns, fields = self._columns
+        width = len(keys)
+        # Converters are bound per call: datetime ones capture the active timezone.
+        converters = [(index, converter) for index, field in enumerate(fields) if (converter := self._converter(field))]
+        data = []
+        for row in rows:
+            values = list(row[:width])
+            for index, converter in converters:
+                if values[index] is not None:
+                    values[index] = converter(values[index])
+            data.append(dict(zip(keys, values)))
+        return data
+
+
+def _datetime_converter(field: serializers.DateTimeField):
+    """Return ``field.to_representation`` with the ISO 8601 path specialised for aware datetimes."""
+    output_format = getattr(field, "format", api_settings.DATETIME_FORMAT)
+    field_timezone = field.timezone if hasattr(field, "timezone") else field.default_timezone()
+    if field_timezone is None or output_format is None or output_format.lower() != ISO_8601:
+        return field.to_representation
+
+    def convert(value):
+        if value.tzinfo is None:
+            return field.to_representation(value)
+        text = value.astimezone(field_timezone).isoformat()
+        return text[:-6] + "Z" if text.endswith("+00:00") else text
+
+    return convert
+
+
+asset_values_serializer = ValuesSerializer(AssetSerializer)
+scan_event_values_serializer = ValuesSerializer(ScanEventSerializer)
+asset_tombstone_values_serializer = ValuesSerializer(AssetTombstoneSerializer)
@@ -1,10 +1,40 @@
-from datetime import datetime
+import base64
+import binascii
+import hashlib
+import json
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta
 
-from django.core.exceptions import ValidationError
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db import connection, models, transaction
+from django.db.models import Q
 from django.utils import timezone
 
-from .models import Asset, AssetStateHistory, WorkflowDefinition, WorkflowRun
-from .observability import track_workflow_execution, workflow_executions_total
+from .gs1 import GS1Error, parse_gs1
+from .labels import compile_zpl
+from .models import (
+    Asset,
+    AssetStateHistory,
+    AssetTombstone,
+    Location,
+    ScanEvent,
+    Tenant,
+    TenantMembership,
+    WorkflowDefinition,
+    WorkflowRun,
+)
+from .observability import (
+    track_workflow_execution,
+    workflow_executions_total,
+    workflow_schedule_lag_seconds,
+    workflow_scheduler_assets_per_tick,
+)
+from .realtime import has_subscribers, publish_event
 
 
 SUPPORTED_WORKFLOW_ACTIONS = {
@@ -16,11 +46,17 @@ SUPPORTED_WORKFLOW_ACTIONS = {
 }
 
 
-def validate_workflow_definition(*, trigger_type: str, entry_conditions: dict, steps: list) -> list[str]:
+def validate_workflow_definition(
+    *, trigger_type: str, entry_conditions: dict, steps: list, schedule_interval_seconds: int | None = None
+) -> list[str]:
     errors: list[str] = []
     if trigger_type not in dict(WorkflowDefinition.TriggerType.choices):
         errors.append("trigger_type is invalid")
 
+    if trigger_type == WorkflowDefinition.TriggerType.ON_TIME:
+        if not schedule_interval_seconds or schedule_interval_seconds < settings.WORKFLOW_SCHEDULER_TICK_SECONDS:
+            errors.append(f"schedule_interval_seconds must be at least {settings.WORKFLOW_SCHEDULER_TICK_SECONDS} for on_time workflows")
+
     if not isinstance(entry_conditions, dict):
         errors.append("entry_conditions must be an object")
 
@@ -65,16 +101,23 @@ def validate_workflow_definition(*, trigger_type: str, entry_conditions: dict, s
 def decode_barcode(symbology: str, raw_value: str) -> dict:
     """Centralized decoding service for camera/RFID/enterprise scanners.
 
-    This function is intentionally simple in scaffold form; production
-    implementations can plug in specialized GS1 parsers or device SDK decoders.
+    GS1 element strings (bracketed or FNC1-delimited) are decoded into their
+    raw AI values and typed fields; a parse failure is kept as ``gs1_error``
+    so ``validate_barcode`` can report it without decoding twice.
     """
     payload = {"symbology": symbology, "raw": raw_value, "decoded_at": datetime.utcnow().isoformat()}
     if symbology.lower() == "gs1":
-        payload["segments"] = raw_value.split("(")
+        try:
+            parsed = parse_gs1(raw_value)
+        except GS1Error as exc:
+            payload["gs1_error"] = str(exc)
+        else:
+            payload["ai"] = parsed["ai"]
+            payload["gs1"] = _json_safe(parsed["fields"])
     return payload
 
 
-def validate_barcode(symbology: str, raw_value: str) -> list[str]:
+def validate_barcode(symbology: str, raw_value: str, *, decoded: dict | None = None) -> list[str]:
     errors: list[str] = []
     if not raw_value:
         errors.append("raw_value is required")
@@ -82,19 +125,536 @@ def validate_barcode(symbology: str, raw_value: str) -> list[str]:
         errors.append("unsupported symbology")
     if len(raw_value) > 512:
         errors.append("raw_value exceeds max length")
+    if raw_value and symbology.lower() == "gs1":
+        if decoded is None:
+            decoded = decode_barcode(symbology, raw_value)
+        if "gs1_error" in decoded:
+            errors.append(decoded["gs1_error"])
     return errors
 
 
+def validate_barcode_batch(barcodes: list[dict], *, chunk_size: int = 5000):
+    """Validate and decode ``{"symbology", "raw_value"}`` items, yielding one list of results per chunk.
+
+    Each chunk is grouped by symbology and every distinct value in a group is
+    decoded and validated once, so repeated manifest rows cost a dict lookup.
+    Results keep input order as ``{"index", "valid", "errors", "decoded"}``.
+    """
+    for start in range(0, len(barcodes), chunk_size):
+        chunk = barcodes[start : start + chunk_size]
+        groups = defaultdict(list)
+        for offset, item in enumerate(chunk):
+            groups[item.get("symbology", "")].append(offset)
+        results = [None] * len(chunk)
+        for symbology, offsets in groups.items():
+            checked = {}
+            for offset in offsets:
+                raw_value = chunk[offset].get("raw_value", "")
+                outcome = checked.get(raw_value)
+                if outcome is None:
+                    decoded = decode_barcode(symbology, raw_value)
+                    outcome = checked[raw_value] = (validate_barcode(symbology, raw_value, decoded=decoded), decoded)
+                errors, decoded = outcome
+                results[offset] = {"index": start + offset, "valid": not errors, "errors": errors, "decoded": decoded}
+        yield results
+
+
+def classify_scan(symbology: str, raw_value: str) -> dict:
+    """Return the server-owned ScanEvent fields derived from decoding and validation."""
+    decoded = decode_barcode(symbology, raw_value)
+    errors = validate_barcode(symbology, raw_value, decoded=decoded)
+    return {
+        "decoded_payload": decoded,
+        "validation_errors": errors,
+        "status": ScanEvent.ScanStatus.REJECTED if errors else ScanEvent.ScanStatus.VALIDATED,
+    }
+
+
+ASSET_LOOKUP_KEY = "assetra:asset-lookup:{tenant_id}:{digest}"
+
+
+def _asset_lookup_key(tenant_id, barcode: str) -> str:
+    # Barcodes may hold spaces or control characters, which are not valid cache keys. The tenant
+    # id comes from a header, so "01" must map to the key that saves of tenant 1 evict.
+    return ASSET_LOOKUP_KEY.format(tenant_id=int(tenant_id), digest=hashlib.sha1(barcode.encode()).hexdigest())
+
+
+def lookup_assets_by_barcode(tenant_id, barcodes) -> dict[str, dict | None]:
+    """Resolve barcodes to serialized assets, reading through the cache.
+
+    Cache misses are resolved with one indexed ``barcode_value IN (...)``
+    query; when several assets share a barcode the oldest wins, as
+    ``.first()`` did. Unknown barcodes map to ``None`` and are cached too, so a
+    repeatedly scanned foreign label does not hit the database each time.
+    """
+    keys = {barcode: _asset_lookup_key(tenant_id, barcode) for barcode in barcodes}
+    results, missing = _cached_lookups(keys, cache.get_many(keys.values()))
+    if missing:
+        # Unordered, so the planner can stay on the (tenant, barcode_value) index.
+        results.update(_serialize_lookup_hits(missing, Asset.objects.filter(tenant_id=tenant_id, barcode_value__in=missing)))
+        cache.set_many(_lookup_cache_entries(keys, results, missing), timeout=settings.ASSET_LOOKUP_CACHE_SECONDS)
+    return results
+
+
+async def alookup_assets_by_barcode(tenant_id, barcodes) -> dict[str, dict | None]:
+    """``lookup_assets_by_barcode`` through the async cache and ORM APIs, for async views."""
+    keys = {barcode: _asset_lookup_key(tenant_id, barcode) for barcode in barcodes}
+    results, missing = _cached_lookups(keys, await cache.aget_many(keys.values()))
+    if missing:
+        assets = [asset async for asset in Asset.objects.filter(tenant_id=tenant_id, barcode_value__in=missing)]
+        results.update(_serialize_lookup_hits(missing, assets))
+        await cache.aset_many(_lookup_cache_entries(keys, results, missing), timeout=settings.ASSET_LOOKUP_CACHE_SECONDS)
+    return results
+
+
+def _cached_lookups(keys: dict[str, str], cached: dict) -> tuple[dict[str, dict | None], list[str]]:
+    results = {barcode: cached[key] or None for barcode, key in keys.items() if key in cached}
+    return results, [barcode for barcode in keys if barcode not in results]
+
+
+def _serialize_lookup_hits(missing: list[str], assets) -> dict[str, dict | None]:
+    from .serializers import AssetSerializer
+
+    found = {}
+    for asset in assets:
+        if asset.barcode_value not in found or asset.id < found[asset.barcode_value].id:
+            found[asset.barcode_value] = asset
+    serialized = AssetSerializer(list(found.values()), many=True).data
+    found = {asset["barcode_value"]: dict(asset) for asset in serialized}
+    return {barcode: found.get(barcode) for barcode in missing}
+
+
+def _lookup_cache_entries(keys: dict[str, str], results: dict[str, dict | None], missing: list[str]) -> dict[str, dict]:
+    # An empty dict marks a cached "not found"; ``cache.get_many`` omits true misses.
+    return {keys[barcode]: results[barcode] or {} for barcode in missing}
+
+
+def invalidate_asset_lookups(tenant_id, barcodes) -> None:
+    cache.delete_many([_asset_lookup_key(tenant_id, barcode) for barcode in barcodes if barcode])
+
+
+TENANT_ROLE_KEY = "assetra:tenant-role:{tenant_id}:{user_id}"
+
+
+def _tenant_pk(tenant_id) -> int | None:
+    # Header values such as "01" or " 1" must share the key that membership changes evict.
+    try:
+        return int(tenant_id)
+    except (TypeError, ValueError):
+        return None
+
+
+def get_tenant_role(tenant_id, user_id) -> str | None:
+    """Return the user's ``TenantMembership.role`` in the tenant, or ``None`` for non-members.
+
+    Roles are cached for ``TENANT_ROLE_CACHE_SECONDS``; membership saves and
+    deletes evict the entry, so role changes apply on the next request.
+    """
+    tenant_id = _tenant_pk(tenant_id)
+    if tenant_id is None:
+        return None
+    key = TENANT_ROLE_KEY.format(tenant_id=tenant_id, user_id=user_id)
+    role = cache.get(key)
+    if role is None:
+        role = TenantMembership.objects.filter(tenant_id=tenant_id, user_id=user_id).values_list("role", flat=True).first() or ""
+        cache.set(key, role, timeout=settings.TENANT_ROLE_CACHE_SECONDS)
+    return role or None
+
+
+async def aget_tenant_role(tenant_id, user_id) -> str | None:
+    """``get_tenant_role`` through the async cache and ORM APIs, for async views."""
+    tenant_id = _tenant_pk(tenant_id)
+    if tenant_id is None:
+        return None
+    key = TENANT_ROLE_KEY.format(tenant_id=tenant_id, user_id=user_id)
+    role = await cache.aget(key)
+    if role is None:
+        role = await TenantMembership.objects.filter(tenant_id=tenant_id, user_id=user_id).values_list("role", flat=True).afirst() or ""
+        await cache.aset(key, role, timeout=settings.TENANT_ROLE_CACHE_SECONDS)
+    return role or None
+
+
+def invalidate_tenant_role(tenant_id, user_id) -> None:
+    cache.delete(TENANT_ROLE_KEY.format(tenant_id=int(tenant_id), user_id=user_id))
+
+
+def get_tenant_setting(tenant_id, key: str, default=None):
+    """Read one key from ``Tenant.settings`` without loading the tenant row."""
+    tenant_settings = Tenant.objects.filter(id=tenant_id).values_list("settings", flat=True).first() or {}
+    return tenant_settings.get(key, default)
+
+
+def build_scan_history(scan: ScanEvent, *, actor=None) -> AssetStateHistory:
+    return AssetStateHistory(
+        tenant_id=scan.tenant_id,
+        asset=scan.asset,
+        event_type=AssetStateHistory.EventType.SCAN,
+        actor=actor,
+        location_id=scan.location_id,
+        gps_latitude=scan.gps_latitude,
+        gps_longitude=scan.gps_longitude,
+        previous_state={"status": scan.asset.status},
+        new_state={"status": scan.asset.status, "last_scan": str(scan.id)},
+    )
+
+
+def _scan_event_context(scan: ScanEvent) -> dict:
+    return {"id": scan.id, "symbology": scan.symbology, "raw_value": scan.raw_value, "source_type": scan.source_type}
+
+
+def run_scan_post_processing(scan: ScanEvent, *, actor=None) -> list[int]:
+    """Record scan history and run ON_SCAN workflows for a persisted scan event."""
+    if scan.asset_id:
+        build_scan_history(scan, actor=actor).save()
+    return execute_triggered_workflows(
+        tenant_id=scan.tenant_id,
+        trigger_type=WorkflowDefinition.TriggerType.ON_SCAN,
+        actor=actor,
+        asset=scan.asset,
+        scan_event=scan,
+        extra_context={"scan_event": _scan_event_context(scan)},
+    )
+
+
+def run_scan_batch_post_processing(scans: list[ScanEvent], *, tenant_id, actor=None) -> None:
+    """Batch variant of ``run_scan_post_processing`` for scans of one tenant, in list order.
+
+    Scans are evaluated one after another against shared asset instances, so
+    each history entry and workflow condition sees earlier scans' workflow
+    effects, but nothing is written until the end: one UPDATE per changed
+    asset, one history INSERT and one run INSERT for the whole batch (parallel
+    mode queues all runs in one group). A failed write fails the batch.
+    """
+    assets = Asset.objects.in_bulk({scan.asset_id for scan in scans if scan.asset_id})
+    for scan in scans:
+        if scan.asset_id:
+            # Share one instance per asset so workflow effects carry over between scans.
+            scan.asset = assets[scan.asset_id]
+
+    trigger_type = WorkflowDefinition.TriggerType.ON_SCAN
+    plans = get_workflow_plans(tenant_id, trigger_type)
+    parallel = bool(plans) and get_workflow_execution_mode(tenant_id) == "parallel"
+    work = WorkflowUnitOfWork()
+    pending: list[WorkflowRun] = []
+    for scan in scans:
+        if scan.asset_id:
+            work.add_history(build_scan_history(scan, actor=actor))
+        if not plans:
+            continue
+        context = {"asset": scan.asset, "scan_event": _scan_event_context(scan), "trigger_type": trigger_type}
+        options = {
+            "tenant_id": tenant_id,
+            "trigger_type": trigger_type,
+            "actor": actor,
+            "asset": scan.asset,
+            "scan_event": scan,
+            "context": context,
+        }
+        if parallel:
+            pending += _pending_workflow_runs([plan for plan in plans if plan.matches(context)], **options)
+        else:
+            _run_inline_workflows(plans, work=work, **options)
+    work.flush()
+    _queue_workflow_runs(pending)
+
+
+def bulk_upsert_scan_events(
+    *,
+    tenant_id,
+    scanner,
+    scans: list[dict],
+    synced_at=None,
+    chunk_size: int | None = None,
+) -> list[int]:
+    """Insert or update pushed scan events with one set-based statement per chunk.
+
+    Events are deduplicated on ``(tenant, client_event_id)`` using
+    ``INSERT ... ON CONFLICT DO UPDATE`` (``ON DUPLICATE KEY UPDATE`` on MySQL).
+    When a client event appears more than once in ``scans`` the last occurrence
+    wins, matching sequential ``update_or_create`` semantics. Returns the
+    ScanEvent ids in the order of ``scans``.
+    """
+    if not scans:
+        return []
+    synced_at = synced_at or timezone.now()
+    chunk_size = chunk_size or settings.SYNC_INGEST_CHUNK_SIZE
+
+    client_event_ids = [scan.get("client_event_id") or uuid.uuid4() for scan in scans]
+    latest: dict = {}
+    for client_event_id, scan in zip(client_event_ids, scans):
+        latest[client_event_id] = scan
+
+    # MySQL upserts on any unique key and rejects an explicit conflict target.
+    unique_fields = ["tenant", "client_event_id"] if connection.features.supports_update_conflicts_with_target else None
+    ids_by_client_event: dict = {}
+    pending = list(latest.items())
+    for offset in range(0, len(pending), chunk_size):
+        # Rows only share an upsert statement when they carry the same columns,
+        # so fields a client omitted are left untouched on existing rows.
+        groups: dict[frozenset, list[ScanEvent]] = defaultdict(list)
+        for client_event_id, scan in pending[offset : offset + chunk_size]:
+            fields = {
+                **scan,
+                **classify_scan(scan["symbology"], scan["raw_value"]),
+                "client_event_id": client_event_id,
+                "scanner": scanner,
+                "synced_at": synced_at,
+            }
+            groups[frozenset(fields)].append(ScanEvent(tenant_id=tenant_id, **fields))
+
+        for field_names, objs in groups.items():
+            ScanEvent.objects.bulk_create(
+                objs,
+                update_conflicts=True,
+                unique_fields=unique_fields,
+                update_fields=sorted(field_names - {"client_event_id"}) + ["updated_at"],
+            )
+            missing = []
+            for obj in objs:
+                if obj.pk is None:
+                    missing.append(obj.client_event_id)
+                else:
+                    ids_by_client_event[obj.client_event_id] = obj.pk
+            if missing:
+                # Backends without RETURNING on upserts (MySQL) need a read-back.
+                ids_by_client_event.update(
+                    ScanEvent.objects.filter(tenant_id=tenant_id, client_event_id__in=missing).values_list("client_event_id", "id")
+                )
+
+    publish_scan_event_changes(tenant_id, ids_by_client_event.values())
+    return [ids_by_client_event[client_event_id] for client_event_id in client_event_ids]
+
+
+def publish_scan_event_changes(tenant_id, scan_event_ids) -> None:
+    """Push bulk-written scan events to live-data streams as one ``scan_event.changed`` event after commit.
+
+    ``bulk_create`` sends no ``post_save``, so bulk writers call this instead.
+    Nothing is read or serialized while the tenant has no subscribers.
+    """
+    scan_event_ids = list(scan_event_ids)
+    if not scan_event_ids or not has_subscribers(tenant_id):
+        return
+    from .serializers import scan_event_values_serializer
+
+    queryset = ScanEvent.objects.filter(tenant_id=tenant_id, id__in=scan_event_ids).order_by("id")
+    rows = scan_event_values_serializer.to_representation(scan_event_values_serializer.values_list(queryset))
+    transaction.on_commit(lambda: publish_event(tenant_id, "scan_event.changed", rows))
+
+
+SCAN_BATCH_FIELDS = (
+    "symbology",
+    "raw_value",
+    "source_type",
+    "gps_latitude",
+    "gps_longitude",
+    "offline_captured_at",
+)
+
+
+def ingest_scan_batch(*, tenant_id, scanner, reads: list[dict], dedupe_window_seconds: int, defer_post_processing: bool = False):
+    """Deduplicate and bulk-insert a batch of validated scan reads, e.g. from an RFID portal.
+
+    A read is a duplicate when the same ``raw_value`` was read at the same
+    location less than ``dedupe_window_seconds`` earlier, either in this batch
+    or in an already persisted scan. Surviving reads are upserted on
+    ``client_event_id`` in capture order, so replayed batches are idempotent.
+
+    Returns ``(results, new_scan_ids)``: one result per read, in input order,
+    and the ids of newly inserted scans. New scans are post-processed as a
+    batch unless ``defer_post_processing`` is set, in which case they are only
+    flagged for the async scan pipeline.
+    """
+    now = timezone.now()
+    window = timedelta(seconds=dedupe_window_seconds)
+    results: list[dict | None] = [None] * len(reads)
+
+    asset_ids = {read["asset"] for read in reads if read.get("asset")}
+    location_ids = {read["location"] for read in reads if read.get("location")}
+    known_assets = set(Asset.objects.filter(tenant_id=tenant_id, id__in=asset_ids).values_list("id", flat=True)) if asset_ids else set()
+    known_locations = (
+        set(Location.objects.filter(tenant_id=tenant_id, id__in=location_ids).values_list("id", flat=True)) if location_ids else set()
+    )
+
+    candidates = []
+    for index, read in enumerate(reads):
+        errors = {}
+        if read.get("asset") and read["asset"] not in known_assets:
+            errors["asset"] = ["must belong to current tenant"]
+        if read.get("location") and read["location"] not in known_locations:
+            errors["location"] = ["must belong to current tenant"]
+        if errors:
+            results[index] = {"index": index, "status": "invalid", "errors": errors}
+            continue
+        read["client_event_id"] = read.get("client_event_id") or uuid.uuid4()
+        candidates.append((read.get("offline_captured_at") or now, index, read))
+    candidates.sort(key=lambda candidate: (candidate[0], candidate[1]))
+
+    seen_at: dict[tuple, list] = defaultdict(list)
+    if window and candidates:
+        window_start, window_end = candidates[0][0] - window, candidates[-1][0]
+        # A scan is stored after it is captured, so created_at >= window_start bounds the
+        # (tenant, raw_value, created_at) index range; the capture time is checked here.
+        persisted = (
+            ScanEvent.objects.filter(
+                tenant_id=tenant_id,
+                raw_value__in={read["raw_value"] for _, _, read in candidates},
+                created_at__gte=window_start,
+            )
+            .exclude(client_event_id__in=[read["client_event_id"] for _, _, read in candidates])
+            .values_list("raw_value", "location_id", "offline_captured_at", "created_at")
+        )
+        for raw_value, location_id, offline_captured_at, created_at in persisted:
+            captured_at = offline_captured_at or created_at
+            if window_start <= captured_at <= window_end:
+                seen_at[(raw_value, location_id)].append(captured_at)
+
+    kept = []
+    for captured_at, index, read in candidates:
+        previous_reads = seen_at[(read["raw_value"], read.get("location"))]
+        if any(timedelta(0) <= captured_at - seen < window for seen in previous_reads):
+            results[index] = {"index": index, "status": "duplicate", "client_event_id": str(read["client_event_id"])}
+            continue
+        previous_reads.append(captured_at)
+        kept.append((index, read))
+
+    if not kept:
+        return results, []
+
+    client_event_ids = [read["client_event_id"] for _, read in kept]
+    existing = set(ScanEvent.objects.filter(tenant_id=tenant_id, client_event_id__in=client_event_ids).values_list("client_event_id", flat=True))
+    scan_ids = bulk_upsert_scan_events(
+        tenant_id=tenant_id,
+        scanner=scanner,
+        synced_at=now,
+        scans=[
+            {
+                **{field: read.get(field) for field in SCAN_BATCH_FIELDS},
+                "client_event_id": read["client_event_id"],
+                "asset_id": read.get("asset"),
+                "location_id": read.get("location"),
+            }
+            for _, read in kept
+        ],
+    )
+
+    new_scan_ids = []
+    for (index, read), scan_id in zip(kept, scan_ids):
+        results[index] = {"index": index, "status": "accepted", "id": scan_id, "client_event_id": str(read["client_event_id"])}
+        if read["client_event_id"] not in existing:
+            new_scan_ids.append(scan_id)
+    new_scan_ids = list(dict.fromkeys(new_scan_ids))
+
+    if new_scan_ids:
+        if defer_post_processing:
+            ScanEvent.objects.filter(id__in=new_scan_ids).update(pending_post_processing=True)
+        else:
+            scans = list(ScanEvent.objects.filter(id__in=new_scan_ids).order_by("id"))
+            run_scan_batch_post_processing(scans, tenant_id=tenant_id, actor=scanner)
+    return results, new_scan_ids
+
+
+def encode_sync_cursor(positions: dict, *, as_of: datetime) -> str:
+    """Encode per-stream ``(updated_at, id)`` positions as an opaque sync cursor.
+
+    ``as_of`` is the server time the cursor was issued at; it tells the server
+    whether tombstones the client has not seen may already have been compacted.
+    """
+    payload = {
+        stream: None if position is None else [position[0].isoformat(), position[1]]
+        for stream, position in positions.items()
+    }
+    payload["as_of"] = as_of.isoformat()
+    raw = json.dumps(payload, separators=(",", ":"), sort_keys=True).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _parse_cursor_datetime(value: str) -> datetime:
+    parsed = datetime.fromisoformat(value)
+    if timezone.is_naive(parsed):
+        raise ValueError("cursor timestamps must be timezone-aware")
+    return parsed
+
+
+def decode_sync_cursor(token: str) -> tuple[dict, datetime | None]:
+    """Inverse of ``encode_sync_cursor``; raises ``ValueError`` for malformed tokens."""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        payload = json.loads(raw)
+        as_of = payload.pop("as_of", None)
+        positions = {}
+        for stream, position in payload.items():
+            if position is None:
+                positions[stream] = None
+                continue
+            updated_at, pk = position
+            if not isinstance(pk, int):
+                raise ValueError("invalid cursor position")
+            positions[stream] = (_parse_cursor_datetime(updated_at), pk)
+        return positions, (_parse_cursor_datetime(as_of) if as_of else None)
+    except (binascii.Error, UnicodeDecodeError, AttributeError, TypeError, ValueError) as error:
+        raise ValueError("invalid sync cursor") from error
+
+
+def fetch_sync_page(queryset, position, page_size: int, *, until=None):
+    """Return ``(rows, next_position, has_more)`` for one keyset page ordered by ``(updated_at, id)``.
+
+    ``position`` is the ``(updated_at, id)`` of the last row the client has
+    seen, so rows sharing a timestamp across a page boundary are never skipped.
+    ``queryset`` may yield model instances or named ``values_list`` rows.
+
+    ``updated_at`` is stamped at save time, not commit time, so a row saved
+    before an already-served one can still become visible later. Rows newer
+    than ``until`` are held back (see ``sync_visibility_horizon``) so the cursor
+    never passes a write that may still be in flight.
+    """
+    if position is not None:
+        updated_at, pk = position
+        queryset = queryset.filter(Q(updated_at__gt=updated_at) | Q(updated_at=updated_at, id__gt=pk))
+    if until is not None:
+        queryset = queryset.filter(updated_at__lte=until)
+    rows = list(queryset.order_by("updated_at", "id")[: page_size + 1])
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    if rows:
+        position = (rows[-1].updated_at, rows[-1].id)
+    return rows, position, has_more
+
+
+def sync_visibility_horizon(now=None) -> datetime:
+    """Latest ``updated_at`` a sync page may serve; later rows wait out ``SYNC_COMMIT_LAG_SECONDS``."""
+    return (now or timezone.now()) - timedelta(seconds=settings.SYNC_COMMIT_LAG_SECONDS)
+
+
+def record_asset_tombstone(asset: Asset, reason: str) -> AssetTombstone:
+    """Upsert the tombstone for ``asset`` so offline clients drop it on their next sync."""
+    tombstone, _created = AssetTombstone.objects.update_or_create(
+        tenant_id=asset.tenant_id,
+        asset_id=asset.id,
+        defaults={"asset_tag": asset.asset_tag, "reason": reason},
+    )
+    return tombstone
+
+
+def clear_asset_tombstone(asset: Asset) -> None:
+    AssetTombstone.objects.filter(tenant_id=asset.tenant_id, asset_id=asset.id).delete()
+
+
+def tombstone_retention_horizon(now=None) -> datetime:
+    """Tombstones last updated before this instant may be removed by compaction."""
+    return (now or timezone.now()) - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+
+
 def render_zpl(template: str, context: dict) -> str:
-    rendered = template
-    for key, value in context.items():
-        rendered = rendered.replace("{{" + key + "}}", str(value))
-    return rendered
+    return compile_zpl(template).render(context)
 
 
 def _resolve_context_path(context: dict, path: str):
+    return _resolve_path_parts(context, path.split("."))
+
+
+def _resolve_path_parts(context: dict, parts) -> object:
     current = context
-    for part in path.split("."):
+    for part in parts:
         if isinstance(current, dict):
             current = current.get(part)
         else:
@@ -134,84 +694,6 @@ def _entry_conditions_match(entry_conditions: dict, context: dict) -> bool:
     return True
 
 
-def _execute_step(step: dict, run: WorkflowRun, context: dict, actor=None):
-    action = step.get("action")
-    if action == "validate_required_fields":
-        fields = step.get("fields", [])
-        source_path = step.get("source", "asset.custom_fields")
-        source_data = _resolve_context_path(context, source_path) or {}
-        missing = [field for field in fields if not source_data.get(field)]
-        if missing:
-            raise ValidationError(f"missing required fields: {', '.join(missing)}")
-        return {"action": action, "missing": []}
-
-    if action == "set_asset_status":
-        asset = context.get("asset")
-        new_status = step.get("status")
-        if not asset:
-            raise ValidationError("asset is required for set_asset_status")
-        if new_status not in dict(asset.Status.choices):
-            raise ValidationError("invalid asset status")
-        previous_state = {"status": asset.status}
-        asset.status = new_status
-        asset.save(update_fields=["status", "updated_at"])
-        AssetStateHistory.objects.create(
-            tenant=asset.tenant,
-            asset=asset,
-            event_type=AssetStateHistory.EventType.MAINTAIN,
-            actor=actor,
-            location=asset.current_location,
-            previous_state=previous_state,
-            new_state={"status": new_status},
-        )
-        context["asset"] = asset
-        return {"action": action, "status": new_status}
-
-    if action == "update_asset_custom_fields":
-        asset = context.get("asset")
-        field_map = step.get("fields", {})
-        if not asset:
-            raise ValidationError("asset is required for update_asset_custom_fields")
-        custom_fields = dict(asset.custom_fields or {})
-        for key, value in field_map.items():
-            custom_fields[key] = _render_value(value, context)
-        asset.custom_fields = custom_fields
-        asset.save(update_fields=["custom_fields", "updated_at"])
-        context["asset"] = asset
-        return {"action": action, "updated_keys": list(field_map.keys())}
-
-    if action == "create_history":
-        asset = context.get("asset")
-        event_type = step.get("event_type", AssetStateHistory.EventType.INSPECT)
-        if not asset:
-            raise ValidationError("asset is required for create_history")
-        previous_state = step.get("previous_state", {"status": asset.status})
-        new_state = step.get("new_state", {"status": asset.status})
-        AssetStateHistory.objects.create(
-            tenant=asset.tenant,
-            asset=asset,
-            event_type=event_type,
-            actor=actor,
-            location=asset.current_location,
-            previous_state=previous_state,
-            new_state=new_state,
-        )
-        return {"action": action, "event_type": event_type}
-
-    if action == "set_output":
-        key = step.get("key")
-        value = _render_value(step.get("value"), context)
-        if not key:
-            raise ValidationError("set_output requires key")
-        output_data = dict(run.output_data or {})
-        output_data[key] = value
-        run.output_data = output_data
-        run.save(update_fields=["output_data", "updated_at"])
-        return {"action": action, "key": key}
-
-    raise ValidationError(f"unsupported workflow action: {action}")
-
-
 def _simulate_step(step: dict, context: dict):
     action = step.get("action")
 
@@ -292,6 +774,391 @@ def dry_run_workflow(*, workflow: WorkflowDefinition, asset=None, scan_event=Non
     }
 
 
+WORKFLOW_PLAN_VERSION_KEY = "assetra:workflow-plans:{tenant_id}"
+
+# tenant id -> (version stamp, {trigger_type: [CompiledWorkflow, ...]}, execution mode, compiled at), per worker process.
+_workflow_plan_index: dict[str, tuple[str, dict[str, list], str, float]] = {}
+
+
+class CompiledWorkflow:
+    """A workflow definition with entry conditions and steps compiled for execution.
+
+    Context paths are split once and every step is bound to its handler, so a
+    trigger only walks tuples and calls functions instead of re-reading JSON.
+    """
+
+    __slots__ = ("workflow", "conditions", "steps")
+
+    def __init__(self, workflow: WorkflowDefinition):
+        self.workflow = workflow
+        self.conditions = tuple((tuple(key.split(".")), expected) for key, expected in (workflow.entry_conditions or {}).items())
+        self.steps = tuple(_compile_step(step) for step in workflow.steps or [])
+
+    def matches(self, context: dict) -> bool:
+        for parts, expected in self.conditions:
+            if _resolve_path_parts(context, parts) != expected:
+                return False
+        return True
+
+
+class WorkflowUnitOfWork:
+    """Side effects of workflow runs, buffered by their steps and written together.
+
+    Steps mutate the in-memory asset and run right away, so later steps and
+    workflows see their effects; ``flush`` then issues at most one UPDATE per
+    changed asset, one bulk history INSERT and the run rows. A unit of work
+    covers one run, or every run of a scan batch (``run_scan_batch_post_processing``).
+    """
+
+    __slots__ = ("run", "runs", "assets", "asset_fields", "history")
+
+    def __init__(self):
+        self.run = None
+        self.runs: list[WorkflowRun] = []
+        self.assets: dict[int, Asset] = {}
+        self.asset_fields: dict[int, set[str]] = defaultdict(set)
+        self.history: list[AssetStateHistory] = []
+
+    def start(self, run: WorkflowRun) -> None:
+        self.run = run
+        self.runs.append(run)
+
+    def update_asset(self, asset: Asset, *fields: str) -> None:
+        self.assets[asset.pk] = asset
+        self.asset_fields[asset.pk].update(fields)
+
+    def add_history(self, entry: AssetStateHistory) -> None:
+        self.history.append(entry)
+
+    def flush(self) -> None:
+        for pk, asset in self.assets.items():
+            asset.save(update_fields=[*sorted(self.asset_fields[pk]), "updated_at"])
+        if self.history:
+            for entry in self.history:
+                entry.checksum = entry.compute_checksum()
+            AssetStateHistory.objects.bulk_create(self.history)
+        inserted = set()
+        # Parallel-mode runs already exist as PENDING rows and are updated in place.
+        new_runs = [run for run in self.runs if run.pk is None]
+        if len(new_runs) > 1 and connection.features.can_return_rows_from_bulk_insert:
+            WorkflowRun.objects.bulk_create(new_runs)
+            inserted = {id(run) for run in new_runs}
+        for run in self.runs:
+            if id(run) not in inserted:
+                run.save()
+
+
+def _compile_value(value):
+    """Return ``render(context)`` for a step value, pre-splitting ``{{ path }}`` templates."""
+    if isinstance(value, str) and value.startswith("{{") and value.endswith("}}"):
+        parts = tuple(value[2:-2].strip().split("."))
+
+        def render(context):
+            resolved = _resolve_path_parts(context, parts)
+            return resolved if resolved is not None else ""
+
+        return render
+    return lambda context: value
+
+
+def _compile_validate_required_fields(step: dict):
+    fields = step.get("fields", [])
+    source = tuple(step.get("source", "asset.custom_fields").split("."))
+
+    def validate_required_fields(work, context, actor):
+        source_data = _resolve_path_parts(context, source) or {}
+        missing = [field for field in fields if not source_data.get(field)]
+        if missing:
+            raise ValidationError(f"missing required fields: {', '.join(missing)}")
+        return {"action": "validate_required_fields", "missing": []}
+
+    return validate_required_fields
+
+
+def _compile_set_asset_status(step: dict):
+    new_status = step.get("status")
+    valid_status = new_status in Asset.Status.values
+
+    def set_asset_status(work, context, actor):
+        asset = context.get("asset")
+        if not asset:
+            raise ValidationError("asset is required for set_asset_status")
+        if not valid_status:
+            raise ValidationError("invalid asset status")
+        previous_state = {"status": asset.status}
+        asset.status = new_status
+        work.update_asset(asset, "status")
+        work.add_history(
+            AssetStateHistory(
+                tenant_id=asset.tenant_id,
+                asset=asset,
+                event_type=AssetStateHistory.EventType.MAINTAIN,
+                actor=actor,
+                location_id=asset.current_location_id,
+                previous_state=previous_state,
+                new_state={"status": new_status},
+            )
+        )
+        context["asset"] = asset
+        return {"action": "set_asset_status", "status": new_status}
+
+    return set_asset_status
+
+
+def _compile_update_asset_custom_fields(step: dict):
+    field_map = step.get("fields", {})
+    renderers = [(key, _compile_value(value)) for key, value in field_map.items()]
+    updated_keys = list(field_map.keys())
+
+    def update_asset_custom_fields(work, context, actor):
+        asset = context.get("asset")
+        if not asset:
+            raise ValidationError("asset is required for update_asset_custom_fields")
+        custom_fields = dict(asset.custom_fields or {})
+        for key, render in renderers:
+            custom_fields[key] = render(context)
+        asset.custom_fields = custom_fields
+        work.update_asset(asset, "custom_fields")
+        context["asset"] = asset
+        return {"action": "update_asset_custom_fields", "updated_keys": list(updated_keys)}
+
+    return update_asset_custom_fields
+
+
+def _compile_create_history(step: dict):
+    event_type = step.get("event_type", AssetStateHistory.EventType.INSPECT)
+
+    def create_history(work, context, actor):
+        asset = context.get("asset")
+        if not asset:
+            raise ValidationError("asset is required for create_history")
+        previous_state = step.get("previous_state", {"status": asset.status})
+        new_state = step.get("new_state", {"status": asset.status})
+        work.add_history(
+            AssetStateHistory(
+                tenant_id=asset.tenant_id,
+                asset=asset,
+                event_type=event_type,
+                actor=actor,
+                location_id=asset.current_location_id,
+                previous_state=previous_state,
+                new_state=new_state,
+            )
+        )
+        return {"action": "create_history", "event_type": event_type}
+
+    return create_history
+
+
+def _compile_set_output(step: dict):
+    key = step.get("key")
+    render = _compile_value(step.get("value"))
+
+    def set_output(work, context, actor):
+        value = render(context)
+        if not key:
+            raise ValidationError("set_output requires key")
+        output_data = dict(work.run.output_data or {})
+        output_data[key] = value
+        work.run.output_data = output_data
+        return {"action": "set_output", "key": key}
+
+    return set_output
+
+
+_STEP_COMPILERS = {
+    "validate_required_fields": _compile_validate_required_fields,
+    "set_asset_status": _compile_set_asset_status,
+    "update_asset_custom_fields": _compile_update_asset_custom_fields,
+    "create_history": _compile_create_history,
+    "set_output": _compile_set_output,
+}
+
+
+def _compile_step(step: dict):
+    action = step.get("action")
+    compiler = _STEP_COMPILERS.get(action)
+    if compiler:
+        return compiler(step)
+
+    def unsupported(work, context, actor):
+        raise ValidationError(f"unsupported workflow action: {action}")
+
+    return unsupported
+
+
+def _workflow_plan_version(tenant_id) -> str:
+    key = WORKFLOW_PLAN_VERSION_KEY.format(tenant_id=tenant_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid.uuid4().hex, timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def invalidate_workflow_plans(tenant_id) -> None:
+    """Give the tenant a new plan version so every worker recompiles on its next trigger."""
+    cache.set(WORKFLOW_PLAN_VERSION_KEY.format(tenant_id=tenant_id), uuid.uuid4().hex, timeout=None)
+
+
+def _tenant_workflow_index(tenant_id) -> tuple[str, dict[str, list], str, float]:
+    tenant_key = str(tenant_id)
+    version = _workflow_plan_version(tenant_key)
+    cached = _workflow_plan_index.get(tenant_key)
+    # The age bound covers version stamps that other processes cannot see (a per-process cache).
+    if cached is None or cached[0] != version or time.monotonic() - cached[3] >= settings.WORKFLOW_PLAN_MAX_AGE_SECONDS:
+        index: dict[str, list[CompiledWorkflow]] = defaultdict(list)
+        for workflow in WorkflowDefinition.objects.filter(tenant_id=tenant_id, is_active=True).order_by("name"):
+            index[workflow.trigger_type].append(CompiledWorkflow(workflow))
+        mode = get_tenant_setting(tenant_id, "workflow_execution_mode", "inline") if index else "inline"
+        cached = (version, dict(index), mode, time.monotonic())
+        _workflow_plan_index[tenant_key] = cached
+    return cached
+
+
+def get_workflow_plans(tenant_id, trigger_type: str) -> list[CompiledWorkflow]:
+    """Return the tenant's active workflows for ``trigger_type``, compiled and in name order.
+
+    All active definitions of a tenant are compiled together and kept in this
+    process until the shared version stamp changes, which ``assetra.signals``
+    does on every ``WorkflowDefinition`` and ``Tenant`` save and delete, or
+    for at most ``WORKFLOW_PLAN_MAX_AGE_SECONDS``. Bulk ``update()`` calls
+    bypass those signals and must call ``invalidate_workflow_plans``.
+    """
+    return _tenant_workflow_index(tenant_id)[1].get(trigger_type, [])
+
+
+def get_workflow_execution_mode(tenant_id) -> str:
+    """Return the tenant's ``workflow_execution_mode`` setting, cached with its plans."""
+    return _tenant_workflow_index(tenant_id)[2]
+
+
+WORKFLOW_EXECUTION_MODES = ("inline", "parallel")
+
+
+def _execute_workflow_run(plan: CompiledWorkflow, run: WorkflowRun, context: dict, actor=None, work: WorkflowUnitOfWork | None = None) -> None:
+    """Run a plan's steps for ``run`` and write the run with its buffered side effects.
+
+    With a shared ``work`` the writes are left to the caller's ``work.flush()``.
+    """
+    workflow = plan.workflow
+    run.status = WorkflowRun.RunStatus.RUNNING
+    shared = work is not None
+    if not shared:
+        work = WorkflowUnitOfWork()
+    work.start(run)
+
+    try:
+        with track_workflow_execution(workflow.name):
+            executed_steps = []
+            for step in plan.steps:
+                result = step(work, context, actor)
+                executed_steps.append(result)
+
+            run.output_data = {"executed_steps": executed_steps}
+            run.status = WorkflowRun.RunStatus.SUCCESS
+    except Exception as error:
+        _mark_run_failed(run, workflow.name, error)
+
+    # Steps before a failure keep their side effects, as when each was written eagerly.
+    run.completed_at = timezone.now()
+    if shared:
+        return
+    try:
+        with transaction.atomic():
+            work.flush()
+    except Exception as error:
+        # The atomic block rolled the side effects back; the run is recorded as failed.
+        _mark_run_failed(run, workflow.name, error)
+        run.save()
+
+
+def _mark_run_failed(run: WorkflowRun, workflow_name: str, error: Exception) -> None:
+    workflow_executions_total.labels(workflow_name=workflow_name, status='error').inc()
+    run.status = WorkflowRun.RunStatus.FAILED
+    run.output_data = {
+        "error": str(error),
+        "executed_steps": run.output_data.get("executed_steps", []),
+    }
+
+
+def _queue_workflow_runs(runs: list[WorkflowRun]) -> list[int]:
+    """Insert PENDING runs and queue one Celery task per run after commit."""
+    from celery import group
+
+    from .tasks import execute_workflow_run
+
+    if not runs:
+        return []
+    if connection.features.can_return_rows_from_bulk_insert:
+        WorkflowRun.objects.bulk_create(runs)
+    else:
+        for run in runs:
+            run.save()
+    run_ids = [run.id for run in runs]
+    transaction.on_commit(lambda: group(execute_workflow_run.s(run_id) for run_id in run_ids).apply_async())
+    return run_ids
+
+
+def _pending_workflow_runs(plans, *, tenant_id, trigger_type: str, actor, asset, scan_event, context: dict) -> list[WorkflowRun]:
+    return [
+        WorkflowRun(
+            tenant_id=tenant_id,
+            workflow=plan.workflow,
+            asset=asset,
+            scan_event=scan_event,
+            status=WorkflowRun.RunStatus.PENDING,
+            context=_json_safe(context),
+            input_data={"trigger_type": trigger_type, "actor_id": getattr(actor, "pk", None)},
+            output_data={"executed_steps": []},
+        )
+        for plan in plans
+    ]
+
+
+def _run_inline_workflows(
+    plans, *, tenant_id, trigger_type: str, actor, asset, scan_event, context: dict, force_run: bool = False, work=None
+) -> list[WorkflowRun]:
+    runs = []
+    for plan in plans:
+        # Inline runs see earlier workflows' effects, so conditions are checked one at a time.
+        if not force_run and not plan.matches(context):
+            continue
+
+        run = WorkflowRun(
+            tenant_id=tenant_id,
+            workflow=plan.workflow,
+            asset=asset,
+            scan_event=scan_event,
+            context=_json_safe(context),
+            input_data={"trigger_type": trigger_type},
+            output_data={"executed_steps": []},
+            started_at=timezone.now(),
+        )
+        _execute_workflow_run(plan, run, context, actor, work)
+        runs.append(run)
+    return runs
+
+
+def execute_pending_workflow_run(run: WorkflowRun, *, asset=None) -> None:
+    """Execute a run created by parallel mode, with ``asset`` already locked by the caller."""
+    context = dict(run.context)
+    context["asset"] = asset
+    if not isinstance(context.get("scan_event"), dict):
+        context["scan_event"] = run.scan_event
+
+    actor_id = run.input_data.get("actor_id")
+    actor = get_user_model().objects.filter(pk=actor_id).first() if actor_id else None
+
+    plan = next(
+        (plan for plan in get_workflow_plans(run.tenant_id, run.workflow.trigger_type) if plan.workflow.id == run.workflow_id),
+        None,
+    )
+    run.asset = asset
+    run.started_at = timezone.now()
+    _execute_workflow_run(plan or CompiledWorkflow(run.workflow), run, context, actor)
+
+
 def execute_triggered_workflows(
     *,
     tenant_id,
@@ -302,7 +1169,14 @@ def execute_triggered_workflows(
     extra_context=None,
     workflow_definition_id: int | None = None,
     force_run: bool = False,
+    mode: str | None = None,
 ):
+    """Run matching active workflows for a trigger and return their run ids.
+
+    In ``"parallel"`` mode (or when the tenant's ``workflow_execution_mode``
+    setting says so) matching workflows are only queued as PENDING runs, each
+    executed by its own Celery task; poll ``WorkflowRunViewSet`` for results.
+    """
     base_context = {
         "asset": asset,
         "scan_event": scan_event,
@@ -311,51 +1185,140 @@ def execute_triggered_workflows(
     if extra_context:
         base_context.update(extra_context)
 
-    workflow_defs = WorkflowDefinition.objects.filter(
+    plans = get_workflow_plans(tenant_id, trigger_type)
+    if workflow_definition_id:
+        plans = [plan for plan in plans if plan.workflow.id == int(workflow_definition_id)]
+    if not plans:
+        return []
+
+    if mode is None:
+        mode = get_workflow_execution_mode(tenant_id)
+    if mode == "parallel":
+        matched = [plan for plan in plans if force_run or plan.matches(base_context)]
+        if not matched:
+            return []
+        return _queue_workflow_runs(
+            _pending_workflow_runs(
+                matched,
+                tenant_id=tenant_id,
+                trigger_type=trigger_type,
+                actor=actor,
+                asset=asset,
+                scan_event=scan_event,
+                context=base_context,
+            )
+        )
+
+    runs = _run_inline_workflows(
+        plans,
         tenant_id=tenant_id,
         trigger_type=trigger_type,
-        is_active=True,
-    ).order_by("name")
-    if workflow_definition_id:
-        workflow_defs = workflow_defs.filter(id=workflow_definition_id)
+        actor=actor,
+        asset=asset,
+        scan_event=scan_event,
+        context=base_context,
+        force_run=force_run,
+    )
+    return [run.id for run in runs]
+
+
+def _asset_lookups_for_conditions(conditions) -> dict:
+    """Translate ``asset.*`` entry conditions into Asset lookups where the ORM matches them exactly.
 
-    run_ids: list[int] = []
-    for workflow in workflow_defs:
-        if not force_run and not _entry_conditions_match(workflow.entry_conditions or {}, base_context):
+    Conditions on relations, on other context keys or expecting ``None`` are
+    left to ``CompiledWorkflow.matches``, which still checks every asset.
+    """
+    lookups = {}
+    for parts, expected in conditions:
+        if len(parts) < 2 or parts[0] != "asset" or expected is None:
+            continue
+        try:
+            field = Asset._meta.get_field(parts[1])
+        except FieldDoesNotExist:
             continue
+        if field.is_relation or (len(parts) > 2 and not isinstance(field, models.JSONField)):
+            continue
+        lookups["__".join(parts[1:])] = expected
+    return lookups
 
-        run = WorkflowRun.objects.create(
-            tenant_id=tenant_id,
-            workflow=workflow,
-            asset=asset,
-            scan_event=scan_event,
-            status=WorkflowRun.RunStatus.RUNNING,
-            context=_json_safe(base_context),
-            input_data={"trigger_type": trigger_type},
-            output_data={"executed_steps": []},
+
+def run_due_workflows(now=None) -> int:
+    """Fire due ON_TIME workflows against the assets matching their entry conditions.
+
+    Due workflows come from the ``(trigger_type, is_active, next_run_at)``
+    index and are claimed with a conditional UPDATE, so overlapping ticks never
+    fire one twice. Matching assets are read in keyset chunks and each chunk
+    becomes one bulk insert of PENDING runs executed by Celery. A tenant never
+    has more than ``WORKFLOW_SCHEDULER_MAX_RUNS_PER_TENANT`` runs in flight;
+    a workflow that hits the cap resumes from ``schedule_cursor`` next tick.
+    Returns the number of assets evaluated.
+    """
+    now = now or timezone.now()
+    chunk_size = settings.WORKFLOW_SCHEDULER_CHUNK_SIZE
+    due = (
+        WorkflowDefinition.objects.filter(
+            trigger_type=WorkflowDefinition.TriggerType.ON_TIME,
+            is_active=True,
+            schedule_interval_seconds__isnull=False,
         )
+        .filter(Q(next_run_at__lte=now) | Q(next_run_at__isnull=True))
+        .order_by("next_run_at", "id")
+    )
 
-        try:
-            with track_workflow_execution(workflow.name):
-                executed_steps = []
-                for step in workflow.steps or []:
-                    result = _execute_step(step, run, base_context, actor=actor)
-                    executed_steps.append(result)
-
-                run.output_data = {"executed_steps": executed_steps}
-                run.status = WorkflowRun.RunStatus.SUCCESS
-                run.completed_at = timezone.now()
-                run.save(update_fields=["output_data", "status", "completed_at", "updated_at"])
-                run_ids.append(run.id)
-        except Exception as error:
-            workflow_executions_total.labels(workflow_name=workflow.name, status='error').inc()
-            run.status = WorkflowRun.RunStatus.FAILED
-            run.output_data = {
-                "error": str(error),
-                "executed_steps": run.output_data.get("executed_steps", []),
-            }
-            run.completed_at = timezone.now()
-            run.save(update_fields=["status", "output_data", "completed_at", "updated_at"])
-            run_ids.append(run.id)
+    budgets: dict[int, int] = {}
+    processed = 0
+    for workflow in due:
+        claimed = WorkflowDefinition.objects.filter(id=workflow.id, next_run_at=workflow.next_run_at).update(
+            next_run_at=now + timedelta(seconds=workflow.schedule_interval_seconds)
+        )
+        if not claimed:
+            continue
+        if workflow.next_run_at and workflow.schedule_cursor is None:
+            workflow_schedule_lag_seconds.observe((now - workflow.next_run_at).total_seconds())
 
-    return run_ids
+        if workflow.tenant_id not in budgets:
+            in_flight = WorkflowRun.objects.filter(
+                tenant_id=workflow.tenant_id,
+                status__in=[WorkflowRun.RunStatus.PENDING, WorkflowRun.RunStatus.RUNNING],
+            ).count()
+            budgets[workflow.tenant_id] = settings.WORKFLOW_SCHEDULER_MAX_RUNS_PER_TENANT - in_flight
+
+        plan = CompiledWorkflow(workflow)
+        assets = Asset.objects.filter(tenant_id=workflow.tenant_id, **_asset_lookups_for_conditions(plan.conditions)).order_by("id")
+        last_id = workflow.schedule_cursor or 0
+        capped = False
+        while not capped:
+            chunk = list(assets.filter(id__gt=last_id)[:chunk_size])
+            if not chunk:
+                break
+            runs = []
+            for asset in chunk:
+                context = {"asset": asset, "scan_event": None, "trigger_type": WorkflowDefinition.TriggerType.ON_TIME}
+                if plan.matches(context):
+                    if len(runs) >= budgets[workflow.tenant_id]:
+                        capped = True
+                        break
+                    runs.append(
+                        WorkflowRun(
+                            tenant_id=workflow.tenant_id,
+                            workflow=workflow,
+                            asset=asset,
+                            status=WorkflowRun.RunStatus.PENDING,
+                            context=_json_safe(context),
+                            input_data={"trigger_type": WorkflowDefinition.TriggerType.ON_TIME, "scheduled_at": now.isoformat()},
+                            output_data={"executed_steps": []},
+                        )
+                    )
+                last_id = asset.id
+                processed += 1
+            _queue_workflow_runs(runs)
+            budgets[workflow.tenant_id] -= len(runs)
+
+        if capped:
+            # Stay due so the next tick continues after the last handled asset.
+            WorkflowDefinition.objects.filter(id=workflow.id).update(next_run_at=now, schedule_cursor=last_id)
+        elif workflow.schedule_cursor is not None:
+            WorkflowDefinition.objects.filter(id=workflow.id).update(schedule_cursor=None)
+
+    workflow_scheduler_assets_per_tick.observe(processed)
+    return processed
@@ -0,0 +1,62 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Asset, ScanEvent, Tenant, TenantMembership, WorkflowDefinition
+from .realtime import has_subscribers, publish_event
+from .serializers import AssetSerializer, ScanEventSerializer
+from .services import invalidate_asset_lookups, invalidate_tenant_role, invalidate_workflow_plans
+
+
+@receiver([post_save, post_delete], sender=WorkflowDefinition)
+def invalidate_workflow_plans_on_change(sender, instance, **kwargs):
+    tenant_id = instance.tenant_id
+    invalidate_workflow_plans(tenant_id)
+    # Bump again after commit so no worker keeps a plan compiled from pre-commit rows.
+    transaction.on_commit(lambda: invalidate_workflow_plans(tenant_id))
+
+
+@receiver(post_save, sender=Tenant)
+def invalidate_workflow_plans_on_tenant_change(sender, instance, **kwargs):
+    # Tenant.settings carries workflow_execution_mode, which is cached with the plans.
+    invalidate_workflow_plans(instance.id)
+    transaction.on_commit(lambda: invalidate_workflow_plans(instance.id))
+
+
+@receiver([post_save, post_delete], sender=Asset)
+def invalidate_asset_lookups_on_change(sender, instance, **kwargs):
+    tenant_id = instance.tenant_id
+    barcodes = {instance.barcode_value, getattr(instance, "_loaded_barcode_value", None)}
+    instance._loaded_barcode_value = instance.barcode_value
+    invalidate_asset_lookups(tenant_id, barcodes)
+    # Evict again after commit in case a concurrent lookup cached the pre-commit row.
+    transaction.on_commit(lambda: invalidate_asset_lookups(tenant_id, barcodes))
+
+
+@receiver([post_save, post_delete], sender=TenantMembership)
+def invalidate_tenant_role_on_change(sender, instance, **kwargs):
+    tenant_id, user_id = instance.tenant_id, instance.user_id
+    invalidate_tenant_role(tenant_id, user_id)
+    transaction.on_commit(lambda: invalidate_tenant_role(tenant_id, user_id))
+
+
+@receiver(post_save, sender=Asset)
+def publish_asset_change(sender, instance, **kwargs):
+    if has_subscribers(instance.tenant_id):
+        # Serialize now, while the instance matches the saved row; deliver only once committed.
+        tenant_id, rows = instance.tenant_id, [AssetSerializer(instance).data]
+        transaction.on_commit(lambda: publish_event(tenant_id, "asset.changed", rows))
+
+
+@receiver(post_delete, sender=Asset)
+def publish_asset_deletion(sender, instance, **kwargs):
+    if has_subscribers(instance.tenant_id):
+        tenant_id, rows = instance.tenant_id, [{"id": instance.pk}]
+        transaction.on_commit(lambda: publish_event(tenant_id, "asset.deleted", rows))
+
+
+@receiver(post_save, sender=ScanEvent)
+def publish_scan_event_change(sender, instance, **kwargs):
+    if has_subscribers(instance.tenant_id):
+        tenant_id, rows = instance.tenant_id, [ScanEventSerializer(instance).data]
+        transaction.on_commit(lambda: publish_event(tenant_id, "scan_event.changed", rows))
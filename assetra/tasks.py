@@ -6,43 +6,228 @@ from datetime import timedelta
 from urllib.error import HTTPError, URLError
 from urllib.request import Request, urlopen
 
-from celery import shared_task
+from celery import chord, group, shared_task
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Max
 from django.utils import timezone
 
-from .models import BarcodeBatch, BarcodeLabel, WebhookDelivery, WebhookEndpoint
+from .labels import get_compiled_zpl_template, write_label_sheet_pdf
+from .models import Asset, AssetTombstone, BarcodeBatch, BarcodeLabel, ScanEvent, WebhookDelivery, WebhookEndpoint, WorkflowRun
 from .observability import (
     track_webhook_delivery,
+    scan_pipeline_lag_seconds,
     webhook_dead_letters_total,
     webhook_deliveries_total,
 )
-from .services import render_zpl
+from .services import (
+    execute_pending_workflow_run,
+    run_due_workflows,
+    run_scan_post_processing,
+    tombstone_retention_horizon,
+)
 
 DEFAULT_MAX_WEBHOOK_ATTEMPTS = 5
 DEFAULT_WEBHOOK_TIMEOUT_SECONDS = 10
 DEFAULT_WEBHOOK_RETRY_BASE_SECONDS = 60
 
 
-@shared_task
-def generate_barcode_batch(batch_id: int) -> int:
-    batch = BarcodeBatch.objects.select_related("template").get(pk=batch_id)
+def _generate_label_range(batch: BarcodeBatch, first: int, last: int) -> int:
+    """Bulk-insert labels ``first..last`` of ``batch`` in chunks, resuming after the highest stored sequence.
+
+    Each chunk is one atomic ``bulk_create``, so every sequence below the
+    highest stored one exists and a rerun after a crash continues where the
+    last committed chunk ended. The ``(batch, sequence)`` unique constraint
+    turns any overlap into a no-op instead of duplicate labels, and only the
+    rows a chunk actually inserted are added to ``labels_generated``.
+    """
     template = batch.template
+    compiled_zpl = get_compiled_zpl_template(template) if template and template.zpl_template else None
+    chunk_size = settings.BARCODE_LABEL_CHUNK_SIZE
+    stored = BarcodeLabel.objects.filter(batch=batch, sequence__gte=first, sequence__lte=last).aggregate(Max("sequence"))["sequence__max"]
+    start = first if stored is None else stored + 1
+
     created = 0
-    for value in range(batch.start_sequence, batch.end_sequence + 1):
-        code_value = f"{batch.prefix}{value}"
-        zpl = ""
-        if template and template.zpl_template:
-            zpl = render_zpl(template.zpl_template, {"code": code_value})
-        BarcodeLabel.objects.create(
-            tenant=batch.tenant,
-            batch=batch,
-            code_value=code_value,
-            zpl_payload=zpl,
-            render_payload={"sequence": value},
-        )
-        created += 1
+    for chunk_start in range(start, last + 1, chunk_size):
+        chunk_end = min(chunk_start + chunk_size - 1, last)
+        labels = []
+        for value in range(chunk_start, chunk_end + 1):
+            code_value = f"{batch.prefix}{value}"
+            labels.append(
+                BarcodeLabel(
+                    tenant_id=batch.tenant_id,
+                    batch=batch,
+                    sequence=value,
+                    code_value=code_value,
+                    zpl_payload=compiled_zpl.render({"code": code_value}) if compiled_zpl else "",
+                    render_payload={"sequence": value},
+                )
+            )
+        # ignore_conflicts reports no inserted rows, so count the chunk's range around the insert.
+        stored_in_chunk = BarcodeLabel.objects.filter(batch=batch, sequence__gte=chunk_start, sequence__lte=chunk_end)
+        existing = stored_in_chunk.count()
+        BarcodeLabel.objects.bulk_create(labels, ignore_conflicts=True)
+        inserted = stored_in_chunk.count() - existing
+        if inserted:
+            BarcodeBatch.objects.filter(pk=batch.pk).update(labels_generated=F("labels_generated") + inserted)
+        created += inserted
+    return created
+
+
+def barcode_batch_shards(batch: BarcodeBatch) -> list[tuple[int, int]]:
+    """Split a batch into ``(first, last)`` sequence shards of the batch's fixed shard size."""
+    size = batch.shard_size or batch.labels_total or 1
+    return [(first, min(first + size - 1, batch.end_sequence)) for first in range(batch.start_sequence, batch.end_sequence + 1, size)]
+
+
+@shared_task(acks_late=True, reject_on_worker_lost=True)
+def generate_barcode_batch(batch_id: int) -> int:
+    """Generate a batch's labels; a redelivered task resumes instead of starting over.
+
+    Batches larger than ``BARCODE_SHARD_SIZE`` are split into sequence shards
+    generated in parallel by a Celery chord, whose callback completes the batch.
+    """
+    batch = BarcodeBatch.objects.select_related("template").get(pk=batch_id)
+    if batch.status == BarcodeBatch.Status.COMPLETED:
+        return 0
+    # Recount on (re)start so progress stays exact after a crash between a chunk and its progress update.
+    BarcodeBatch.objects.filter(pk=batch.pk).update(
+        status=BarcodeBatch.Status.GENERATING,
+        labels_generated=BarcodeLabel.objects.filter(batch=batch).count(),
+    )
+
+    if batch.shard_size is None and batch.labels_total > settings.BARCODE_SHARD_SIZE:
+        batch.shard_size = settings.BARCODE_SHARD_SIZE
+        BarcodeBatch.objects.filter(pk=batch.pk).update(shard_size=batch.shard_size)
+    if batch.shard_size is not None:
+        shards = group(generate_barcode_shard.s(batch.pk, first, last) for first, last in barcode_batch_shards(batch))
+        chord(shards)(finalize_barcode_batch.s(batch.pk).on_error(fail_barcode_batch.si(batch.pk)))
+        return 0
+
+    try:
+        created = _generate_label_range(batch, batch.start_sequence, batch.end_sequence)
+    except Exception:
+        BarcodeBatch.objects.filter(pk=batch.pk).update(status=BarcodeBatch.Status.FAILED)
+        raise
+    BarcodeBatch.objects.filter(pk=batch.pk).update(status=BarcodeBatch.Status.COMPLETED, completed_at=timezone.now())
     return created
 
 
+@shared_task(acks_late=True, reject_on_worker_lost=True)
+def generate_barcode_shard(batch_id: int, first: int, last: int) -> int:
+    """Generate one shard; retries resume inside the shard and never double-insert."""
+    batch = BarcodeBatch.objects.select_related("template").get(pk=batch_id)
+    return _generate_label_range(batch, first, last)
+
+
+@shared_task
+def finalize_barcode_batch(shard_results: list[int], batch_id: int) -> dict:
+    """Chord callback: record the exact label count and complete the batch."""
+    batch = BarcodeBatch.objects.get(pk=batch_id)
+    labels = BarcodeLabel.objects.filter(batch=batch).count()
+    batch_status = BarcodeBatch.Status.COMPLETED if labels == batch.labels_total else BarcodeBatch.Status.FAILED
+    BarcodeBatch.objects.filter(pk=batch.pk).update(status=batch_status, labels_generated=labels, completed_at=timezone.now())
+    return {"batch_id": batch_id, "status": batch_status, "shards": len(shard_results), "created": sum(shard_results), "labels": labels}
+
+
+@shared_task
+def fail_barcode_batch(batch_id: int) -> None:
+    BarcodeBatch.objects.filter(pk=batch_id).update(
+        status=BarcodeBatch.Status.FAILED,
+        labels_generated=BarcodeLabel.objects.filter(batch_id=batch_id).count(),
+    )
+
+
+@shared_task
+def render_barcode_batch_pdf(batch_id: int) -> str:
+    """Stream a batch's label sheet PDF to disk and point its labels at the file."""
+    batch = BarcodeBatch.objects.select_related("template").get(pk=batch_id)
+    path = settings.LABEL_PDF_ROOT / f"tenant-{batch.tenant_id}" / f"barcode-batch-{batch.pk}.pdf"
+    write_label_sheet_pdf(batch, path)
+    BarcodeLabel.objects.filter(batch=batch).update(pdf_path=str(path))
+    return str(path)
+
+
+@shared_task
+def process_scan_event(scan_event_id: int) -> list[int]:
+    """Run deferred history/workflow stages for a scan, preserving per-asset order.
+
+    The asset row is locked and every pending scan for it up to this one is
+    drained in id order, so scans for the same asset are processed in the order
+    they were acknowledged even if their tasks are picked up out of order.
+    """
+    scan = ScanEvent.objects.filter(pk=scan_event_id).values("id", "asset_id").first()
+    if not scan:
+        return []
+
+    with transaction.atomic():
+        pending = ScanEvent.objects.select_related("location", "scanner").filter(pending_post_processing=True)
+        asset = None
+        if scan["asset_id"]:
+            asset = Asset.objects.select_for_update().filter(pk=scan["asset_id"]).first()
+            pending = pending.filter(asset_id=scan["asset_id"], id__lte=scan["id"])
+        else:
+            pending = pending.filter(pk=scan["id"])
+
+        processed = []
+        for pending_scan in pending.order_by("id"):
+            if asset is not None:
+                # Share one locked instance so each scan sees the previous one's workflow effects.
+                pending_scan.asset = asset
+            scan_pipeline_lag_seconds.observe((timezone.now() - pending_scan.created_at).total_seconds())
+            run_scan_post_processing(pending_scan, actor=pending_scan.scanner)
+            processed.append(pending_scan.id)
+        ScanEvent.objects.filter(id__in=processed).update(pending_post_processing=False, updated_at=timezone.now())
+    return processed
+
+
+@shared_task
+def execute_workflow_run(run_id: int) -> str | None:
+    """Execute one PENDING run queued by parallel workflow mode.
+
+    The run's asset row is locked for the duration, so runs touching the same
+    asset apply their side effects one at a time.
+    """
+    with transaction.atomic():
+        asset_id = WorkflowRun.objects.filter(id=run_id).values_list("asset_id", flat=True).first()
+        asset = Asset.objects.select_for_update().filter(id=asset_id).first() if asset_id else None
+        run = (
+            WorkflowRun.objects.select_for_update(of=("self",))
+            .select_related("workflow", "scan_event")
+            .filter(id=run_id, status=WorkflowRun.RunStatus.PENDING)
+            .first()
+        )
+        if run is None:
+            return None
+        execute_pending_workflow_run(run, asset=asset)
+    return run.status
+
+
+@shared_task
+def run_scheduled_workflows() -> int:
+    return run_due_workflows()
+
+
+def enqueue_scan_post_processing(scan_ids: list[int]) -> None:
+    """Queue one pipeline task per asset (its latest scan drains the rest) and per asset-less scan."""
+    scans = ScanEvent.objects.filter(id__in=scan_ids).values_list("id", "asset_id")
+    latest_by_asset: dict[int, int] = {}
+    for scan_id, asset_id in scans:
+        if asset_id is None:
+            process_scan_event.delay(scan_id)
+        else:
+            latest_by_asset[asset_id] = max(scan_id, latest_by_asset.get(asset_id, 0))
+    for scan_id in latest_by_asset.values():
+        process_scan_event.delay(scan_id)
+
+
+@shared_task
+def compact_asset_tombstones() -> int:
+    """Drop tombstones past the sync retention window; older cursors must fully resync."""
+    deleted, _by_model = AssetTombstone.objects.filter(updated_at__lt=tombstone_retention_horizon()).delete()
+    return deleted
+
+
 def _build_signature(secret: str, timestamp: str, payload_text: str) -> str:
     digest = hmac.new(secret.encode("utf-8"), f"{timestamp}.{payload_text}".encode("utf-8"), hashlib.sha256).hexdigest()
     return f"sha256={digest}"
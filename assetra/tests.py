@@ -1,19 +1,72 @@
+import asyncio
+import gzip
+import json
+import re
+import tempfile
+import time
+import uuid
+from contextlib import suppress
+from datetime import date, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.urls import reverse
+from django.core.cache import cache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import IntegrityError, connection
+from django.db.models import F
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve, reverse
+from django.utils import timezone
 from unittest.mock import patch
 
+from prometheus_client import REGISTRY
 from rest_framework import status
+from rest_framework.renderers import JSONRenderer
 from rest_framework.test import APITestCase
 from rest_framework_simplejwt.tokens import RefreshToken
 
-from .models import Asset, Tenant, TenantMembership, WebhookDelivery, WebhookEndpoint, WorkflowDefinition, WorkflowRun
-from .tasks import dispatch_webhook
+from .models import Asset, AssetStateHistory, AssetTombstone, BarcodeBatch, BarcodeLabel, BarcodeTemplate, ScanEvent, Tenant, TenantMembership, WebhookDelivery, WebhookEndpoint, WorkflowDefinition, WorkflowRun
+from .gs1 import GS1Error, parse_gs1
+from .labels import CODE128_FNC1, CODE128_START_B, _code128_values, barcode_glyph, get_compiled_zpl_template
+from .pagination import TenantCursorPagination
+from .realtime import InMemoryBackend, has_subscribers, publish_event
+from .renderers import ORJSONRenderer
+from .serializers import (
+    AssetSerializer,
+    AssetTombstoneSerializer,
+    ScanEventSerializer,
+    asset_tombstone_values_serializer,
+    asset_values_serializer,
+    scan_event_values_serializer,
+)
+from .services import (
+    decode_sync_cursor,
+    encode_sync_cursor,
+    execute_triggered_workflows,
+    get_tenant_role,
+    get_workflow_plans,
+    lookup_assets_by_barcode,
+)
+from .tasks import (
+    compact_asset_tombstones,
+    render_barcode_batch_pdf,
+    dispatch_webhook,
+    generate_barcode_batch,
+    generate_barcode_shard,
+    process_scan_event,
+    run_scheduled_workflows,
+)
 
 User = get_user_model()
 
 
 class TestAssetraAPI(APITestCase):
     def setUp(self):
+        cache.clear()
         self.user = User.objects.create_user(username="operator", password="secret123")
         self.tenant = Tenant.objects.create(name="Demo Tenant", slug="demo-tenant")
         TenantMembership.objects.create(
@@ -53,11 +106,434 @@ class TestAssetraAPI(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertEqual(Asset.objects.count(), 1)
 
+    def test_barcode_lookup_is_cached_and_evicted_on_asset_save(self):
+        asset = Asset.objects.create(tenant=self.tenant, asset_tag="L-1", name="Lift", barcode_value="LIFT-1")
+        Asset.objects.create(tenant=self.other_tenant, asset_tag="L-1", name="Other lift", barcode_value="LIFT-1")
+        url = reverse("asset-lookup")
+        self.assertEqual(self.client.get(url, {"barcode": "LIFT-1"}).data["id"], asset.id)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, {"barcode": "LIFT-1"})
+        self.assertEqual(response.data["name"], "Lift")
+        self.assertFalse([query for query in queries if 'FROM "assetra_asset"' in query["sql"]])
+
+        self.assertEqual(self.client.get(url, {"barcode": "LIFT-2"}).status_code, status.HTTP_404_NOT_FOUND)
+        # A zero-padded tenant header shares the cache entry that asset saves evict.
+        self.assertEqual(lookup_assets_by_barcode(f"0{self.tenant.id}", ["LIFT-1"])["LIFT-1"]["name"], "Lift")
+        response = self.client.patch(reverse("asset-detail", args=[asset.id]), {"barcode_value": "LIFT-2", "name": "Lift B"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.client.get(url, {"barcode": "LIFT-1"}).status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self.client.get(url, {"barcode": "LIFT-2"}).data["name"], "Lift B")
+        self.assertIsNone(lookup_assets_by_barcode(f"0{self.tenant.id}", ["LIFT-1"])["LIFT-1"])
+
+        Asset.objects.create(tenant=self.tenant, asset_tag="L-2", name="Duplicate", barcode_value="LIFT-2")
+        Asset.objects.create(tenant=self.tenant, asset_tag="L-3", name="Hoist", barcode_value="HOIST-1")
+        self.client.force_authenticate(self.auditor)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(
+                reverse("asset-lookup-bulk"), {"barcodes": ["LIFT-2", "HOIST-1", "NOPE", "LIFT-1"]}, format="json"
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["found"], 2)
+        self.assertEqual(response.data["results"]["LIFT-2"]["id"], asset.id)
+        self.assertIsNone(response.data["results"]["NOPE"])
+        self.assertEqual(len([query for query in queries if 'FROM "assetra_asset"' in query["sql"]]), 1)
+        self.assertEqual(self.client.post(reverse("asset-lookup-bulk"), {"barcodes": []}, format="json").status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_list_endpoints_use_stable_cursor_pagination(self):
+        assets = [Asset.objects.create(tenant=self.tenant, asset_tag=f"P-{index}", name="Paged") for index in range(5)]
+        page = self.client.get(reverse("asset-list"), {"page_size": 2})
+        self.assertEqual(page.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(page.data), {"next", "previous", "results"})
+        seen = [row["id"] for row in page.data["results"]]
+
+        # Rows inserted while a client walks the pages never shift later pages.
+        Asset.objects.create(tenant=self.tenant, asset_tag="P-new", name="Paged")
+        while page.data["next"]:
+            page = self.client.get(page.data["next"])
+            seen += [row["id"] for row in page.data["results"]]
+        self.assertEqual(seen, [asset.id for asset in reversed(assets)])
+
+        # A non-unique ?ordering= column is tie-broken by id, so pages neither skip nor repeat rows.
+        seen = []
+        with CaptureQueriesContext(connection) as queries:
+            page = self.client.get(reverse("asset-list"), {"page_size": 2, "ordering": "-status"})
+        self.assertRegex(
+            next(query["sql"] for query in queries if 'FROM "assetra_asset"' in query["sql"]),
+            r'ORDER BY "assetra_asset"\."status" DESC, "assetra_asset"\."id" DESC',
+        )
+        seen += [row["id"] for row in page.data["results"]]
+        while page.data["next"]:
+            page = self.client.get(page.data["next"])
+            seen += [row["id"] for row in page.data["results"]]
+        self.assertEqual(seen, sorted(Asset.objects.filter(tenant=self.tenant).values_list("id", flat=True), reverse=True))
+
+        with patch.object(TenantCursorPagination, "max_page_size", 3):
+            self.assertEqual(len(self.client.get(reverse("asset-list"), {"page_size": 5000}).data["results"]), 3)
+        runs = self.client.get(reverse("workflow-run-list"))
+        self.assertEqual((runs.status_code, runs.data["results"]), (status.HTTP_200_OK, []))
+
+    def _query_plan(self, sql: str) -> str:
+        with connection.cursor() as cursor:
+            if connection.vendor == "postgresql":
+                # Seeded test tables are small; only a missing index should make the planner scan.
+                cursor.execute("SET LOCAL enable_seqscan = off")
+                cursor.execute("EXPLAIN " + sql)
+            else:
+                cursor.execute("EXPLAIN QUERY PLAN " + sql)
+            return "\n".join(str(row[-1]) for row in cursor.fetchall())
+
+    def test_hot_endpoints_use_composite_indexes(self):
+        for tenant, count in ((self.tenant, 2000), (self.other_tenant, 2000)):
+            Asset.objects.bulk_create(
+                Asset(tenant=tenant, asset_tag=f"IX-{index}", name="Indexed", barcode_value=f"IX-{index}") for index in range(count)
+            )
+            ScanEvent.objects.bulk_create(
+                ScanEvent(tenant=tenant, symbology="qr", raw_value=f"IX-{index}", source_type="rfid") for index in range(count)
+            )
+            AssetTombstone.objects.bulk_create(
+                AssetTombstone(tenant=tenant, asset_id=index, asset_tag=f"GONE-{index}", reason="deleted") for index in range(count // 4)
+            )
+        workflow = WorkflowDefinition.objects.create(tenant=self.tenant, name="Indexed", trigger_type="on_scan", steps=[])
+        WorkflowRun.objects.bulk_create(WorkflowRun(tenant=self.tenant, workflow=workflow, status="success") for _ in range(500))
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+        # endpoint -> (table, marker identifying the hot query, index it must use)
+        hot_paths = [
+            (lambda: self.client.post(reverse("sync"), {"scan_events": []}, format="json"), "assetra_asset", "ORDER BY", "assetra_asset_sync_idx"),
+            (lambda: self.client.post(reverse("sync"), {"scan_events": []}, format="json"), "assetra_assettombstone", "ORDER BY", "assetra_tombstone_sync_idx"),
+            (lambda: self.client.get(reverse("live-data")), "assetra_asset", "ORDER BY", "assetra_asset_sync_idx"),
+            (lambda: self.client.get(reverse("live-data")), "assetra_scanevent", "ORDER BY", "assetra_scan_created_idx"),
+            (lambda: self.client.get(reverse("asset-list")), "assetra_asset", "ORDER BY", "assetra_asset_page_idx"),
+            (lambda: self.client.get(reverse("asset-list"), {"status": "retired"}), "assetra_asset", "status", "assetra_asset_status_idx"),
+            (lambda: self.client.get(reverse("asset-lookup"), {"barcode": "IX-7"}), "assetra_asset", "barcode_value", "assetra_asset_barcode_idx"),
+            (lambda: self.client.get(reverse("workflow-run-list")), "assetra_workflowrun", "ORDER BY", "assetra_run_page_idx"),
+        ]
+        for request, table, marker, index_name in hot_paths:
+            with CaptureQueriesContext(connection) as queries:
+                self.assertEqual(request().status_code, status.HTTP_200_OK)
+            statements = [query["sql"] for query in queries if f'FROM "{table}"' in query["sql"] and marker in query["sql"]]
+            self.assertTrue(statements, f"no {table} query captured for {index_name}")
+            plan = self._query_plan(statements[0])
+            self.assertNotRegex(plan, rf"Seq Scan|SCAN {table}\b", f"{index_name} not used:\n{plan}")
+            self.assertIn(index_name, plan)
+
+    def test_tenant_role_is_resolved_once_per_request_and_evicted_on_change(self):
+        asset = Asset.objects.create(tenant=self.tenant, asset_tag="R-1", name="Role", barcode_value="ROLE-1")
+
+        def membership_queries(request):
+            with CaptureQueriesContext(connection) as queries:
+                response = request()
+            return response, len([query for query in queries if 'FROM "assetra_tenantmembership"' in query["sql"]])
+
+        # has_permission, has_object_permission and the assigned_to check share one lookup.
+        response, count = membership_queries(
+            lambda: self.client.patch(reverse("asset-detail", args=[asset.id]), {"assigned_to": self.user.id}, format="json")
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertLessEqual(count, 1)
+        response, count = membership_queries(lambda: self.client.get(reverse("auth_context")))
+        self.assertEqual((response.data["role"], count), (TenantMembership.Role.OPERATOR, 0))
+
+        membership = TenantMembership.objects.get(tenant=self.tenant, user=self.user)
+        membership.role = TenantMembership.Role.READ_ONLY
+        membership.save()
+        response, count = membership_queries(
+            lambda: self.client.patch(reverse("asset-detail", args=[asset.id]), {"name": "Demoted"}, format="json")
+        )
+        self.assertEqual((response.status_code, count), (status.HTTP_403_FORBIDDEN, 1))
+
+        membership.delete()
+        self.assertEqual(self.client.get(reverse("auth_context")).status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_tenant_role_cache_is_shared_by_equivalent_tenant_headers(self):
+        padded_tenant_id = f"0{self.tenant.id}"
+        self.assertEqual(get_tenant_role(padded_tenant_id, self.user.id), TenantMembership.Role.OPERATOR)
+        self.assertIsNone(get_tenant_role("not-a-tenant", self.user.id))
+
+        # The eviction on change uses the integer id, so it must clear the entry cached for "01".
+        TenantMembership.objects.filter(tenant=self.tenant, user=self.user).get().delete()
+        self.assertIsNone(get_tenant_role(padded_tenant_id, self.user.id))
+
     def test_sync_endpoint(self):
         response = self.client.post(reverse("sync"), {"scan_events": []}, format="json")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertIn("asset_changes", response.data)
 
+    def test_sync_upserts_pushed_scan_events_in_order(self):
+        asset = Asset.objects.create(tenant=self.tenant, asset_tag="A-1100", name="Sync Asset", barcode_value="QR-A-1100")
+        first_id, second_id = str(uuid.uuid4()), str(uuid.uuid4())
+        scan_events = [
+            {"client_event_id": first_id, "symbology": "qr", "raw_value": "QR-A-1100", "source_type": "camera", "asset": asset.id},
+            {"client_event_id": second_id, "symbology": "bogus", "raw_value": "X-1", "source_type": "rfid"},
+            {"client_event_id": first_id, "symbology": "qr", "raw_value": "QR-A-1100", "source_type": "rfid", "asset": asset.id},
+        ]
+
+        response = self.client.post(reverse("sync"), {"scan_events": scan_events}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        accepted = response.data["accepted_scan_event_ids"]
+        self.assertEqual(ScanEvent.objects.filter(tenant=self.tenant).count(), 2)
+        self.assertEqual(accepted[0], accepted[2])
+
+        first = ScanEvent.objects.get(id=accepted[0])
+        self.assertEqual(str(first.client_event_id), first_id)
+        self.assertEqual(first.source_type, "rfid")
+        self.assertEqual(first.status, ScanEvent.ScanStatus.VALIDATED)
+        self.assertEqual(first.decoded_payload["raw"], "QR-A-1100")
+        self.assertEqual(first.scanner, self.user)
+        rejected = ScanEvent.objects.get(id=accepted[1])
+        self.assertEqual(rejected.status, ScanEvent.ScanStatus.REJECTED)
+        self.assertIn("unsupported symbology", rejected.validation_errors)
+
+        replay = self.client.post(reverse("sync"), {"scan_events": scan_events}, format="json")
+        self.assertEqual(replay.data["accepted_scan_event_ids"], accepted)
+        self.assertEqual(ScanEvent.objects.filter(tenant=self.tenant).count(), 2)
+
+    @override_settings(SYNC_COMMIT_LAG_SECONDS=0)
+    def test_sync_cursor_pages_through_shared_timestamps(self):
+        assets = [
+            Asset.objects.create(tenant=self.tenant, asset_tag=f"A-12{index:02d}", name="Paged Asset")
+            for index in range(5)
+        ]
+        shared = timezone.now()
+        Asset.objects.filter(id__in=[asset.id for asset in assets[1:4]]).update(updated_at=shared)
+
+        seen = []
+        payload = {"page_size": 2}
+        for _page in range(5):
+            response = self.client.post(reverse("sync"), payload, format="json")
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertLessEqual(len(response.data["asset_changes"]), 2)
+            seen.extend(row["id"] for row in response.data["asset_changes"])
+            payload = {"page_size": 2, "cursor": response.data["next_cursor"]}
+            if not response.data["has_more"]:
+                break
+
+        self.assertFalse(response.data["has_more"])
+        self.assertCountEqual(seen, [asset.id for asset in assets])
+        self.assertEqual(len(seen), len(set(seen)))
+
+        idle = self.client.post(reverse("sync"), payload, format="json")
+        self.assertEqual(idle.data["asset_changes"], [])
+        self.assertEqual(decode_sync_cursor(idle.data["next_cursor"])[0], decode_sync_cursor(payload["cursor"])[0])
+
+        invalid = self.client.post(reverse("sync"), {"cursor": "not-a-cursor"}, format="json")
+        self.assertEqual(invalid.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("cursor", invalid.data)
+
+    @override_settings(SYNC_COMMIT_LAG_SECONDS=0)
+    def test_sync_cursor_from_an_empty_legacy_page_keeps_the_sync_point(self):
+        for index in range(5):
+            Asset.objects.create(tenant=self.tenant, asset_tag=f"L-{index}", name="Legacy")
+
+        first = self.client.post(reverse("sync"), {"last_sync_at": (timezone.now() + timedelta(hours=1)).isoformat()}, format="json")
+        self.assertEqual(first.data["asset_changes"], [])
+        self.assertNotIn(None, decode_sync_cursor(first.data["next_cursor"])[0].values())
+
+        followed = self.client.post(reverse("sync"), {"cursor": first.data["next_cursor"]}, format="json")
+        self.assertEqual((followed.data["asset_changes"], followed.data["asset_tombstones"]), ([], []))
+
+    @override_settings(SYNC_COMMIT_LAG_SECONDS=60)
+    def test_sync_cursor_waits_for_rows_saved_before_a_late_commit(self):
+        served = Asset.objects.create(tenant=self.tenant, asset_tag="C-1", name="Served")
+        Asset.objects.filter(id=served.id).update(updated_at=timezone.now() - timedelta(minutes=5))
+        committed = Asset.objects.create(tenant=self.tenant, asset_tag="C-2", name="Committed")
+        Asset.objects.filter(id=committed.id).update(updated_at=timezone.now() - timedelta(seconds=20))
+
+        first = self.client.post(reverse("sync"), {}, format="json")
+        self.assertEqual([row["id"] for row in first.data["asset_changes"]], [served.id])
+
+        # A transaction that saved before ``committed`` and commits only now.
+        late = Asset.objects.create(tenant=self.tenant, asset_tag="C-3", name="Late")
+        Asset.objects.filter(id=late.id).update(updated_at=timezone.now() - timedelta(seconds=30))
+        Asset.objects.filter(id__in=[committed.id, late.id]).update(updated_at=F("updated_at") - timedelta(minutes=1))
+
+        second = self.client.post(reverse("sync"), {"cursor": first.data["next_cursor"]}, format="json")
+        self.assertEqual([row["id"] for row in second.data["asset_changes"]], [late.id, committed.id])
+
+    @override_settings(SYNC_COMMIT_LAG_SECONDS=0)
+    def test_sync_streams_tombstones_for_deleted_and_retired_assets(self):
+        doomed = Asset.objects.create(tenant=self.tenant, asset_tag="A-1301", name="Doomed")
+        retiring = Asset.objects.create(tenant=self.tenant, asset_tag="A-1302", name="Retiring")
+        cursor = self.client.post(reverse("sync"), {}, format="json").data["next_cursor"]
+
+        self.assertEqual(self.client.delete(reverse("asset-detail", args=[doomed.id])).status_code, status.HTTP_204_NO_CONTENT)
+        patched = self.client.patch(reverse("asset-detail", args=[retiring.id]), {"status": "retired"}, format="json")
+        self.assertEqual(patched.status_code, status.HTTP_200_OK)
+
+        response = self.client.post(reverse("sync"), {"cursor": cursor}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        tombstones = {row["asset_id"]: row["reason"] for row in response.data["asset_tombstones"]}
+        self.assertEqual(tombstones, {doomed.id: "deleted", retiring.id: "retired"})
+        self.assertFalse(response.data["full_resync_required"])
+
+        caught_up = self.client.post(reverse("sync"), {"cursor": response.data["next_cursor"]}, format="json")
+        self.assertEqual(caught_up.data["asset_tombstones"], [])
+
+        AssetTombstone.objects.filter(tenant=self.tenant).update(updated_at=timezone.now() - timedelta(days=90))
+        self.assertEqual(compact_asset_tombstones(), 2)
+        stale_cursor = encode_sync_cursor({"assets": None, "tombstones": None}, as_of=timezone.now() - timedelta(days=90))
+        stale = self.client.post(reverse("sync"), {"cursor": stale_cursor}, format="json")
+        self.assertTrue(stale.data["full_resync_required"])
+
+    def test_values_serializers_render_identically_to_model_serializers(self):
+        parent = Asset.objects.create(tenant=self.tenant, asset_tag="V-1", name="Pärent", custom_fields={"rack": [1, {"u": 4}]})
+        asset = Asset.objects.create(
+            tenant=self.tenant, asset_tag="V-2", name="Child", parent_asset=parent, assigned_to=self.user, status="lost", description=""
+        )
+        ScanEvent.objects.create(
+            tenant=self.tenant, asset=asset, symbology="qr", raw_value="V-2", gps_latitude=Decimal("51.5"), offline_captured_at=timezone.now()
+        )
+        ScanEvent.objects.create(tenant=self.tenant, symbology="ean13", raw_value="4006381333931")
+        AssetTombstone.objects.create(tenant=self.tenant, asset_id=999, asset_tag="V-0", reason="deleted")
+
+        for serializer_class, values_serializer in (
+            (AssetSerializer, asset_values_serializer),
+            (ScanEventSerializer, scan_event_values_serializer),
+            (AssetTombstoneSerializer, asset_tombstone_values_serializer),
+        ):
+            queryset = serializer_class.Meta.model.objects.order_by("id")
+            rows = values_serializer.to_representation(values_serializer.values_list(queryset))
+            self.assertEqual(JSONRenderer().render(rows), JSONRenderer().render(serializer_class(queryset, many=True).data))
+
+    @override_settings(SYNC_COMMIT_LAG_SECONDS=0)
+    def test_orjson_renderer_matches_stdlib_json_and_falls_back(self):
+        payload = {
+            "server_time": timezone.now(),
+            "gps_latitude": Decimal("51.500000"),
+            "client_event_id": uuid.uuid4(),
+            7: "non-string key",
+            "note": "line\u2028separator ü",
+            "rows": (1, 2.5, None, True),
+        }
+        expected = JSONRenderer().render(payload)
+        self.assertEqual(ORJSONRenderer().render(payload), expected)
+        with patch("assetra.renderers.orjson", None):
+            self.assertEqual(ORJSONRenderer().render(payload), expected)
+
+        Asset.objects.create(tenant=self.tenant, asset_tag="J-1", name="Jack")
+        response = self.client.post(reverse("sync"), {}, format="json")
+        self.assertIsInstance(response.accepted_renderer, ORJSONRenderer)
+        self.assertEqual(json.loads(response.content)["asset_changes"][0]["asset_tag"], "J-1")
+        malformed = self.client.post(reverse("sync"), data=b'{"cursor": ', content_type="application/json")
+        self.assertEqual(malformed.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(SYNC_COMMIT_LAG_SECONDS=0)
+    def test_sync_negotiates_compression_and_projects_asset_fields(self):
+        for index in range(40):
+            Asset.objects.create(tenant=self.tenant, asset_tag=f"Z-{index}", name="Compressed")
+        body = gzip.compress(json.dumps({"asset_fields": ["asset_tag", "status"], "page_size": 40}).encode())
+        before = REGISTRY.get_sample_value("assetra_sync_payload_bytes_count", {"direction": "request", "encoding": "gzip"}) or 0
+
+        response = self.client.post(
+            reverse("sync"), data=body, content_type="application/json", HTTP_CONTENT_ENCODING="gzip", HTTP_ACCEPT_ENCODING="br, gzip;q=0.8"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response["Vary"])
+        payload = json.loads(gzip.decompress(response.content))
+        self.assertEqual(len(payload["asset_changes"]), 40)
+        self.assertEqual(set(payload["asset_changes"][0]), {"id", "asset_tag", "status"})
+        self.assertEqual(
+            REGISTRY.get_sample_value("assetra_sync_payload_bytes_count", {"direction": "request", "encoding": "gzip"}), before + 1
+        )
+        self.assertGreater(REGISTRY.get_sample_value("assetra_sync_payload_decoded_bytes_sum", {"direction": "response"}), len(response.content))
+
+        identity = self.client.post(reverse("sync"), {"asset_fields": ["asset_tag"]}, format="json")
+        self.assertFalse(identity.has_header("Content-Encoding"))
+        # Only views that opt in are compressed, however large the response.
+        listing = self.client.get(reverse("asset-list"), HTTP_ACCEPT_ENCODING="gzip")
+        self.assertGreater(len(listing.content), settings.API_COMPRESSION_MIN_BYTES)
+        self.assertFalse(listing.has_header("Content-Encoding"))
+        unknown = self.client.post(reverse("sync"), {"asset_fields": ["asset_tag", "password"]}, format="json")
+        self.assertEqual(unknown.status_code, status.HTTP_400_BAD_REQUEST)
+        unsupported = self.client.post(reverse("sync"), data=body, content_type="application/json", HTTP_CONTENT_ENCODING="br")
+        self.assertEqual(unsupported.status_code, status.HTTP_415_UNSUPPORTED_MEDIA_TYPE)
+        corrupt = self.client.post(reverse("sync"), data=body[:-8], content_type="application/json", HTTP_CONTENT_ENCODING="gzip")
+        self.assertEqual(corrupt.status_code, status.HTTP_400_BAD_REQUEST)
+        with override_settings(API_MAX_DECOMPRESSED_BYTES=16):
+            too_large = self.client.post(reverse("sync"), data=body, content_type="application/json", HTTP_CONTENT_ENCODING="gzip")
+        self.assertEqual(too_large.status_code, status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+
+    async def test_realtime_backend_fans_out_one_rendered_frame_per_event(self):
+        backend = InMemoryBackend()
+        first, second, other = await backend.subscribe("1"), await backend.subscribe("1"), await backend.subscribe("2")
+        with patch("assetra.realtime.get_backend", return_value=backend):
+            self.assertTrue(has_subscribers(1))
+            await sync_to_async(publish_event)(1, "asset.changed", [{"id": 7}])
+        frames = first.frames(heartbeat_seconds=5)
+        frame = await anext(frames)
+        self.assertEqual(frame, b'event: asset.changed\ndata: [{"id":7}]\n\n')
+        self.assertIs(await anext(second.frames(heartbeat_seconds=5)), frame)
+        self.assertTrue(other.queue.empty())
+
+        with override_settings(REALTIME_SUBSCRIBER_QUEUE_SIZE=1):
+            slow = await backend.subscribe("1")
+        backend.publish("1", b"one")
+        backend.publish("1", b"two")
+        await asyncio.sleep(0)
+        self.assertTrue(slow.overflowed)
+        self.assertEqual([frame async for frame in slow.frames(heartbeat_seconds=5)], [])
+        for subscription in (first, second, other, slow):
+            subscription.close()
+        self.assertFalse(backend.has_subscribers("1"))
+
+        wsgi = await sync_to_async(self.client.get)(reverse("live-data-stream"), HTTP_ACCEPT="application/json")
+        self.assertEqual(wsgi.status_code, status.HTTP_501_NOT_IMPLEMENTED)
+
+    async def test_live_data_stream_sends_snapshot_then_committed_deltas(self):
+        await Asset.objects.acreate(tenant=self.tenant, asset_tag="S-1", name="Existing")
+        token = await sync_to_async(lambda: str(RefreshToken.for_user(self.user).access_token))()
+        response = await self.async_client.get(
+            reverse("live-data-stream"),
+            headers={"Authorization": f"Bearer {token}", "X-Tenant-ID": str(self.tenant.id), "Accept": "text/event-stream"},
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        frames = response.streaming_content
+        self.assertTrue((await anext(frames)).startswith(b"retry: "))
+        event, data = (await anext(frames)).decode().split("\n")[:2]
+        self.assertEqual(event, "event: snapshot")
+        self.assertEqual([row["asset_tag"] for row in json.loads(data[len("data: ") :])["assets"]], ["S-1"])
+
+        def create_asset():
+            with self.captureOnCommitCallbacks(execute=True):
+                return Asset.objects.create(tenant=self.tenant, asset_tag="S-2", name="Pushed")
+
+        pushed = await sync_to_async(create_asset)()
+        event, data = (await anext(frames)).decode().split("\n")[:2]
+        self.assertEqual(event, "event: asset.changed")
+        self.assertEqual(json.loads(data[len("data: ") :])[0]["id"], pushed.id)
+
+        # A client disconnect cancels the pending read and drops the subscription.
+        pending = asyncio.ensure_future(anext(frames))
+        await asyncio.sleep(0)
+        pending.cancel()
+        with suppress(asyncio.CancelledError):
+            await pending
+        self.assertFalse(has_subscribers(self.tenant.id))
+
+    async def test_read_endpoints_run_as_async_views(self):
+        for name in ("asset-lookup", "asset-lookup-bulk", "auth_context", "barcode-validate", "live-data"):
+            self.assertTrue(iscoroutinefunction(resolve(reverse(name)).func), name)
+
+        asset = await Asset.objects.acreate(tenant=self.tenant, asset_tag="AS-1", name="Async lift", barcode_value="ASYNC-1")
+        tokens = await sync_to_async(lambda: [str(RefreshToken.for_user(user).access_token) for user in (self.user, self.other_user)])()
+        headers = {"Authorization": f"Bearer {tokens[0]}", "X-Tenant-ID": str(self.tenant.id)}
+
+        context = await self.async_client.get(reverse("auth_context"), headers=headers)
+        self.assertEqual(context.status_code, status.HTTP_200_OK)
+        self.assertEqual(context.json(), {"username": "operator", "tenant_id": str(self.tenant.id), "role": "operator", "can_write": True})
+        lookup = await self.async_client.get(reverse("asset-lookup"), {"barcode": "ASYNC-1"}, headers=headers)
+        self.assertEqual(lookup.json()["id"], asset.id)
+        bulk = await self.async_client.post(reverse("asset-lookup-bulk"), {"barcodes": ["ASYNC-1", "NOPE"]}, content_type="application/json", headers=headers)
+        self.assertEqual(bulk.json()["found"], 1)
+        self.assertEqual((await self.async_client.post(reverse("auth_context"), headers=headers)).status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+
+        outsider = {"Authorization": f"Bearer {tokens[1]}", "X-Tenant-ID": str(self.tenant.id)}
+        self.assertEqual((await self.async_client.get(reverse("auth_context"), headers=outsider)).status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual((await self.async_client.get(reverse("live-data"))).status_code, status.HTTP_401_UNAUTHORIZED)
+
     def test_on_scan_workflow_executes(self):
         workflow = WorkflowDefinition.objects.create(
             tenant=self.tenant,
@@ -106,6 +582,577 @@ class TestAssetraAPI(APITestCase):
         run = WorkflowRun.objects.filter(workflow=workflow, asset=asset).latest("id")
         self.assertEqual(run.status, WorkflowRun.RunStatus.SUCCESS)
 
+    def test_compiled_workflow_plans_are_reused_until_definition_changes(self):
+        asset = Asset.objects.create(tenant=self.tenant, asset_tag="A-2301", name="Plan", barcode_value="QR-A-2301")
+        workflow = WorkflowDefinition.objects.create(
+            tenant=self.tenant,
+            name="Plan Cache Workflow",
+            trigger_type=WorkflowDefinition.TriggerType.ON_SCAN,
+            entry_conditions={"scan_event.source_type": "camera"},
+            steps=[{"action": "update_asset_custom_fields", "fields": {"seen": "{{scan_event.raw_value}}"}}],
+            is_active=True,
+        )
+
+        def trigger(raw_value):
+            run_ids = execute_triggered_workflows(
+                tenant_id=self.tenant.id,
+                trigger_type=WorkflowDefinition.TriggerType.ON_SCAN,
+                asset=asset,
+                extra_context={"scan_event": {"raw_value": raw_value, "source_type": "camera"}},
+            )
+            asset.refresh_from_db()
+            return run_ids
+
+        self.assertEqual(len(trigger("QR-1")), 1)
+        with CaptureQueriesContext(connection) as queries:
+            trigger("QR-2")
+        self.assertFalse(any("assetra_workflowdefinition" in query["sql"] for query in queries.captured_queries))
+        self.assertEqual(asset.custom_fields["seen"], "QR-2")
+
+        workflow.steps = [{"action": "update_asset_custom_fields", "fields": {"seen": "fixed"}}]
+        workflow.save()
+        trigger("QR-3")
+        self.assertEqual(asset.custom_fields["seen"], "fixed")
+
+        workflow.delete()
+        self.assertEqual(trigger("QR-4"), [])
+
+    @override_settings(WORKFLOW_PLAN_MAX_AGE_SECONDS=30)
+    def test_workflow_plans_expire_when_the_version_changes_in_another_process(self):
+        workflow = WorkflowDefinition.objects.create(
+            tenant=self.tenant,
+            name="Remote Edit",
+            trigger_type=WorkflowDefinition.TriggerType.ON_SCAN,
+            entry_conditions={},
+            steps=[{"action": "set_output", "key": "seen", "value": "yes"}],
+            is_active=True,
+        )
+        self.assertEqual(len(get_workflow_plans(self.tenant.id, WorkflowDefinition.TriggerType.ON_SCAN)), 1)
+
+        # Another worker with its own per-process cache deletes the workflow.
+        with patch("assetra.services.cache", LocMemCache("other-process", {})):
+            workflow.delete()
+        self.assertEqual(len(get_workflow_plans(self.tenant.id, WorkflowDefinition.TriggerType.ON_SCAN)), 1)
+        with patch("assetra.services.time.monotonic", return_value=time.monotonic() + 31):
+            self.assertEqual(get_workflow_plans(self.tenant.id, WorkflowDefinition.TriggerType.ON_SCAN), [])
+
+    def test_workflow_run_writes_side_effects_in_one_flush(self):
+        asset = Asset.objects.create(tenant=self.tenant, asset_tag="A-2401", name="Pump", barcode_value="QR-A-2401")
+        WorkflowDefinition.objects.create(
+            tenant=self.tenant,
+            name="Coalesced Workflow",
+            trigger_type=WorkflowDefinition.TriggerType.ON_STATUS_CHANGE,
+            entry_conditions={},
+            steps=[
+                {"action": "set_asset_status", "status": "in_maintenance"},
+                {"action": "update_asset_custom_fields", "fields": {"reason": "{{trigger_type}}"}},
+                {"action": "create_history", "event_type": "inspect"},
+                {"action": "set_output", "key": "done", "value": "yes"},
+            ],
+            is_active=True,
+        )
+        get_workflow_plans(self.tenant.id, WorkflowDefinition.TriggerType.ON_STATUS_CHANGE)
+
+        # SAVEPOINT, asset UPDATE, bulk history INSERT, run INSERT, RELEASE SAVEPOINT.
+        with self.assertNumQueries(5):
+            run_ids = execute_triggered_workflows(
+                tenant_id=self.tenant.id,
+                trigger_type=WorkflowDefinition.TriggerType.ON_STATUS_CHANGE,
+                asset=asset,
+            )
+
+        run = WorkflowRun.objects.get(id=run_ids[0])
+        self.assertEqual(run.status, WorkflowRun.RunStatus.SUCCESS)
+        self.assertEqual(len(run.output_data["executed_steps"]), 4)
+        asset.refresh_from_db()
+        self.assertEqual(asset.status, Asset.Status.IN_MAINTENANCE)
+        self.assertEqual(asset.custom_fields["reason"], WorkflowDefinition.TriggerType.ON_STATUS_CHANGE)
+        history = list(asset.history.order_by("id"))
+        self.assertEqual([entry.event_type for entry in history], ["maintain", "inspect"])
+        self.assertEqual(history[1].new_state, {"status": Asset.Status.IN_MAINTENANCE})
+        self.assertTrue(all(entry.checksum for entry in history))
+
+    def test_workflow_run_is_marked_failed_when_its_flush_fails(self):
+        asset = Asset.objects.create(tenant=self.tenant, asset_tag="A-2403", name="Hoist", barcode_value="QR-A-2403")
+        WorkflowDefinition.objects.create(
+            tenant=self.tenant,
+            name="Unflushable Workflow",
+            trigger_type=WorkflowDefinition.TriggerType.ON_STATUS_CHANGE,
+            entry_conditions={},
+            steps=[{"action": "set_asset_status", "status": "in_maintenance"}],
+            is_active=True,
+        )
+
+        with patch.object(AssetStateHistory.objects, "bulk_create", side_effect=IntegrityError("history insert failed")):
+            run_ids = execute_triggered_workflows(
+                tenant_id=self.tenant.id,
+                trigger_type=WorkflowDefinition.TriggerType.ON_STATUS_CHANGE,
+                asset=Asset.objects.get(id=asset.id),
+            )
+
+        run = WorkflowRun.objects.get(id=run_ids[0])
+        self.assertEqual(run.status, WorkflowRun.RunStatus.FAILED)
+        self.assertEqual(run.output_data["error"], "history insert failed")
+        self.assertIsNotNone(run.completed_at)
+        # The asset UPDATE issued before the failing insert was rolled back.
+        asset.refresh_from_db()
+        self.assertEqual(asset.status, Asset.Status.ACTIVE)
+
+    def test_failed_workflow_run_keeps_earlier_step_effects(self):
+        asset = Asset.objects.create(tenant=self.tenant, asset_tag="A-2402", name="Valve", barcode_value="QR-A-2402")
+        WorkflowDefinition.objects.create(
+            tenant=self.tenant,
+            name="Failing Workflow",
+            trigger_type=WorkflowDefinition.TriggerType.ON_STATUS_CHANGE,
+            entry_conditions={},
+            steps=[
+                {"action": "set_asset_status", "status": "in_maintenance"},
+                {"action": "validate_required_fields", "fields": ["serial"]},
+            ],
+            is_active=True,
+        )
+
+        run_ids = execute_triggered_workflows(
+            tenant_id=self.tenant.id,
+            trigger_type=WorkflowDefinition.TriggerType.ON_STATUS_CHANGE,
+            asset=asset,
+        )
+
+        run = WorkflowRun.objects.get(id=run_ids[0])
+        self.assertEqual(run.status, WorkflowRun.RunStatus.FAILED)
+        self.assertIn("serial", run.output_data["error"])
+        asset.refresh_from_db()
+        self.assertEqual(asset.status, Asset.Status.IN_MAINTENANCE)
+        self.assertEqual(asset.history.filter(event_type=AssetStateHistory.EventType.MAINTAIN).count(), 1)
+
+    def test_parallel_workflow_mode_queues_runs_and_serializes_asset_effects(self):
+        self.tenant.settings = {"workflow_execution_mode": "parallel"}
+        self.tenant.save(update_fields=["settings"])
+        for key in ("first", "second"):
+            WorkflowDefinition.objects.create(
+                tenant=self.tenant,
+                name=f"Parallel {key}",
+                trigger_type=WorkflowDefinition.TriggerType.ON_STATUS_CHANGE,
+                entry_conditions={"new_status": "in_maintenance"},
+                steps=[{"action": "update_asset_custom_fields", "fields": {key: "{{previous_status}}"}}],
+                is_active=True,
+            )
+        asset = Asset.objects.create(tenant=self.tenant, asset_tag="A-2501", name="Lift", barcode_value="QR-A-2501")
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            response = self.client.patch(reverse("asset-detail", args=[asset.id]), {"status": "in_maintenance"}, format="json")
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            runs = WorkflowRun.objects.filter(asset=asset)
+            self.assertEqual(runs.count(), 2)
+            self.assertTrue(all(run.status == WorkflowRun.RunStatus.PENDING for run in runs))
+            self.assertEqual(runs.first().input_data["actor_id"], self.user.id)
+
+        # Both runs go out in one queued group; the other callbacks are lookup cache evictions.
+        self.assertEqual(len([callback for callback in callbacks if callback.__module__ == "assetra.services"]), 1)
+        run_list = self.client.get(reverse("workflow-run-list"), {"asset": asset.id})
+        run_rows = run_list.data["results"]
+        self.assertEqual({row["status"] for row in run_rows}, {WorkflowRun.RunStatus.SUCCESS})
+        asset.refresh_from_db()
+        self.assertEqual(asset.custom_fields, {"first": "active", "second": "active"})
+
+        invalid = self.client.post(
+            reverse("workflow-definition-execute-workflow", args=[WorkflowDefinition.objects.filter(tenant=self.tenant).first().id]),
+            {"mode": "sideways"},
+            format="json",
+        )
+        self.assertEqual(invalid.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(WORKFLOW_SCHEDULER_MAX_RUNS_PER_TENANT=1)
+    def test_on_time_workflows_fire_for_matching_assets_within_tenant_cap(self):
+        invalid = self.client.post(
+            reverse("workflow-definition-list"),
+            {"name": "No Interval", "trigger_type": "on_time", "steps": [{"action": "create_history"}]},
+            format="json",
+        )
+        self.assertEqual(invalid.status_code, status.HTTP_400_BAD_REQUEST)
+
+        workflow = WorkflowDefinition.objects.create(
+            tenant=self.tenant,
+            name="Nightly Inspection",
+            trigger_type=WorkflowDefinition.TriggerType.ON_TIME,
+            entry_conditions={"asset.status": "active", "asset.custom_fields.zone": "A"},
+            steps=[{"action": "create_history", "event_type": "inspect"}],
+            schedule_interval_seconds=3600,
+        )
+        zone_a = [
+            Asset.objects.create(tenant=self.tenant, asset_tag=f"A-26{index}", name="Zone A", custom_fields={"zone": "A"})
+            for index in range(2)
+        ]
+        Asset.objects.create(tenant=self.tenant, asset_tag="A-2690", name="Zone B", custom_fields={"zone": "B"})
+
+        with self.captureOnCommitCallbacks(execute=False):
+            self.assertEqual(run_scheduled_workflows(), 1)
+        pending = WorkflowRun.objects.get(workflow=workflow)
+        self.assertEqual((pending.asset_id, pending.status), (zone_a[0].id, WorkflowRun.RunStatus.PENDING))
+        workflow.refresh_from_db()
+        self.assertEqual(workflow.schedule_cursor, zone_a[0].id)
+
+        # The tenant is at its cap until the pending run finishes.
+        self.assertEqual(run_scheduled_workflows(), 0)
+        with self.captureOnCommitCallbacks(execute=True):
+            WorkflowRun.objects.filter(id=pending.id).update(status=WorkflowRun.RunStatus.SUCCESS)
+            self.assertEqual(run_scheduled_workflows(), 1)
+
+        self.assertEqual(
+            set(WorkflowRun.objects.filter(workflow=workflow).values_list("asset_id", "status")),
+            {(zone_a[0].id, WorkflowRun.RunStatus.SUCCESS), (zone_a[1].id, WorkflowRun.RunStatus.SUCCESS)},
+        )
+        self.assertEqual(zone_a[1].history.filter(event_type=AssetStateHistory.EventType.INSPECT).count(), 1)
+        workflow.refresh_from_db()
+        self.assertIsNone(workflow.schedule_cursor)
+        self.assertGreater(workflow.next_run_at, timezone.now())
+        self.assertEqual(run_scheduled_workflows(), 0)
+
+    @override_settings(BARCODE_LABEL_CHUNK_SIZE=4)
+    def test_barcode_batch_generates_in_chunks_and_resumes_without_duplicates(self):
+        response = self.client.post(
+            reverse("barcode-batch-list"),
+            {"prefix": "LBL-", "start_sequence": 1, "end_sequence": 10},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        batch = BarcodeBatch.objects.get(id=response.data["id"])
+        self.assertEqual((batch.status, batch.labels_generated), (BarcodeBatch.Status.COMPLETED, 10))
+        self.assertIsNotNone(batch.completed_at)
+
+        # Simulate a worker that died after committing the first two chunks.
+        BarcodeLabel.objects.filter(batch=batch, sequence__gt=8).delete()
+        BarcodeBatch.objects.filter(id=batch.id).update(status=BarcodeBatch.Status.GENERATING, labels_generated=8, completed_at=None)
+        self.assertEqual(generate_barcode_batch(batch.id), 2)
+
+        batch.refresh_from_db()
+        self.assertEqual((batch.status, batch.labels_generated), (BarcodeBatch.Status.COMPLETED, 10))
+        self.assertEqual(
+            list(batch.labels.order_by("sequence").values_list("code_value", flat=True)),
+            [f"LBL-{value}" for value in range(1, 11)],
+        )
+        detail = self.client.get(reverse("barcode-batch-detail", args=[batch.id]))
+        self.assertEqual((detail.data["labels_generated"], detail.data["labels_total"]), (10, 10))
+
+    @override_settings(BARCODE_LABEL_CHUNK_SIZE=3, BARCODE_SHARD_SIZE=4)
+    def test_large_barcode_batch_is_sharded_and_finalized_by_chord(self):
+        response = self.client.post(
+            reverse("barcode-batch-list"),
+            {"prefix": "SH-", "start_sequence": 5, "end_sequence": 14},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        batch = BarcodeBatch.objects.get(id=response.data["id"])
+        self.assertEqual(batch.shard_size, 4)
+        self.assertEqual((batch.status, batch.labels_generated), (BarcodeBatch.Status.COMPLETED, 10))
+        self.assertEqual(sorted(batch.labels.values_list("sequence", flat=True)), list(range(5, 15)))
+
+        # A retried shard finds its labels already stored.
+        self.assertEqual(generate_barcode_shard(batch.id, 9, 12), 0)
+        self.assertEqual(batch.labels.count(), 10)
+        # A concurrent redelivery that read the resume point before the first delivery committed
+        # re-inserts the whole shard; the conflicting rows must not be counted again.
+        with patch("django.db.models.query.QuerySet.aggregate", return_value={"sequence__max": None}):
+            self.assertEqual(generate_barcode_shard(batch.id, 9, 12), 0)
+        batch.refresh_from_db()
+        self.assertEqual((batch.labels.count(), batch.labels_generated), (10, 10))
+
+    def test_compiled_zpl_template_renders_escapes_and_recompiles_on_update(self):
+        template = BarcodeTemplate.objects.create(
+            tenant=self.tenant,
+            name="Shelf",
+            symbology="code128",
+            zpl_template="^XA^FD{{code}}^FS^FD\\{{code}} {{unknown}}^FS^XZ",
+        )
+        compiled = get_compiled_zpl_template(template)
+        self.assertEqual(compiled.render({"code": "SKU-1"}), "^XA^FDSKU-1^FS^FD{{code}} {{unknown}}^FS^XZ")
+        self.assertIs(get_compiled_zpl_template(template), compiled)
+
+        template.zpl_template = "^XA^FD{{code}}-{{code}}^FS^XZ"
+        template.save()
+        self.assertEqual(get_compiled_zpl_template(template).render({"code": "B"}), "^XA^FDB-B^FS^XZ")
+
+        batch = BarcodeBatch.objects.create(tenant=self.tenant, template=template, prefix="Z-", start_sequence=1, end_sequence=2)
+        generate_barcode_batch(batch.id)
+        self.assertEqual(batch.labels.get(sequence=2).zpl_payload, "^XA^FDZ-2-Z-2^FS^XZ")
+
+    def test_barcode_batch_pdf_sheet_streams_pages_with_valid_xref(self):
+        template = BarcodeTemplate.objects.create(
+            tenant=self.tenant, name="Large", symbology="code128", width_mm=90, height_mm=60, dpi=203
+        )
+        batch = BarcodeBatch.objects.create(tenant=self.tenant, template=template, prefix="PDF-", start_sequence=1, end_sequence=13)
+        generate_barcode_batch(batch.id)
+
+        response = self.client.get(reverse("barcode-batch-pdf", args=[batch.id]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "application/pdf")
+        chunks = list(response.streaming_content)
+        document = b"".join(chunks)
+        # Two 90x60 mm columns by four rows fit on A4, so 13 labels need two pages.
+        self.assertEqual(document.count(b"/Type /Page "), 2)
+        self.assertGreater(len(chunks), 3)
+        self.assertTrue(document.startswith(b"%PDF-1.4") and document.endswith(b"%%EOF\n"))
+
+        startxref = int(re.search(rb"startxref\n(\d+)", document).group(1))
+        self.assertTrue(document[startxref:].startswith(b"xref"))
+        entries = re.findall(rb"(\d{10}) 00000 n ", document[startxref:])
+        for number, offset in enumerate(entries, start=1):
+            self.assertTrue(document[int(offset):].startswith(b"%d 0 obj" % number))
+
+        self.assertEqual(barcode_glyph("code128", "PDF-1").width, barcode_glyph("code128", "PDF-1").width)
+        self.assertGreater(barcode_glyph.cache_info().hits, 0)
+
+        with self.settings(LABEL_PDF_ROOT=Path(tempfile.mkdtemp())):
+            path = render_barcode_batch_pdf(batch.id)
+        self.assertEqual(Path(path).read_bytes(), document)
+        self.assertEqual(set(batch.labels.values_list("pdf_path", flat=True)), {path})
+
+    def test_gs1_decoder_parses_bracketed_and_fnc1_forms(self):
+        today = date(2026, 10, 17)
+        bracketed = parse_gs1("(01)09501101530003(17)250100(10)LOT-7(3103)001250(21)S/1", today=today)
+        raw = parse_gs1("]C101095011015300031725010010LOT-7\x1d3103001250\x1d21S/1", today=today)
+        self.assertEqual(bracketed, raw)
+        self.assertEqual(raw["fields"]["gtin"], "09501101530003")
+        self.assertEqual(raw["fields"]["lot"], "LOT-7")
+        self.assertEqual(raw["fields"]["serial"], "S/1")
+        self.assertEqual(str(raw["fields"]["expiry"]), "2025-01-31")
+        self.assertEqual(str(raw["fields"]["net_weight_kg"]), "1.250")
+
+        for invalid in ("(01)09501101530004", "0109501101530003(17)", "(01)09501101530003(01)09501101530003", "5512"):
+            with self.assertRaises(GS1Error):
+                parse_gs1(invalid, today=today)
+
+        response = self.client.post(reverse("barcode-validate"), {"symbology": "gs1", "raw_value": "(01)09501101530004"}, format="json")
+        self.assertFalse(response.data["valid"])
+        self.assertIn("AI (01) has an invalid check digit", response.data["errors"])
+        response = self.client.post(reverse("barcode-validate"), {"symbology": "gs1", "raw_value": "(01)09501101530003(10)A1"}, format="json")
+        self.assertTrue(response.data["valid"])
+        self.assertEqual(response.data["decoded"]["gs1"], {"gtin": "09501101530003", "lot": "A1"})
+
+    def test_gs1_128_glyph_ends_inner_variable_length_elements_with_fnc1(self):
+        def code128(text):
+            return [ord(char) - 32 for char in text]
+
+        self.assertEqual(
+            _code128_values("gs1", "(10)ABC(21)X9"),
+            [CODE128_START_B, CODE128_FNC1, *code128("10ABC"), CODE128_FNC1, *code128("21X9")],
+        )
+        # Fixed-length AIs need no separator; the GS-delimited form encodes identically.
+        expected = [CODE128_START_B, CODE128_FNC1, *code128("0109501101530003"), *code128("10LOT-7"), CODE128_FNC1, *code128("3103001250")]
+        self.assertEqual(_code128_values("gs1", "(01)09501101530003(10)LOT-7(3103)001250"), expected)
+        self.assertEqual(_code128_values("gs1", "]C1010950110153000310LOT-7\x1d3103001250"), expected)
+        self.assertIsNone(barcode_glyph("gs1", "(99"))
+
+    def test_batch_barcode_validation_streams_ndjson_in_input_order(self):
+        barcodes = [
+            {"symbology": "gs1", "raw_value": "(01)09501101530003(10)A1"},
+            {"symbology": "qr", "raw_value": "QR-1"},
+            {"symbology": "gs1", "raw_value": "(01)09501101530004"},
+            {"symbology": "bogus", "raw_value": "X"},
+            {"symbology": "gs1", "raw_value": "(01)09501101530003(10)A1"},
+            {"symbology": "code128", "raw_value": ""},
+        ]
+        with patch("assetra.services.parse_gs1", wraps=parse_gs1) as parse:
+            response = self.client.post(reverse("barcode-validate-batch"), {"barcodes": barcodes}, format="json")
+            self.assertEqual(response["Content-Type"], "application/x-ndjson")
+            rows = [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]
+        # The repeated GS1 value is decoded once.
+        self.assertEqual(parse.call_count, 2)
+        self.assertEqual([row["index"] for row in rows], list(range(6)))
+        self.assertEqual([row["valid"] for row in rows], [True, True, False, False, True, False])
+        self.assertEqual(rows[4]["decoded"]["gs1"], {"gtin": "09501101530003", "lot": "A1"})
+        self.assertEqual(rows[3]["errors"], ["unsupported symbology"])
+        self.assertEqual(rows[5]["errors"], ["raw_value is required"])
+
+        response = self.client.post(reverse("barcode-validate-batch"), {"barcodes": []}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(BARCODE_LABEL_CHUNK_SIZE=4)
+    def test_barcode_batch_zpl_export_streams_and_resumes_by_label_range(self):
+        template = BarcodeTemplate.objects.create(
+            tenant=self.tenant, name="Job", symbology="code128", zpl_template="^XA^FD{{code}}^FS^XZ"
+        )
+        batch = BarcodeBatch.objects.create(tenant=self.tenant, template=template, prefix="J-", start_sequence=3, end_sequence=12)
+        generate_barcode_batch(batch.id)
+        url = reverse("barcode-batch-zpl", args=[batch.id])
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Accept-Ranges"], "labels")
+        job = b"".join(response.streaming_content).decode()
+        self.assertEqual(job.splitlines(), [f"^XA^FDJ-{sequence}^FS^XZ" for sequence in range(3, 13)])
+
+        response = self.client.get(url, HTTP_RANGE="labels=9-")
+        self.assertEqual(response.status_code, status.HTTP_206_PARTIAL_CONTENT)
+        self.assertEqual(response["Content-Range"], "labels 9-12/10")
+        self.assertEqual(b"".join(response.streaming_content).decode(), "".join(job.splitlines(keepends=True)[6:]))
+
+        response = self.client.get(url, HTTP_RANGE="labels=-2")
+        self.assertEqual(response["Content-Range"], "labels 11-12/10")
+        self.assertEqual(self.client.get(url, HTTP_RANGE="labels=4-5")["Content-Range"], "labels 4-5/10")
+        self.assertEqual(self.client.get(url, HTTP_RANGE="bytes=0-10").status_code, status.HTTP_200_OK)
+
+        response = self.client.get(url, HTTP_RANGE="labels=13-")
+        self.assertEqual(response.status_code, status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE)
+        self.assertEqual(response["Content-Range"], "labels */10")
+
+    async def test_streamed_exports_stay_streamed_under_asgi(self):
+        def create_batch():
+            template = BarcodeTemplate.objects.create(tenant=self.tenant, name="Async", symbology="code128", zpl_template="^XA^FD{{code}}^FS^XZ")
+            batch = BarcodeBatch.objects.create(tenant=self.tenant, template=template, prefix="AS-", start_sequence=1, end_sequence=9)
+            generate_barcode_batch(batch.id)
+            return batch, str(RefreshToken.for_user(self.user).access_token)
+
+        batch, token = await sync_to_async(create_batch)()
+        headers = {"Authorization": f"Bearer {token}", "X-Tenant-ID": str(self.tenant.id)}
+        requests = [
+            self.async_client.get(reverse("barcode-batch-zpl", args=[batch.id]), headers=headers),
+            self.async_client.get(reverse("barcode-batch-pdf", args=[batch.id]), headers=headers),
+            self.async_client.post(
+                reverse("barcode-validate-batch"),
+                {"barcodes": [{"symbology": "qr", "raw_value": "QR-1"}]},
+                content_type="application/json",
+                headers=headers,
+            ),
+        ]
+        bodies = []
+        for request in requests:
+            response = await request
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            # A sync iterator would be drained into a list by Django's ASGI handler before the first byte.
+            self.assertTrue(response.is_async)
+            bodies.append(b"".join([chunk async for chunk in response.streaming_content]))
+        self.assertEqual(bodies[0].decode().splitlines(), [f"^XA^FDAS-{sequence}^FS^XZ" for sequence in range(1, 10)])
+        self.assertTrue(bodies[1].startswith(b"%PDF-1.4") and bodies[1].endswith(b"%%EOF\n"))
+        self.assertTrue(json.loads(bodies[2])["valid"])
+
+    def test_async_scan_processing_defers_history_and_workflows(self):
+        self.tenant.settings = {"async_scan_processing": True}
+        self.tenant.save(update_fields=["settings"])
+        WorkflowDefinition.objects.create(
+            tenant=self.tenant,
+            name="Deferred Scan Workflow",
+            trigger_type=WorkflowDefinition.TriggerType.ON_SCAN,
+            entry_conditions={},
+            steps=[{"action": "set_asset_status", "status": "in_maintenance"}],
+            is_active=True,
+        )
+        asset = Asset.objects.create(tenant=self.tenant, asset_tag="A-2101", name="Deferred", barcode_value="QR-A-2101")
+
+        scan_ids = []
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            for _ in range(2):
+                response = self.client.post(
+                    reverse("scan-event-list"),
+                    {"asset": asset.id, "symbology": "qr", "raw_value": "QR-A-2101", "source_type": "rfid"},
+                    format="json",
+                )
+                self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+                self.assertEqual(response.data["status"], ScanEvent.ScanStatus.VALIDATED)
+                scan_ids.append(response.data["id"])
+
+        self.assertEqual(len(callbacks), 2)
+        self.assertEqual(ScanEvent.objects.filter(id__in=scan_ids, pending_post_processing=True).count(), 2)
+        self.assertEqual(asset.history.count(), 0)
+        self.assertFalse(WorkflowRun.objects.filter(asset=asset).exists())
+
+        # The later scan's task drains the earlier one first.
+        self.assertEqual(process_scan_event(scan_ids[1]), scan_ids)
+        self.assertEqual(process_scan_event(scan_ids[0]), [])
+        history = list(asset.history.filter(event_type=AssetStateHistory.EventType.SCAN).order_by("id"))
+        self.assertEqual([entry.new_state["last_scan"] for entry in history], [str(scan_id) for scan_id in scan_ids])
+        self.assertEqual(history[1].previous_state["status"], Asset.Status.IN_MAINTENANCE)
+        self.assertEqual(WorkflowRun.objects.filter(asset=asset, status=WorkflowRun.RunStatus.SUCCESS).count(), 2)
+        self.assertFalse(ScanEvent.objects.filter(id__in=scan_ids, pending_post_processing=True).exists())
+
+    def test_scan_batch_reports_per_item_status_and_dedupes_portal_reads(self):
+        asset = Asset.objects.create(tenant=self.tenant, asset_tag="A-2201", name="Pallet", barcode_value="EPC-2201")
+        other_tenant = Tenant.objects.create(name="Other", slug="other-batch")
+        foreign_asset = Asset.objects.create(tenant=other_tenant, asset_tag="A-2202", name="Foreign", barcode_value="EPC-2202")
+        captured_at = timezone.now() - timedelta(minutes=5)
+        first_id = str(uuid.uuid4())
+
+        def read(raw_value, offset_seconds, **extra):
+            return {
+                "symbology": "rfid_epc",
+                "raw_value": raw_value,
+                "offline_captured_at": (captured_at + timedelta(seconds=offset_seconds)).isoformat(),
+                **extra,
+            }
+
+        payload = {
+            "scan_events": [
+                read("EPC-2201", 0, asset=asset.id, client_event_id=first_id),
+                read("EPC-2201", 2, asset=asset.id),
+                read("EPC-2201", 9, asset=asset.id),
+                read("EPC-2202", 0, asset=foreign_asset.id),
+                {"raw_value": "EPC-2203"},
+            ]
+        }
+        response = self.client.post(reverse("scan-event-batch"), payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [result["status"] for result in response.data["results"]],
+            ["accepted", "duplicate", "accepted", "invalid", "invalid"],
+        )
+        self.assertEqual(response.data["counts"], {"accepted": 2, "duplicate": 1, "invalid": 2})
+        self.assertIn("asset", response.data["results"][3]["errors"])
+        self.assertIn("symbology", response.data["results"][4]["errors"])
+        self.assertEqual(response.data["results"][0]["client_event_id"], first_id)
+        self.assertEqual(ScanEvent.objects.filter(tenant=self.tenant, raw_value="EPC-2201").count(), 2)
+        self.assertEqual(asset.history.filter(event_type=AssetStateHistory.EventType.SCAN).count(), 2)
+
+        # Replaying the accepted read is idempotent and does not add history.
+        replay = self.client.post(reverse("scan-event-batch"), {"scan_events": [payload["scan_events"][0]]}, format="json")
+        self.assertEqual(replay.data["results"][0]["status"], "accepted")
+        self.assertEqual(replay.data["results"][0]["id"], response.data["results"][0]["id"])
+        self.assertEqual(ScanEvent.objects.filter(tenant=self.tenant, raw_value="EPC-2201").count(), 2)
+        self.assertEqual(asset.history.filter(event_type=AssetStateHistory.EventType.SCAN).count(), 2)
+
+        # A later batch is deduplicated against reads that are already persisted.
+        later = self.client.post(reverse("scan-event-batch"), {"scan_events": [read("EPC-2201", 11, asset=asset.id)]}, format="json")
+        self.assertEqual(later.data["results"][0]["status"], "duplicate")
+
+    def test_scan_batch_runs_on_scan_workflows_with_batched_writes(self):
+        assets = [Asset.objects.create(tenant=self.tenant, asset_tag=f"A-24{index}", name="Tote", barcode_value=f"EPC-24{index}") for index in range(2)]
+        WorkflowDefinition.objects.create(
+            tenant=self.tenant,
+            name="First Sighting",
+            trigger_type=WorkflowDefinition.TriggerType.ON_SCAN,
+            entry_conditions={"asset.status": "active"},
+            steps=[{"action": "set_asset_status", "status": "in_maintenance"}],
+            is_active=True,
+        )
+        WorkflowDefinition.objects.create(
+            tenant=self.tenant,
+            name="Last Read",
+            trigger_type=WorkflowDefinition.TriggerType.ON_SCAN,
+            entry_conditions={},
+            steps=[{"action": "update_asset_custom_fields", "fields": {"last_read": "{{scan_event.raw_value}}"}}],
+            is_active=True,
+        )
+        reads = [
+            {"symbology": "rfid_epc", "raw_value": raw_value, "asset": asset.id}
+            for asset, raw_value in ((assets[0], "EPC-240"), (assets[1], "EPC-241"), (assets[0], "EPC-240b"))
+        ]
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(reverse("scan-event-batch"), {"scan_events": reads}, format="json")
+        self.assertEqual(response.data["counts"]["accepted"], 3)
+        inserts = [query["sql"] for query in queries if query["sql"].startswith("INSERT")]
+        self.assertEqual(len([sql for sql in inserts if '"assetra_workflowrun"' in sql]), 1)
+        self.assertEqual(len([sql for sql in inserts if '"assetra_assetstatehistory"' in sql]), 1)
+        self.assertEqual(len([query for query in queries if query["sql"].startswith('UPDATE "assetra_asset"')]), 2)
+
+        self.assertEqual(WorkflowRun.objects.filter(tenant=self.tenant).count(), 5)
+        first = Asset.objects.get(id=assets[0].id)
+        self.assertEqual((first.status, first.custom_fields["last_read"]), ("in_maintenance", "EPC-240b"))
+        # The second read of the asset sees the first read's workflow effects.
+        scan_history = first.history.filter(event_type=AssetStateHistory.EventType.SCAN).order_by("id")
+        self.assertEqual([entry.previous_state["status"] for entry in scan_history], ["active", "in_maintenance"])
+
     def test_on_status_change_workflow_executes(self):
         workflow = WorkflowDefinition.objects.create(
             tenant=self.tenant,
@@ -187,7 +1234,7 @@ class TestAssetraAPI(APITestCase):
 
         run_list = self.client.get(reverse("workflow-run-list"))
         self.assertEqual(run_list.status_code, status.HTTP_200_OK)
-        self.assertGreaterEqual(len(run_list.data), 1)
+        self.assertGreaterEqual(len(run_list.data["results"]), 1)
 
     def test_workflow_definition_validation_rejects_invalid_steps(self):
         response = self.client.post(
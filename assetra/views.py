@@ -1,14 +1,25 @@
+import inspect
+import json
+from functools import partial
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
 from django.db import transaction
+from django.http import StreamingHttpResponse
 from django.utils import timezone
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework import mixins, status, viewsets
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from .labels import LABEL_RANGE_UNIT, iter_label_sheet_pdf, iter_label_zpl, parse_label_range
 from .models import (
     Asset,
     AssetCategory,
     AssetStateHistory,
+    AssetTombstone,
     BarcodeBatch,
     DeviceProfile,
     IndustryPreset,
@@ -24,30 +35,143 @@ from .models import (
     WorkflowDefinition,
     WorkflowRun,
 )
-from .permissions import TenantRBACPermission
+from .pagination import TenantCursorPagination
+from .permissions import TenantRBACPermission, atenant_role_for_request
+from .realtime import stream_events
+from .renderers import EventStreamRenderer, ORJSONRenderer
 from .serializers import (
     AssetCategorySerializer,
     AssetSerializer,
     BarcodeBatchSerializer,
+    BarcodeValidationBatchSerializer,
     DeviceProfileSerializer,
     IndustryPresetSerializer,
     IntegrationConnectorSerializer,
     InventorySessionSerializer,
     LocationSerializer,
     NoCodeFormDefinitionSerializer,
+    ScanBatchItemSerializer,
+    ScanBatchSerializer,
     ScanEventSerializer,
     SyncPayloadSerializer,
     TenantSerializer,
     WebhookEndpointSerializer,
     WorkflowDefinitionSerializer,
     WorkflowRunSerializer,
+    asset_tombstone_values_serializer,
+    asset_values_serializer,
+    scan_event_values_serializer,
+)
+from .services import (
+    WORKFLOW_EXECUTION_MODES,
+    bulk_upsert_scan_events,
+    classify_scan,
+    clear_asset_tombstone,
+    decode_barcode,
+    dry_run_workflow,
+    encode_sync_cursor,
+    execute_triggered_workflows,
+    fetch_sync_page,
+    alookup_assets_by_barcode,
+    get_tenant_setting,
+    ingest_scan_batch,
+    record_asset_tombstone,
+    run_scan_post_processing,
+    sync_visibility_horizon,
+    tombstone_retention_horizon,
+    validate_barcode,
+    validate_barcode_batch,
 )
-from .services import decode_barcode, dry_run_workflow, execute_triggered_workflows, validate_barcode
-from .tasks import dispatch_webhook, generate_barcode_batch
+from .tasks import (
+    dispatch_webhook,
+    enqueue_scan_post_processing,
+    generate_barcode_batch,
+    process_scan_event,
+    render_barcode_batch_pdf,
+)
+
+
+class AsyncAPIView(APIView):
+    """``APIView`` whose handlers are ``async def`` and run on the ASGI event loop.
+
+    DRF only dispatches synchronously, so this mirrors ``APIView.dispatch``
+    with awaits: permissions providing ``ahas_permission`` are awaited and the
+    rest, like authentication and throttling, run in a worker thread.
+    Rendering and exception handling stay synchronous. Under WSGI, Django
+    runs the view in a per-request event loop, so it keeps working there.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await self.ainitial(request, *args, **kwargs)
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+            response = handler(request, *args, **kwargs)
+            # ``options`` and ``http_method_not_allowed`` are inherited sync handlers.
+            if inspect.isawaitable(response):
+                response = await response
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    async def ainitial(self, request, *args, **kwargs):
+        self.format_kwarg = self.get_format_suffix(**kwargs)
+        request.accepted_renderer, request.accepted_media_type = self.perform_content_negotiation(request)
+        request.version, request.versioning_scheme = self.determine_version(request, *args, **kwargs)
+
+        # Authenticators are synchronous (simplejwt loads the user row), so they share one thread hop.
+        await sync_to_async(self.perform_authentication)(request)
+        await self.acheck_permissions(request)
+        if self.get_throttles():
+            await sync_to_async(self.check_throttles)(request)
+
+    async def acheck_permissions(self, request):
+        for permission in self.get_permissions():
+            if hasattr(permission, "ahas_permission"):
+                allowed = await permission.ahas_permission(request, self)
+            else:
+                allowed = await sync_to_async(permission.has_permission)(request, self)
+            if not allowed:
+                self.permission_denied(request, message=getattr(permission, "message", None), code=getattr(permission, "code", None))
+
+
+def streaming_response(request, chunks, **kwargs) -> StreamingHttpResponse:
+    """Return a ``StreamingHttpResponse`` over ``chunks`` that stays streamed under ASGI.
+
+    Django's ASGI handler drains a synchronous iterator into a list before
+    sending it, which would hold a whole label sheet or NDJSON report in
+    memory. Under ASGI the iterator is therefore pulled one chunk per thread
+    hop instead.
+    """
+    if isinstance(request._request, ASGIRequest):
+        chunks = _iterate_in_thread(chunks)
+    return StreamingHttpResponse(chunks, **kwargs)
+
+
+async def _iterate_in_thread(chunks):
+    # Thread-sensitive hops all land on the request's thread, so a server-side cursor keeps its connection.
+    chunks = iter(chunks)
+    try:
+        while (chunk := await sync_to_async(next)(chunks, None)) is not None:
+            yield chunk
+    finally:
+        if hasattr(chunks, "close"):
+            await sync_to_async(chunks.close)()
 
 
 class TenantScopedViewSet(viewsets.ModelViewSet):
     permission_classes = [TenantRBACPermission]
+    pagination_class = TenantCursorPagination
     filterset_fields = ["tenant"]
     search_fields = ["id"]
 
@@ -110,6 +234,10 @@ class AssetViewSet(TenantScopedViewSet):
             previous_state=previous_state,
             new_state=new_state,
         )
+        if asset_after.status == Asset.Status.RETIRED:
+            record_asset_tombstone(asset_after, AssetTombstone.Reason.RETIRED)
+        elif previous_status == Asset.Status.RETIRED:
+            clear_asset_tombstone(asset_after)
         if previous_status != asset_after.status:
             execute_triggered_workflows(
                 tenant_id=asset_after.tenant_id,
@@ -122,6 +250,11 @@ class AssetViewSet(TenantScopedViewSet):
                 },
             )
 
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        record_asset_tombstone(instance, AssetTombstone.Reason.DELETED)
+        instance.delete()
+
 
 class ScanEventViewSet(TenantScopedViewSet):
     queryset = ScanEvent.objects.select_related("asset", "scanner", "location").all()
@@ -130,44 +263,56 @@ class ScanEventViewSet(TenantScopedViewSet):
     filterset_fields = ["tenant", "status", "source_type", "asset"]
 
     def perform_create(self, serializer):
-        decoded = decode_barcode(serializer.validated_data["symbology"], serializer.validated_data["raw_value"])
-        errors = validate_barcode(serializer.validated_data["symbology"], serializer.validated_data["raw_value"])
-        status_value = ScanEvent.ScanStatus.REJECTED if errors else ScanEvent.ScanStatus.VALIDATED
+        tenant_id = self.request.headers.get("X-Tenant-ID")
+        deferred = bool(get_tenant_setting(tenant_id, "async_scan_processing", False))
         scan = serializer.save(
-            tenant_id=self.request.headers.get("X-Tenant-ID"),
+            tenant_id=tenant_id,
             scanner=self.request.user,
-            decoded_payload=decoded,
-            validation_errors=errors,
-            status=status_value,
             synced_at=timezone.now(),
+            pending_post_processing=deferred,
+            **classify_scan(serializer.validated_data["symbology"], serializer.validated_data["raw_value"]),
         )
-        if scan.asset_id:
-            AssetStateHistory.objects.create(
-                tenant=scan.tenant,
-                asset=scan.asset,
-                event_type=AssetStateHistory.EventType.SCAN,
-                actor=self.request.user,
-                location=scan.location,
-                gps_latitude=scan.gps_latitude,
-                gps_longitude=scan.gps_longitude,
-                previous_state={"status": scan.asset.status},
-                new_state={"status": scan.asset.status, "last_scan": str(scan.id)},
+        if deferred:
+            transaction.on_commit(lambda: process_scan_event.delay(scan.id))
+            return
+        run_scan_post_processing(scan, actor=self.request.user)
+
+    @action(detail=False, methods=["post"], url_path="batch")
+    def batch(self, request):
+        tenant_id = request.headers.get("X-Tenant-ID")
+        payload = ScanBatchSerializer(data=request.data)
+        payload.is_valid(raise_exception=True)
+        window = payload.validated_data.get("dedupe_window_seconds", settings.SCAN_BATCH_DEDUPE_WINDOW_SECONDS)
+
+        # Items are validated one by one so a single bad read does not reject the whole batch.
+        item_serializer = ScanBatchItemSerializer()
+        results = [None] * len(payload.validated_data["scan_events"])
+        reads, read_indexes = [], []
+        for index, item in enumerate(payload.validated_data["scan_events"]):
+            try:
+                reads.append(item_serializer.run_validation(item))
+                read_indexes.append(index)
+            except ValidationError as exc:
+                results[index] = {"index": index, "status": "invalid", "errors": exc.detail}
+
+        deferred = bool(get_tenant_setting(tenant_id, "async_scan_processing", False))
+        with transaction.atomic():
+            read_results, new_scan_ids = ingest_scan_batch(
+                tenant_id=tenant_id,
+                scanner=request.user,
+                reads=reads,
+                dedupe_window_seconds=window,
+                defer_post_processing=deferred,
             )
-        execute_triggered_workflows(
-            tenant_id=scan.tenant_id,
-            trigger_type=WorkflowDefinition.TriggerType.ON_SCAN,
-            actor=self.request.user,
-            asset=scan.asset,
-            scan_event=scan,
-            extra_context={
-                "scan_event": {
-                    "id": scan.id,
-                    "symbology": scan.symbology,
-                    "raw_value": scan.raw_value,
-                    "source_type": scan.source_type,
-                }
-            },
-        )
+            if deferred and new_scan_ids:
+                transaction.on_commit(lambda: enqueue_scan_post_processing(new_scan_ids))
+        for index, result in zip(read_indexes, read_results):
+            results[index] = {**result, "index": index}
+
+        counts = {"accepted": 0, "duplicate": 0, "invalid": 0}
+        for result in results:
+            counts[result["status"]] += 1
+        return Response({"results": results, "counts": counts}, status=status.HTTP_200_OK)
 
 
 class InventorySessionViewSet(TenantScopedViewSet):
@@ -187,6 +332,9 @@ class WorkflowDefinitionViewSet(TenantScopedViewSet):
         tenant_id = request.headers.get("X-Tenant-ID")
         dry_run = bool(request.data.get("dry_run", False))
         force_run = bool(request.data.get("force", False))
+        mode = request.data.get("mode")
+        if mode is not None and mode not in WORKFLOW_EXECUTION_MODES:
+            return Response({"detail": f"mode must be one of: {', '.join(WORKFLOW_EXECUTION_MODES)}"}, status=status.HTTP_400_BAD_REQUEST)
         asset = None
         scan_event = None
 
@@ -221,6 +369,7 @@ class WorkflowDefinitionViewSet(TenantScopedViewSet):
             extra_context=request.data.get("context", {}),
             workflow_definition_id=workflow.id,
             force_run=force_run,
+            mode=mode,
         )
         runs = WorkflowRun.objects.filter(id__in=run_ids).order_by("-id")
         return Response({"run_count": len(run_ids), "runs": WorkflowRunSerializer(runs, many=True).data}, status=status.HTTP_200_OK)
@@ -228,6 +377,7 @@ class WorkflowDefinitionViewSet(TenantScopedViewSet):
 
 class WorkflowRunViewSet(mixins.ListModelMixin, mixins.RetrieveModelMixin, viewsets.GenericViewSet):
     permission_classes = [TenantRBACPermission]
+    pagination_class = TenantCursorPagination
     queryset = WorkflowRun.objects.select_related("workflow", "asset", "scan_event").all().order_by("-started_at")
     serializer_class = WorkflowRunSerializer
     filterset_fields = ["tenant", "status", "workflow", "asset", "scan_event"]
@@ -255,6 +405,40 @@ class BarcodeBatchViewSet(TenantScopedViewSet):
         batch = serializer.save(tenant_id=self.request.headers.get("X-Tenant-ID"), generated_by=self.request.user)
         generate_barcode_batch.delay(batch.id)
 
+    @action(detail=True, methods=["get", "post"], url_path="pdf")
+    def pdf(self, request, pk=None):
+        batch = self.get_object()
+        if request.method == "POST":
+            render_barcode_batch_pdf.delay(batch.id)
+            return Response({"detail": "pdf rendering queued"}, status=status.HTTP_202_ACCEPTED)
+        response = streaming_response(request, iter_label_sheet_pdf(batch), content_type="application/pdf")
+        response["Content-Disposition"] = f'inline; filename="barcode-batch-{batch.id}.pdf"'
+        return response
+
+    @action(detail=True, methods=["get"], url_path="zpl")
+    def zpl(self, request, pk=None):
+        batch = self.get_object()
+        first, last, total = batch.start_sequence, batch.end_sequence, batch.labels_total
+        try:
+            selected = parse_label_range(request.headers.get("Range"), first, last)
+        except ValueError:
+            return Response(
+                {"detail": "requested label range is not satisfiable"},
+                status=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+                headers={"Content-Range": f"{LABEL_RANGE_UNIT} */{total}"},
+            )
+        response = streaming_response(
+            request,
+            iter_label_zpl(batch, first=selected and selected[0], last=selected and selected[1]),
+            content_type="application/zpl",
+            status=status.HTTP_206_PARTIAL_CONTENT if selected else status.HTTP_200_OK,
+        )
+        response["Accept-Ranges"] = LABEL_RANGE_UNIT
+        response["Content-Disposition"] = f'attachment; filename="barcode-batch-{batch.id}.zpl"'
+        if selected:
+            response["Content-Range"] = f"{LABEL_RANGE_UNIT} {selected[0]}-{selected[1]}/{total}"
+        return response
+
 
 class WebhookEndpointViewSet(TenantScopedViewSet):
     queryset = WebhookEndpoint.objects.all().order_by("name")
@@ -284,39 +468,58 @@ class IndustryPresetViewSet(TenantScopedViewSet):
 
 class SyncView(APIView):
     permission_classes = [TenantRBACPermission]
+    compress_payloads = True
+    track_payload_sizes = True
 
     def post(self, request):
-        serializer = SyncPayloadSerializer(data=request.data)
+        serializer = SyncPayloadSerializer(data=request.data, context={"request": request})
         serializer.is_valid(raise_exception=True)
         tenant_id = request.headers.get("X-Tenant-ID")
         now = timezone.now()
 
-        pushed = []
-        for scan in serializer.validated_data.get("scan_events", []):
-            scan_obj, _created = ScanEvent.objects.update_or_create(
-                tenant_id=tenant_id,
-                client_event_id=scan["client_event_id"],
-                defaults={
-                    **scan,
-                    "tenant_id": tenant_id,
-                    "scanner": request.user,
-                    "synced_at": now,
-                },
-            )
-            pushed.append(scan_obj.id)
+        pushed = bulk_upsert_scan_events(
+            tenant_id=tenant_id,
+            scanner=request.user,
+            scans=serializer.validated_data.get("scan_events", []),
+            synced_at=now,
+        )
 
-        last_sync_at = serializer.validated_data.get("last_sync_at")
         conflict_acks = serializer.validated_data.get("conflict_acknowledgements", [])
+        page_size = serializer.validated_data.get("page_size", settings.SYNC_PAGE_SIZE)
         changes_qs = Asset.objects.filter(tenant_id=tenant_id)
-        if last_sync_at:
-            changes_qs = changes_qs.filter(updated_at__gt=last_sync_at)
-        changes = AssetSerializer(changes_qs.order_by("updated_at")[:500], many=True).data
+        tombstones_qs = AssetTombstone.objects.filter(tenant_id=tenant_id)
+        assets_serializer = asset_values_serializer
+        if "asset_fields" in serializer.validated_data:
+            assets_serializer = asset_values_serializer.only(serializer.validated_data["asset_fields"])
+        positions, cursor_as_of = serializer.validated_data.get("cursor", (None, None))
+        synced_since = cursor_as_of
+        if positions is None:
+            # Seed both streams from the stated sync point, so even an empty page hands back a cursor past it.
+            synced_since = serializer.validated_data.get("last_sync_at")
+            start = (synced_since, 0) if synced_since else None
+            positions = {"assets": start, "tombstones": start}
+        visible_until = sync_visibility_horizon(now)
+        asset_rows, asset_position, assets_pending = fetch_sync_page(
+            assets_serializer.values_list(changes_qs, "updated_at", "id"), positions.get("assets"), page_size, until=visible_until
+        )
+        tombstone_rows, tombstone_position, tombstones_pending = fetch_sync_page(
+            asset_tombstone_values_serializer.values_list(tombstones_qs, "updated_at", "id"),
+            positions.get("tombstones"),
+            page_size,
+            until=visible_until,
+        )
+        changes = assets_serializer.to_representation(asset_rows)
+        next_cursor = encode_sync_cursor({"assets": asset_position, "tombstones": tombstone_position}, as_of=now)
 
         return Response(
             {
                 "server_time": now,
                 "accepted_scan_event_ids": pushed,
                 "asset_changes": changes,
+                "asset_tombstones": asset_tombstone_values_serializer.to_representation(tombstone_rows),
+                "next_cursor": next_cursor,
+                "has_more": assets_pending or tombstones_pending,
+                "full_resync_required": bool(synced_since and synced_since < tombstone_retention_horizon(now)),
                 "acknowledged_conflicts": conflict_acks,
                 "conflict_strategy": "last-write-wins-with-history",
             },
@@ -324,14 +527,14 @@ class SyncView(APIView):
         )
 
 
-class BarcodeValidationView(APIView):
+class BarcodeValidationView(AsyncAPIView):
     permission_classes = [TenantRBACPermission]
 
-    def post(self, request):
+    async def post(self, request):
         symbology = request.data.get("symbology", "")
         raw_value = request.data.get("raw_value", "")
         decoded = decode_barcode(symbology, raw_value)
-        errors = validate_barcode(symbology, raw_value)
+        errors = validate_barcode(symbology, raw_value, decoded=decoded)
         return Response(
             {
                 "valid": len(errors) == 0,
@@ -342,40 +545,109 @@ class BarcodeValidationView(APIView):
         )
 
 
-class LookupView(APIView):
+class BarcodeValidationBatchView(APIView):
     permission_classes = [TenantRBACPermission]
 
-    def get(self, request):
+    def post(self, request):
+        # One NDJSON result line per barcode, streamed a chunk at a time.
+        payload = BarcodeValidationBatchSerializer(data=request.data)
+        payload.is_valid(raise_exception=True)
+        chunks = validate_barcode_batch(payload.validated_data["barcodes"])
+        return streaming_response(
+            request,
+            ("".join(json.dumps(result) + "\n" for result in results).encode() for results in chunks),
+            content_type="application/x-ndjson",
+        )
+
+
+class LookupView(AsyncAPIView):
+    permission_classes = [TenantRBACPermission]
+
+    async def get(self, request):
         tenant_id = request.headers.get("X-Tenant-ID")
         barcode = request.query_params.get("barcode")
         if not barcode:
             return Response({"detail": "barcode query param is required"}, status=status.HTTP_400_BAD_REQUEST)
-        asset = Asset.objects.filter(tenant_id=tenant_id, barcode_value=barcode).first()
+        asset = (await alookup_assets_by_barcode(tenant_id, [barcode]))[barcode]
         if not asset:
             return Response({"detail": "not found"}, status=status.HTTP_404_NOT_FOUND)
-        return Response(AssetSerializer(asset).data, status=status.HTTP_200_OK)
+        return Response(asset, status=status.HTTP_200_OK)
 
 
-class LiveDataView(APIView):
+class BulkLookupView(AsyncAPIView):
     permission_classes = [TenantRBACPermission]
+    read_only = True
+
+    async def post(self, request):
+        barcodes = request.data.get("barcodes")
+        if not isinstance(barcodes, list) or not barcodes or not all(isinstance(barcode, str) and barcode for barcode in barcodes):
+            return Response({"detail": "barcodes must be a non-empty list of strings"}, status=status.HTTP_400_BAD_REQUEST)
+        if len(barcodes) > settings.ASSET_LOOKUP_BATCH_MAX:
+            return Response(
+                {"detail": f"at most {settings.ASSET_LOOKUP_BATCH_MAX} barcodes per lookup"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        results = await alookup_assets_by_barcode(request.headers.get("X-Tenant-ID"), barcodes)
+        return Response({"results": results, "found": sum(1 for asset in results.values() if asset)}, status=status.HTTP_200_OK)
+
+
+def live_data_snapshot(tenant_id) -> dict:
+    """Return the latest 100 assets and 100 scan events of ``tenant_id``."""
+    assets = asset_values_serializer.values_list(Asset.objects.filter(tenant_id=tenant_id).order_by("-updated_at"))[:100]
+    scan_events = scan_event_values_serializer.values_list(ScanEvent.objects.filter(tenant_id=tenant_id).order_by("-created_at"))[:100]
+    return {
+        "assets": asset_values_serializer.to_representation(assets),
+        "scan_events": scan_event_values_serializer.to_representation(scan_events),
+    }
+
+
+class LiveDataView(AsyncAPIView):
+    permission_classes = [TenantRBACPermission]
+
+    async def get(self, request):
+        # Both queries share one thread hop; the async ORM would take one per query.
+        snapshot = await sync_to_async(live_data_snapshot)(request.headers.get("X-Tenant-ID"))
+        return Response(snapshot, status=status.HTTP_200_OK)
+
+
+class LiveDataStreamView(APIView):
+    """Server-sent events replacing ``LiveDataView`` polling.
+
+    The stream opens with a ``snapshot`` event (the ``LiveDataView`` payload)
+    and then pushes ``asset.changed``, ``asset.deleted`` and
+    ``scan_event.changed`` events, each carrying a list of rows, as they commit.
+    """
+
+    permission_classes = [TenantRBACPermission]
+    renderer_classes = [EventStreamRenderer, ORJSONRenderer]
 
     def get(self, request):
+        if not isinstance(request._request, ASGIRequest):
+            # A WSGI worker would have to buffer the endless stream.
+            return Response(
+                {"detail": "The live-data stream is only served by the ASGI application (assetra_platform.asgi)."},
+                status=status.HTTP_501_NOT_IMPLEMENTED,
+            )
         tenant_id = request.headers.get("X-Tenant-ID")
-        asset_data = AssetSerializer(Asset.objects.filter(tenant_id=tenant_id).order_by("-updated_at")[:100], many=True).data
-        scan_data = ScanEventSerializer(ScanEvent.objects.filter(tenant_id=tenant_id).order_by("-created_at")[:100], many=True).data
-        return Response({"assets": asset_data, "scan_events": scan_data}, status=status.HTTP_200_OK)
+        response = StreamingHttpResponse(
+            stream_events(tenant_id, snapshot=partial(live_data_snapshot, tenant_id)), content_type=EventStreamRenderer.media_type
+        )
+        response["Cache-Control"] = "no-cache"
+        # Stop nginx from buffering the stream.
+        response["X-Accel-Buffering"] = "no"
+        return response
 
 
-class AuthContextView(APIView):
+class AuthContextView(AsyncAPIView):
     permission_classes = [TenantRBACPermission]
 
-    def get(self, request):
+    async def get(self, request):
         tenant_id = request.headers.get("X-Tenant-ID")
-        membership = TenantMembership.objects.filter(tenant_id=tenant_id, user=request.user).first()
-        if not membership:
+        role = await atenant_role_for_request(request)
+        if not role:
             return Response({"detail": "membership not found"}, status=status.HTTP_404_NOT_FOUND)
 
-        can_write = membership.role in {
+        can_write = role in {
             TenantMembership.Role.ADMIN,
             TenantMembership.Role.OPERATOR,
         }
@@ -384,7 +656,7 @@ class AuthContextView(APIView):
             {
                 "username": request.user.get_username(),
                 "tenant_id": str(tenant_id),
-                "role": membership.role,
+                "role": role,
                 "can_write": can_write,
             },
             status=status.HTTP_200_OK,
@@ -60,6 +60,7 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "assetra.middleware.PayloadCompressionMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -149,6 +150,16 @@ REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticated",
     ),
+    # orjson-backed JSON (stdlib json when orjson is not installed).
+    "DEFAULT_RENDERER_CLASSES": (
+        "assetra.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    "DEFAULT_PARSER_CLASSES": (
+        "assetra.renderers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ),
     "DEFAULT_FILTER_BACKENDS": (
         "django_filters.rest_framework.DjangoFilterBackend",
         "rest_framework.filters.SearchFilter",
@@ -156,6 +167,16 @@ REST_FRAMEWORK = {
     ),
 }
 
+# JSON responses of at least API_COMPRESSION_MIN_BYTES from views with compress_payloads (sync) are
+# gzip/zstd-encoded for clients that accept it; gzip/zstd request bodies may expand to at most
+# API_MAX_DECOMPRESSED_BYTES.
+API_COMPRESSION_MIN_BYTES = int(os.getenv("API_COMPRESSION_MIN_BYTES", "1024"))
+API_MAX_DECOMPRESSED_BYTES = int(os.getenv("API_MAX_DECOMPRESSED_BYTES", str(32 * 1024 * 1024)))
+
+# List endpoints are cursor-paginated; clients may ask for up to API_PAGE_SIZE_MAX rows per page.
+API_PAGE_SIZE = int(os.getenv("API_PAGE_SIZE", "100"))
+API_PAGE_SIZE_MAX = int(os.getenv("API_PAGE_SIZE_MAX", "1000"))
+
 SPECTACULAR_SETTINGS = {
     "TITLE": "Assetra API",
     "DESCRIPTION": "Multi-tenant barcode and asset management platform API",
@@ -170,6 +191,70 @@ SIMPLE_JWT = {
     "ROTATE_REFRESH_TOKENS": True,
 }
 
+# Scan events pushed through /api/v1/sync/ are upserted in chunks of this size.
+SYNC_INGEST_CHUNK_SIZE = int(os.getenv("SYNC_INGEST_CHUNK_SIZE", "500"))
+# Asset changes pulled through /api/v1/sync/ are paged by an opaque (updated_at, id) cursor.
+SYNC_PAGE_SIZE = int(os.getenv("SYNC_PAGE_SIZE", "500"))
+SYNC_PAGE_SIZE_MAX = int(os.getenv("SYNC_PAGE_SIZE_MAX", "1000"))
+# updated_at is stamped at save time, so rows younger than this are held back from sync pages
+# until any transaction that saved earlier has committed. Keep it above the longest asset write.
+SYNC_COMMIT_LAG_SECONDS = int(os.getenv("SYNC_COMMIT_LAG_SECONDS", "10"))
+# Tombstones for deleted/retired assets are compacted after this many days; clients
+# holding an older cursor are told to run a full resync.
+SYNC_TOMBSTONE_RETENTION_DAYS = int(os.getenv("SYNC_TOMBSTONE_RETENTION_DAYS", "30"))
+
+# Fixed RFID portals post reads through /api/v1/scan-events/batch/; repeated reads of the
+# same tag at the same location inside the window are reported as duplicates.
+SCAN_BATCH_MAX_EVENTS = int(os.getenv("SCAN_BATCH_MAX_EVENTS", "5000"))
+SCAN_BATCH_DEDUPE_WINDOW_SECONDS = int(os.getenv("SCAN_BATCH_DEDUPE_WINDOW_SECONDS", "5"))
+
+# /api/v1/barcodes/validate/batch/ accepts at most this many barcodes per request.
+BARCODE_VALIDATION_BATCH_MAX = int(os.getenv("BARCODE_VALIDATION_BATCH_MAX", "100000"))
+
+# Barcode batches insert labels in chunks of this size and record progress after each chunk.
+BARCODE_LABEL_CHUNK_SIZE = int(os.getenv("BARCODE_LABEL_CHUNK_SIZE", "2000"))
+# Larger batches are split into shards of this many labels and generated in parallel.
+BARCODE_SHARD_SIZE = int(os.getenv("BARCODE_SHARD_SIZE", "50000"))
+# PDF label sheets rendered by the render_barcode_batch_pdf task; page size is "a4" or "letter".
+LABEL_PDF_ROOT = Path(os.getenv("LABEL_PDF_ROOT", str(BASE_DIR / "media" / "labels")))
+LABEL_SHEET_PAGE_SIZE = os.getenv("LABEL_SHEET_PAGE_SIZE", "a4").lower()
+
+# ON_TIME workflows are fired by the run-scheduled-workflows beat task every tick; matching
+# assets are read in chunks and each tenant has at most this many workflow runs in flight.
+WORKFLOW_SCHEDULER_TICK_SECONDS = int(os.getenv("WORKFLOW_SCHEDULER_TICK_SECONDS", "60"))
+WORKFLOW_SCHEDULER_CHUNK_SIZE = int(os.getenv("WORKFLOW_SCHEDULER_CHUNK_SIZE", "500"))
+WORKFLOW_SCHEDULER_MAX_RUNS_PER_TENANT = int(os.getenv("WORKFLOW_SCHEDULER_MAX_RUNS_PER_TENANT", "1000"))
+
+# Shared cache. Workflow plan version stamps live here, so production deployments with
+# several gunicorn/celery workers must point CACHE_URL at Redis.
+CACHE_URL = os.getenv("CACHE_URL", "")
+if CACHE_URL:
+    CACHES = {"default": {"BACKEND": "django.core.cache.backends.redis.RedisCache", "LOCATION": CACHE_URL}}
+else:
+    CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+# Compiled workflow plans are rechecked against the database after this long even when the
+# version stamp is unchanged, which bounds staleness when the cache above is per-process.
+WORKFLOW_PLAN_MAX_AGE_SECONDS = int(os.getenv("WORKFLOW_PLAN_MAX_AGE_SECONDS", "30"))
+
+# Tenant roles resolved by TenantRBACPermission are cached this long; membership saves and
+# deletes evict them.
+TENANT_ROLE_CACHE_SECONDS = int(os.getenv("TENANT_ROLE_CACHE_SECONDS", "60"))
+
+# Barcode lookups (/api/v1/lookups/assets/) cache serialized assets for this long; saves and
+# deletes evict them. A bulk lookup resolves at most ASSET_LOOKUP_BATCH_MAX barcodes.
+ASSET_LOOKUP_CACHE_SECONDS = int(os.getenv("ASSET_LOOKUP_CACHE_SECONDS", "300"))
+ASSET_LOOKUP_BATCH_MAX = int(os.getenv("ASSET_LOOKUP_BATCH_MAX", "500"))
+
+# Live-data stream fan-out (/api/v1/live-data/stream/). Without REALTIME_REDIS_URL events only reach
+# streams served by the process that made the change, so multi-worker deployments must set it.
+# A stream whose queue fills up is closed and the client reconnects for a fresh snapshot.
+REALTIME_REDIS_URL = os.getenv("REALTIME_REDIS_URL", "")
+REALTIME_BACKEND = os.getenv(
+    "REALTIME_BACKEND", "assetra.realtime.RedisBackend" if REALTIME_REDIS_URL else "assetra.realtime.InMemoryBackend"
+)
+REALTIME_SUBSCRIBER_QUEUE_SIZE = int(os.getenv("REALTIME_SUBSCRIBER_QUEUE_SIZE", "1000"))
+REALTIME_HEARTBEAT_SECONDS = int(os.getenv("REALTIME_HEARTBEAT_SECONDS", "15"))
+
 CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", "redis://127.0.0.1:6379/0")
 CELERY_RESULT_BACKEND = os.getenv("CELERY_RESULT_BACKEND", "redis://127.0.0.1:6379/1")
 CELERY_TASK_ALWAYS_EAGER = os.getenv("CELERY_TASK_ALWAYS_EAGER", "0") == "1"
@@ -178,6 +263,17 @@ if CELERY_TASK_ALWAYS_EAGER:
     CELERY_BROKER_URL = "memory://"
     CELERY_RESULT_BACKEND = "cache+memory://"
 
+CELERY_BEAT_SCHEDULE = {
+    "compact-asset-tombstones": {
+        "task": "assetra.tasks.compact_asset_tombstones",
+        "schedule": timedelta(hours=6),
+    },
+    "run-scheduled-workflows": {
+        "task": "assetra.tasks.run_scheduled_workflows",
+        "schedule": timedelta(seconds=WORKFLOW_SCHEDULER_TICK_SECONDS),
+    },
+}
+
 CORS_ALLOWED_ORIGINS = [
     origin.strip()
     for origin in os.getenv(
@@ -8,13 +8,16 @@ from assetra.views import (
     AuthContextView,
     AssetCategoryViewSet,
     AssetViewSet,
+    BarcodeValidationBatchView,
     BarcodeValidationView,
     BarcodeBatchViewSet,
+    BulkLookupView,
     DeviceProfileViewSet,
     HealthCheckView,
     IndustryPresetViewSet,
     IntegrationConnectorViewSet,
     InventorySessionViewSet,
+    LiveDataStreamView,
     LiveDataView,
     LivenessProbeView,
     LookupView,
@@ -56,8 +59,11 @@ urlpatterns = [
     path("api/v1/auth/context/", AuthContextView.as_view(), name="auth_context"),
     path("api/v1/sync/", SyncView.as_view(), name="sync"),
     path("api/v1/barcodes/validate/", BarcodeValidationView.as_view(), name="barcode-validate"),
+    path("api/v1/barcodes/validate/batch/", BarcodeValidationBatchView.as_view(), name="barcode-validate-batch"),
     path("api/v1/lookups/assets/", LookupView.as_view(), name="asset-lookup"),
+    path("api/v1/lookups/assets/bulk/", BulkLookupView.as_view(), name="asset-lookup-bulk"),
     path("api/v1/live-data/", LiveDataView.as_view(), name="live-data"),
+    path("api/v1/live-data/stream/", LiveDataStreamView.as_view(), name="live-data-stream"),
     path("api/v1/webhooks/inbound/", WebhookInboundView.as_view(), name="webhook-inbound"),
     # Observability & monitoring
     path("health/", HealthCheckView.as_view(), name="health-check"),
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Measure barcode lookup latency without the index, with it, cached, and in bulk.
+
+Each size grows one tenant's asset table; lookups hit random existing barcodes.
+The unindexed baseline drops ``assetra_asset_barcode_idx`` for its samples.
+Single lookups are timed end to end (query plus serialization), as
+``LookupView`` serves them. Set ``CACHE_URL`` to a Redis instance for cached
+numbers that match production; the default LocMem cache holds 300 entries.
+
+    DB_ENGINE=sqlite python scripts/bench_asset_lookup.py --sizes 10000 100000 1000000
+"""
+
+import argparse
+import random
+import time
+
+from bench_common import bench_database, make_tenant, report
+
+
+def _latencies_ms(func, values) -> list[float]:
+    latencies = []
+    for value in values:
+        started = time.perf_counter()
+        func(value)
+        latencies.append((time.perf_counter() - started) * 1000)
+    return sorted(latencies)
+
+
+def _percentiles(prefix: str, latencies: list[float]) -> dict:
+    return {
+        f"{prefix}_p50_ms": round(latencies[len(latencies) // 2], 3),
+        f"{prefix}_p99_ms": round(latencies[min(int(len(latencies) * 0.99), len(latencies) - 1)], 3),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--samples", type=int, default=250)
+    parser.add_argument("--unindexed-samples", type=int, default=50)
+    parser.add_argument("--bulk", type=int, default=250)
+    args = parser.parse_args()
+
+    with bench_database():
+        from django.core.cache import cache
+        from django.db import connection
+
+        from assetra.models import Asset
+        from assetra.serializers import AssetSerializer
+        from assetra.services import lookup_assets_by_barcode
+
+        tenant, user = make_tenant()
+        index = next(index for index in Asset._meta.indexes if index.name == "assetra_asset_barcode_idx")
+        rng = random.Random(17)
+        created = 0
+        rows = []
+        for size in args.sizes:
+            while created < size:
+                count = min(size - created, 10000)
+                Asset.objects.bulk_create(
+                    [
+                        Asset(tenant=tenant, asset_tag=f"B-{created + offset}", name="Bench", barcode_value=f"BC-{created + offset:08d}")
+                        for offset in range(count)
+                    ]
+                )
+                created += count
+            barcodes = [f"BC-{rng.randrange(size):08d}" for _ in range(args.samples)]
+
+            def query(barcode):
+                return AssetSerializer(Asset.objects.filter(tenant_id=tenant.id, barcode_value=barcode).first()).data
+
+            row = {"assets": size}
+            with connection.schema_editor() as editor:
+                editor.remove_index(Asset, index)
+            row.update(_percentiles("unindexed", _latencies_ms(query, barcodes[: args.unindexed_samples])))
+            with connection.schema_editor() as editor:
+                editor.add_index(Asset, index)
+            row.update(_percentiles("indexed", _latencies_ms(query, barcodes)))
+
+            cache.clear()
+            lookup_assets_by_barcode(tenant.id, barcodes)
+            row.update(_percentiles("cached", _latencies_ms(lambda barcode: lookup_assets_by_barcode(tenant.id, [barcode]), barcodes)))
+
+            bulk = barcodes[: args.bulk]
+            cache.clear()
+            started = time.perf_counter()
+            lookup_assets_by_barcode(tenant.id, bulk)
+            row[f"bulk_{len(bulk)}_cold_ms"] = round((time.perf_counter() - started) * 1000, 2)
+            started = time.perf_counter()
+            for barcode in bulk:
+                query(barcode)
+            row[f"indexed_{len(bulk)}_sequential_ms"] = round((time.perf_counter() - started) * 1000, 2)
+            rows.append(row)
+        report("asset_lookup", rows)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
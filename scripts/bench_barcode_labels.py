@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""Compare per-row and chunked bulk generation of barcode batch labels.
+
+The per-row baseline is only run up to ``--legacy-max`` labels; beyond that it
+takes minutes and the chunked path is reported alone.
+
+    DB_ENGINE=sqlite python scripts/bench_barcode_labels.py --sizes 10000 1000000
+"""
+
+import argparse
+
+from bench_common import bench_database, make_tenant, report, timed
+
+
+def _legacy_generate(batch):
+    from assetra.models import BarcodeLabel
+
+    for value in range(batch.start_sequence, batch.end_sequence + 1):
+        BarcodeLabel.objects.create(
+            tenant=batch.tenant,
+            batch=batch,
+            code_value=f"{batch.prefix}{value}",
+            render_payload={"sequence": value},
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 1000000])
+    parser.add_argument("--legacy-max", type=int, default=10000)
+    args = parser.parse_args()
+
+    with bench_database():
+        from assetra.models import BarcodeBatch
+        from assetra.tasks import generate_barcode_batch
+
+        tenant, user = make_tenant()
+        rows = []
+        for size in args.sizes:
+            row = {"labels": size}
+            if size <= args.legacy_max:
+                legacy_batch = BarcodeBatch.objects.create(tenant=tenant, prefix="L-", start_sequence=1, end_sequence=size)
+                legacy_s = timed(lambda: _legacy_generate(legacy_batch))
+                row["legacy_s"] = round(legacy_s, 3)
+                row["legacy_labels_per_s"] = round(size / legacy_s)
+
+            batch = BarcodeBatch.objects.create(tenant=tenant, prefix="B-", start_sequence=1, end_sequence=size)
+            bulk_s = timed(lambda: generate_barcode_batch(batch.id))
+            row["bulk_s"] = round(bulk_s, 3)
+            row["bulk_labels_per_s"] = round(size / bulk_s)
+            if "legacy_s" in row:
+                row["speedup"] = round(row["legacy_s"] / bulk_s, 1)
+            rows.append(row)
+        report("barcode_labels", rows)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,67 @@
+"""Shared harness for the ``scripts/bench_*.py`` benchmarks.
+
+Importing this module configures Django. ``bench_database()`` creates a
+throwaway test database from the configured ``DATABASES`` settings, so a
+benchmark never touches development data:
+
+    DB_ENGINE=sqlite python scripts/bench_sync_ingest.py
+"""
+
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "assetra_platform.settings")
+os.environ.setdefault("CELERY_TASK_ALWAYS_EAGER", "1")
+
+import django  # noqa: E402
+
+django.setup()
+
+import logging  # noqa: E402
+
+logging.disable(logging.INFO)
+
+
+@contextmanager
+def bench_database():
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    setup_test_environment()
+    old_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+def make_tenant(slug: str = "bench"):
+    from django.contrib.auth import get_user_model
+
+    from assetra.models import Tenant, TenantMembership
+
+    tenant = Tenant.objects.create(name=f"Bench {slug}", slug=slug)
+    user = get_user_model().objects.create_user(username=f"{slug}-operator", password="bench-pass-123")
+    TenantMembership.objects.create(tenant=tenant, user=user, role=TenantMembership.Role.OPERATOR)
+    return tenant, user
+
+
+def timed(func, *, repeat: int = 1) -> float:
+    """Return the best wall-clock time in seconds over ``repeat`` calls."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def report(name: str, rows: list[dict]) -> None:
+    print(json.dumps({"benchmark": name, "results": rows}, indent=2))
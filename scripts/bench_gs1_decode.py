@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""Measure GS1 element strings decoded per second across bracketed and FNC1 forms.
+
+    python scripts/bench_gs1_decode.py --strings 50000
+"""
+
+import argparse
+import random
+
+from bench_common import report, timed
+
+
+def _gtin(rng: random.Random) -> str:
+    from assetra.gs1 import gs1_check_digit
+
+    body = "".join(rng.choice("0123456789") for _ in range(13))
+    return body + str(gs1_check_digit(body))
+
+
+def _corpus(size: int, seed: int) -> list[dict]:
+    rng = random.Random(seed)
+    corpus = []
+    for index in range(size):
+        elements = [("01", _gtin(rng)), ("17", f"{rng.randint(24, 35):02d}{rng.randint(1, 12):02d}{rng.randint(0, 28):02d}")]
+        if rng.random() < 0.5:
+            elements.append(("3103", f"{rng.randint(0, 999999):06d}"))
+        elements.append(("10", f"LOT{rng.randint(0, 10**6)}"))
+        elements.append(("21", f"SN{index:08d}"))
+        corpus.append(elements)
+    return corpus
+
+
+def _bracketed(elements) -> str:
+    return "".join(f"({ai}){value}" for ai, value in elements)
+
+
+def _fnc1(elements) -> str:
+    # Variable-length elements are GS-terminated unless they end the string.
+    parts = []
+    for ai, value in elements:
+        parts.append(ai + value + ("\x1d" if ai in {"10", "21"} else ""))
+    return "]C1" + "".join(parts).rstrip("\x1d")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--strings", type=int, default=50000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    from assetra.gs1 import parse_gs1
+
+    corpus = _corpus(args.strings, args.seed)
+    rows = []
+    for form, encode in (("bracketed", _bracketed), ("fnc1", _fnc1)):
+        strings = [encode(elements) for elements in corpus]
+        assert all(parse_gs1(value)["ai"] == dict(elements) for value, elements in zip(strings[:100], corpus))
+        seconds = timed(lambda: [parse_gs1(value) for value in strings], repeat=3)
+        rows.append(
+            {
+                "form": form,
+                "strings": len(strings),
+                "avg_chars": round(sum(map(len, strings)) / len(strings), 1),
+                "strings_per_s": round(len(strings) / seconds),
+                "us_per_string": round(seconds / len(strings) * 1e6, 2),
+            }
+        )
+    report("gs1_decode", rows)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""Measure JSON render and parse time of sync pages: DRF's stdlib JSON vs the orjson renderer/parser.
+
+    DB_ENGINE=sqlite python scripts/bench_json_render.py --page-sizes 100 500 1000
+"""
+
+import argparse
+import io
+import uuid
+from decimal import Decimal
+
+from bench_common import bench_database, make_tenant, report, timed
+
+
+def _seed(tenant, user, assets: int) -> None:
+    from assetra.models import Asset, Location
+
+    location = Location.objects.create(tenant=tenant, name="Bench Site", code="BENCH")
+    Asset.objects.bulk_create(
+        Asset(
+            tenant=tenant,
+            asset_tag=f"J-{index:07d}",
+            name=f"Render asset {index}",
+            description="Forklift battery, bay 4 — checked weekly",
+            barcode_value=f"JSON-{index:07d}",
+            current_location=location,
+            assigned_to=user if index % 3 == 0 else None,
+            custom_fields={"row": index, "tags": ["bench", str(index % 10)], "rating": 4.5},
+        )
+        for index in range(assets)
+    )
+
+
+def _sync_page(tenant, page_size: int) -> dict:
+    """Build the response body ``SyncView`` returns for one page."""
+    from django.utils import timezone
+
+    from assetra.models import Asset
+    from assetra.serializers import asset_values_serializer
+    from assetra.services import fetch_sync_page
+
+    queryset = asset_values_serializer.values_list(Asset.objects.filter(tenant=tenant), "updated_at", "id")
+    rows = fetch_sync_page(queryset, None, page_size)[0]
+    return {
+        "server_time": timezone.now(),
+        "accepted_scan_event_ids": [],
+        "asset_changes": asset_values_serializer.to_representation(rows),
+        "asset_tombstones": [],
+        "next_cursor": "bench",
+        "has_more": True,
+        "full_resync_required": False,
+        "acknowledged_conflicts": [],
+        "conflict_strategy": "last-write-wins-with-history",
+    }
+
+
+def _scan_push(size: int) -> dict:
+    """Build a ``SyncView`` request body pushing ``size`` offline scan events."""
+    return {
+        "scan_events": [
+            {
+                "client_event_id": uuid.uuid4(),
+                "symbology": "qr",
+                "raw_value": f"JSON-{index:07d}",
+                "source_type": "rfid",
+                "gps_latitude": Decimal("51.500000"),
+                "gps_longitude": Decimal("-0.120000"),
+            }
+            for index in range(size)
+        ]
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--page-sizes", type=int, nargs="+", default=[100, 500, 1000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with bench_database():
+        from rest_framework.parsers import JSONParser
+        from rest_framework.renderers import JSONRenderer
+
+        from assetra.renderers import ORJSONParser, ORJSONRenderer, orjson
+
+        if orjson is None:
+            raise SystemExit("orjson is not installed; ORJSONRenderer would just fall back to the stdlib renderer")
+        tenant, user = make_tenant()
+        _seed(tenant, user, max(args.page_sizes))
+        rows = []
+        for page_size in args.page_sizes:
+            page = _sync_page(tenant, page_size)
+            body = JSONRenderer().render(_scan_push(page_size))
+            rendered = JSONRenderer().render(page)
+            assert ORJSONRenderer().render(page) == rendered
+            assert ORJSONParser().parse(io.BytesIO(body)) == JSONParser().parse(io.BytesIO(body))
+
+            stdlib_render = timed(lambda: JSONRenderer().render(page), repeat=args.repeat)
+            orjson_render = timed(lambda: ORJSONRenderer().render(page), repeat=args.repeat)
+            stdlib_parse = timed(lambda: JSONParser().parse(io.BytesIO(body)), repeat=args.repeat)
+            orjson_parse = timed(lambda: ORJSONParser().parse(io.BytesIO(body)), repeat=args.repeat)
+            rows.append(
+                {
+                    "page_size": page_size,
+                    "response_kb": round(len(rendered) / 1024, 1),
+                    "stdlib_render_ms": round(stdlib_render * 1000, 3),
+                    "orjson_render_ms": round(orjson_render * 1000, 3),
+                    "render_speedup": round(stdlib_render / orjson_render, 1),
+                    "push_kb": round(len(body) / 1024, 1),
+                    "stdlib_parse_ms": round(stdlib_parse * 1000, 3),
+                    "orjson_parse_ms": round(orjson_parse * 1000, 3),
+                    "parse_speedup": round(stdlib_parse / orjson_parse, 1),
+                }
+            )
+        report("json_render", rows)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""Compare dashboards polling /api/v1/live-data/ with the in-memory SSE fan-out per asset change.
+
+    DB_ENGINE=sqlite python scripts/bench_live_stream.py --subscribers 10 100 1000
+"""
+
+import argparse
+import asyncio
+import time
+
+from bench_common import bench_database, make_tenant, report, timed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--subscribers", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--events", type=int, default=200)
+    args = parser.parse_args()
+
+    with bench_database():
+        from assetra.models import Asset, ScanEvent
+        from assetra.realtime import InMemoryBackend
+        from assetra.renderers import EventStreamRenderer, ORJSONRenderer
+        from assetra.serializers import AssetSerializer
+        from assetra.views import live_data_snapshot
+
+        tenant, _user = make_tenant()
+        Asset.objects.bulk_create(Asset(tenant=tenant, asset_tag=f"L-{index:05d}", name=f"Live {index}") for index in range(100))
+        ScanEvent.objects.bulk_create(ScanEvent(tenant=tenant, symbology="qr", raw_value=f"L-{index:05d}") for index in range(100))
+        asset = Asset.objects.filter(tenant=tenant).first()
+        poll_seconds = timed(lambda: ORJSONRenderer().render(live_data_snapshot(tenant.id)), repeat=10)
+
+        async def fan_out(subscriber_count: int) -> float:
+            backend = InMemoryBackend()
+            subscriptions = [await backend.subscribe(str(tenant.id)) for _ in range(subscriber_count)]
+            started = time.perf_counter()
+            for _ in range(args.events):
+                backend.publish(str(tenant.id), EventStreamRenderer.frame("asset.changed", [AssetSerializer(asset).data]))
+            for subscription in subscriptions:
+                for _ in range(args.events):
+                    await subscription.queue.get()
+            elapsed = time.perf_counter() - started
+            for subscription in subscriptions:
+                subscription.close()
+            return elapsed
+
+        rows = []
+        for subscriber_count in args.subscribers:
+            seconds = asyncio.run(fan_out(subscriber_count))
+            rows.append(
+                {
+                    "subscribers": subscriber_count,
+                    "poll_round_ms": round(poll_seconds * subscriber_count * 1000, 2),
+                    "stream_ms_per_change": round(seconds / args.events * 1000, 3),
+                    "deliveries_per_s": round(subscriber_count * args.events / seconds),
+                }
+            )
+        report("live_stream", rows)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
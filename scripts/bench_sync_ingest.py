@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""Compare per-row and set-based ingest of scan events pushed through sync.
+
+    DB_ENGINE=sqlite python scripts/bench_sync_ingest.py --sizes 100 1000 10000
+"""
+
+import argparse
+import uuid
+
+from bench_common import bench_database, make_tenant, report, timed
+
+
+def _legacy_ingest(tenant, user, scans, now):
+    from assetra.models import ScanEvent
+
+    pushed = []
+    for scan in scans:
+        scan_obj, _created = ScanEvent.objects.update_or_create(
+            tenant_id=tenant.id,
+            client_event_id=scan["client_event_id"],
+            defaults={**scan, "tenant_id": tenant.id, "scanner": user, "synced_at": now},
+        )
+        pushed.append(scan_obj.id)
+    return pushed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    args = parser.parse_args()
+
+    with bench_database():
+        from django.utils import timezone
+
+        from assetra.models import ScanEvent
+        from assetra.services import bulk_upsert_scan_events
+
+        tenant, user = make_tenant()
+        rows = []
+        for size in args.sizes:
+            scans = [
+                {
+                    "client_event_id": uuid.uuid4(),
+                    "symbology": "qr",
+                    "raw_value": f"QR-{index}",
+                    "source_type": "rfid",
+                }
+                for index in range(size)
+            ]
+            now = timezone.now()
+
+            ScanEvent.objects.all().delete()
+            legacy_insert = timed(lambda: _legacy_ingest(tenant, user, scans, now))
+            legacy_replay = timed(lambda: _legacy_ingest(tenant, user, scans, now))
+
+            ScanEvent.objects.all().delete()
+            bulk_insert = timed(lambda: bulk_upsert_scan_events(tenant_id=tenant.id, scanner=user, scans=scans, synced_at=now))
+            bulk_replay = timed(lambda: bulk_upsert_scan_events(tenant_id=tenant.id, scanner=user, scans=scans, synced_at=now))
+
+            rows.append(
+                {
+                    "events": size,
+                    "legacy_insert_s": round(legacy_insert, 4),
+                    "bulk_insert_s": round(bulk_insert, 4),
+                    "insert_speedup": round(legacy_insert / bulk_insert, 1),
+                    "legacy_replay_s": round(legacy_replay, 4),
+                    "bulk_replay_s": round(bulk_replay, 4),
+                    "replay_speedup": round(legacy_replay / bulk_replay, 1),
+                }
+            )
+        report("sync_ingest", rows)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""Measure sync page bytes on the wire: full vs projected asset fields, identity vs gzip/zstd.
+
+    DB_ENGINE=sqlite python scripts/bench_sync_payload.py --page-size 500
+"""
+
+import argparse
+
+from bench_common import bench_database, make_tenant, report, timed
+
+PROJECTED_FIELDS = ("asset_tag", "name", "status", "barcode_value", "current_location", "updated_at")
+
+
+def _seed(tenant, user, assets: int) -> None:
+    from assetra.models import Asset, Location
+
+    location = Location.objects.create(tenant=tenant, name="Bench Site", code="BENCH")
+    Asset.objects.bulk_create(
+        Asset(
+            tenant=tenant,
+            asset_tag=f"W-{index:07d}",
+            name=f"Pallet jack {index}",
+            description="Manual pallet jack, 2500 kg, inspected quarterly",
+            barcode_value=f"WIRE-{index:07d}",
+            current_location=location,
+            assigned_to=user if index % 3 == 0 else None,
+            custom_fields={"zone": f"Z{index % 12}", "inspected": index % 2 == 0},
+        )
+        for index in range(assets)
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--page-size", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    with bench_database():
+        from assetra.compression import available_encodings, compress
+        from assetra.models import Asset
+        from assetra.renderers import ORJSONRenderer
+        from assetra.serializers import asset_values_serializer
+        from assetra.services import fetch_sync_page
+
+        tenant, user = make_tenant()
+        _seed(tenant, user, args.page_size)
+        queryset = Asset.objects.filter(tenant=tenant)
+        rows = []
+        for projection, serializer in (
+            ("all_fields", asset_values_serializer),
+            ("projected", asset_values_serializer.only({"id", *PROJECTED_FIELDS})),
+        ):
+            page = fetch_sync_page(serializer.values_list(queryset, "updated_at", "id"), None, args.page_size)[0]
+            body = ORJSONRenderer().render({"asset_changes": serializer.to_representation(page)})
+            for encoding in ("identity", *available_encodings()):
+                encoded = body if encoding == "identity" else compress(body, encoding)
+                seconds = 0.0 if encoding == "identity" else timed(lambda: compress(body, encoding), repeat=args.repeat)
+                rows.append(
+                    {
+                        "fields": projection,
+                        "encoding": encoding,
+                        "rows": len(page),
+                        "kb": round(len(encoded) / 1024, 1),
+                        "bytes_per_row": round(len(encoded) / len(page)),
+                        "ratio": round(len(body) / len(encoded), 1),
+                        "compress_ms": round(seconds * 1000, 2),
+                    }
+                )
+        report("sync_payload", rows)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""Measure rows per second of 500-row sync pages: DRF model serializers vs values_list fast path.
+
+    DB_ENGINE=sqlite python scripts/bench_sync_serializers.py --assets 5000
+"""
+
+import argparse
+from decimal import Decimal
+
+from bench_common import bench_database, make_tenant, report, timed
+
+
+def _seed(tenant, user, assets: int) -> None:
+    from django.utils import timezone
+
+    from assetra.models import Asset, AssetTombstone, Location, ScanEvent
+
+    location = Location.objects.create(tenant=tenant, name="Bench Site", code="BENCH")
+    Asset.objects.bulk_create(
+        Asset(
+            tenant=tenant,
+            asset_tag=f"S-{index:07d}",
+            name=f"Sync asset {index}",
+            barcode_value=f"SYNC-{index:07d}",
+            current_location=location,
+            assigned_to=user if index % 3 == 0 else None,
+            custom_fields={"row": index, "tags": ["bench", str(index % 10)]},
+        )
+        for index in range(assets)
+    )
+    now = timezone.now()
+    ScanEvent.objects.bulk_create(
+        ScanEvent(
+            tenant=tenant,
+            symbology="qr",
+            raw_value=f"SYNC-{index:07d}",
+            location=location,
+            gps_latitude=Decimal("51.500000"),
+            gps_longitude=Decimal("-0.120000"),
+            offline_captured_at=now,
+        )
+        for index in range(assets)
+    )
+    AssetTombstone.objects.bulk_create(
+        AssetTombstone(tenant=tenant, asset_id=assets + index, asset_tag=f"T-{index:07d}", reason="deleted") for index in range(assets)
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--assets", type=int, default=5000)
+    parser.add_argument("--page-size", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with bench_database():
+        from rest_framework.renderers import JSONRenderer
+
+        from assetra.models import Asset, AssetTombstone, ScanEvent
+        from assetra.serializers import (
+            AssetSerializer,
+            AssetTombstoneSerializer,
+            ScanEventSerializer,
+            asset_tombstone_values_serializer,
+            asset_values_serializer,
+            scan_event_values_serializer,
+        )
+        from assetra.services import fetch_sync_page
+
+        tenant, user = make_tenant()
+        _seed(tenant, user, args.assets)
+        renderer = JSONRenderer()
+        rows = []
+        for model, serializer_class, values_serializer in (
+            (Asset, AssetSerializer, asset_values_serializer),
+            (ScanEvent, ScanEventSerializer, scan_event_values_serializer),
+            (AssetTombstone, AssetTombstoneSerializer, asset_tombstone_values_serializer),
+        ):
+            queryset = model.objects.filter(tenant=tenant)
+            if not hasattr(model, "updated_at"):
+                queryset = queryset.order_by("id")
+
+            def _page(source):
+                if hasattr(model, "updated_at"):
+                    return fetch_sync_page(source, None, args.page_size)[0]
+                return list(source[: args.page_size])
+
+            def model_path():
+                return renderer.render(serializer_class(_page(queryset), many=True).data)
+
+            def values_path():
+                return renderer.render(values_serializer.to_representation(_page(values_serializer.values_list(queryset, "id"))))
+
+            assert model_path() == values_path()
+            model_seconds = timed(model_path, repeat=args.repeat)
+            values_seconds = timed(values_path, repeat=args.repeat)
+            rows.append(
+                {
+                    "serializer": serializer_class.__name__,
+                    "page_size": args.page_size,
+                    "model_serializer_rows_per_s": round(args.page_size / model_seconds),
+                    "values_rows_per_s": round(args.page_size / values_seconds),
+                    "model_serializer_page_ms": round(model_seconds * 1000, 2),
+                    "values_page_ms": round(values_seconds * 1000, 2),
+                    "speedup": round(model_seconds / values_seconds, 1),
+                }
+            )
+        report("sync_serializers", rows)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""Measure ON_SCAN post-processing throughput against 0, 5 and 50 active workflows.
+
+``uncached`` invalidates the tenant's workflow plans before every scan, which
+reproduces the old reload-and-reinterpret cost; ``compiled`` reuses the plan.
+
+    DB_ENGINE=sqlite python scripts/bench_workflows.py --scans 500
+"""
+
+import argparse
+
+from bench_common import bench_database, make_tenant, report, timed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workflows", type=int, nargs="+", default=[0, 5, 50])
+    parser.add_argument("--scans", type=int, default=500)
+    args = parser.parse_args()
+
+    with bench_database():
+        from assetra.models import Asset, ScanEvent, WorkflowDefinition
+        from assetra.services import invalidate_workflow_plans, run_scan_post_processing
+
+        rows = []
+        for count in args.workflows:
+            tenant, user = make_tenant(f"bench-wf-{count}")
+            asset = Asset.objects.create(tenant=tenant, asset_tag=f"BENCH-{count}", name="Bench", barcode_value=f"QR-BENCH-{count}")
+            WorkflowDefinition.objects.bulk_create(
+                WorkflowDefinition(
+                    tenant=tenant,
+                    name=f"Workflow {index:03d}",
+                    trigger_type=WorkflowDefinition.TriggerType.ON_SCAN,
+                    # Conditions never match, so the numbers isolate dispatch and matching cost.
+                    entry_conditions={"scan_event.source_type": "manual", "asset.custom_fields.zone": f"Z{index}"},
+                    steps=[{"action": "set_output", "key": "zone", "value": "{{asset.custom_fields.zone}}"}],
+                    is_active=True,
+                )
+                for index in range(count)
+            )
+            scan = ScanEvent.objects.create(
+                tenant=tenant, asset=asset, scanner=user, symbology="qr", raw_value=asset.barcode_value, source_type="rfid"
+            )
+
+            def uncached():
+                for _ in range(args.scans):
+                    invalidate_workflow_plans(tenant.id)
+                    run_scan_post_processing(scan, actor=user)
+
+            def compiled():
+                for _ in range(args.scans):
+                    run_scan_post_processing(scan, actor=user)
+
+            uncached_s = timed(uncached)
+            compiled_s = timed(compiled)
+            rows.append(
+                {
+                    "active_workflows": count,
+                    "scans": args.scans,
+                    "uncached_scans_per_s": round(args.scans / uncached_s),
+                    "compiled_scans_per_s": round(args.scans / compiled_s),
+                    "speedup": round(uncached_s / compiled_s, 2),
+                }
+            )
+        report("workflows", rows)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
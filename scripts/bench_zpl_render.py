@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""Compare labels per second of per-key ``str.replace`` and compiled ZPL rendering.
+
+    python scripts/bench_zpl_render.py --placeholders 1 10 50 --labels 20000
+"""
+
+import argparse
+
+from bench_common import report, timed
+
+
+def _legacy_render_zpl(template: str, context: dict) -> str:
+    rendered = template
+    for key, value in context.items():
+        rendered = rendered.replace("{{" + key + "}}", str(value))
+    return rendered
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--placeholders", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--labels", type=int, default=20000)
+    args = parser.parse_args()
+
+    from assetra.labels import compile_zpl
+
+    rows = []
+    for count in args.placeholders:
+        fields = "".join(f"^FO50,{50 + index * 30}^A0N,25,25^FD{{{{field_{index}}}}}^FS" for index in range(count))
+        template = f"^XA^PW812^LL406{fields}^FO50,20^BCN,80,Y,N,N^FD{{{{code}}}}^FS^XZ"
+        contexts = [{"code": f"LBL-{label}", **{f"field_{index}": f"value-{label}-{index}" for index in range(count)}} for label in range(args.labels)]
+        assert _legacy_render_zpl(template, contexts[0]) == compile_zpl(template).render(contexts[0])
+
+        legacy_s = timed(lambda: [_legacy_render_zpl(template, context) for context in contexts], repeat=3)
+        compiled_s = timed(lambda: [compile_zpl(template).render(context) for context in contexts], repeat=3)
+        rows.append(
+            {
+                "placeholders": count + 1,
+                "template_chars": len(template),
+                "legacy_labels_per_s": round(args.labels / legacy_s),
+                "compiled_labels_per_s": round(args.labels / compiled_s),
+                "speedup": round(legacy_s / compiled_s, 2),
+            }
+        )
+    report("zpl_render", rows)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
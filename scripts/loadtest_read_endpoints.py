@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""Load-test the read endpoints of running deployments: requests/s and p50/p99 latency per target.
+
+Start the same database behind both servers, then compare them in one run:
+
+    gunicorn assetra_platform.wsgi:application --bind 127.0.0.1:8000 --workers 4
+    gunicorn assetra_platform.asgi:application -k uvicorn_worker.UvicornWorker --bind 127.0.0.1:8001 --workers 4
+    python scripts/loadtest_read_endpoints.py --target wsgi=http://127.0.0.1:8000 --target asgi=http://127.0.0.1:8001 \\
+        --username smoke_admin --password 'SmokePass123!' --tenant-id 1 --concurrency 64 --duration 30
+"""
+
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from urllib.parse import urlsplit
+from urllib.request import Request, urlopen
+
+ENDPOINTS = {
+    "lookup": "/api/v1/lookups/assets/?barcode={barcode}",
+    "auth_context": "/api/v1/auth/context/",
+    "live_data": "/api/v1/live-data/",
+}
+
+
+def call_json(base_url: str, path: str, payload: dict, headers: dict | None = None) -> dict:
+    request = Request(
+        f"{base_url}{path}", data=json.dumps(payload).encode(), method="POST", headers={"Content-Type": "application/json", **(headers or {})}
+    )
+    with urlopen(request, timeout=30) as response:
+        return json.loads(response.read())
+
+
+def prepare(base_url: str, username: str, password: str, tenant_id: str) -> tuple[str, str]:
+    """Obtain a token and create an asset whose barcode the lookup requests resolve."""
+    token = call_json(base_url, "/api/v1/auth/token/", {"username": username, "password": password})["access"]
+    barcode = f"LOAD-{uuid.uuid4().hex[:12].upper()}"
+    call_json(
+        base_url,
+        "/api/v1/assets/",
+        {"asset_tag": barcode, "name": "Load test asset", "barcode_value": barcode},
+        headers={"Authorization": f"Bearer {token}", "X-Tenant-ID": tenant_id},
+    )
+    return token, barcode
+
+
+class Connection:
+    """Minimal HTTP/1.1 client over one socket; reconnects when the server closes it."""
+
+    def __init__(self, host: str, port: int, headers: str):
+        self.host, self.port, self.headers = host, port, headers
+        self.reader = self.writer = None
+
+    async def get(self, path: str) -> int:
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        self.writer.write(f"GET {path} HTTP/1.1\r\nHost: {self.host}\r\n{self.headers}\r\n".encode())
+        await self.writer.drain()
+        status = int((await self.reader.readline()).split()[1])
+        headers = {}
+        while (line := await self.reader.readline()) not in (b"\r\n", b""):
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip().lower()
+        if headers.get("transfer-encoding") == "chunked":
+            while size := int((await self.reader.readline()).split(b";")[0], 16):
+                await self.reader.readexactly(size + 2)
+            await self.reader.readline()
+        else:
+            await self.reader.readexactly(int(headers.get("content-length", 0)))
+        if headers.get("connection") == "close":
+            await self.close()
+        return status
+
+    async def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+            self.reader = self.writer = None
+
+
+def percentile(latencies: list[float], fraction: float) -> float:
+    return latencies[min(len(latencies) - 1, int(len(latencies) * fraction))] if latencies else 0.0
+
+
+async def run_endpoint(base_url: str, path: str, headers: str, concurrency: int, duration: float) -> dict:
+    url = urlsplit(base_url)
+    latencies: list[float] = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+
+    async def worker() -> None:
+        nonlocal errors
+        connection = Connection(url.hostname, url.port or 80, headers)
+        try:
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                try:
+                    status = await connection.get(path)
+                except (OSError, ValueError, IndexError, asyncio.IncompleteReadError):
+                    errors += 1
+                    await connection.close()
+                    continue
+                if status == 200:
+                    latencies.append(time.perf_counter() - started)
+                else:
+                    errors += 1
+        finally:
+            await connection.close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "requests_per_s": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+        "errors": errors,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--target", action="append", required=True, help="label=base_url, e.g. asgi=http://127.0.0.1:8001")
+    parser.add_argument("--username", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--tenant-id", required=True)
+    parser.add_argument("--endpoints", nargs="+", choices=sorted(ENDPOINTS), default=list(ENDPOINTS))
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds per endpoint and target")
+    args = parser.parse_args()
+
+    rows = []
+    for target in args.target:
+        label, _, base_url = target.partition("=")
+        base_url = base_url.rstrip("/")
+        token, barcode = prepare(base_url, args.username, args.password, args.tenant_id)
+        headers = f"Authorization: Bearer {token}\r\nX-Tenant-ID: {args.tenant_id}\r\nAccept: application/json\r\n"
+        for endpoint in args.endpoints:
+            path = ENDPOINTS[endpoint].format(barcode=barcode)
+            result = asyncio.run(run_endpoint(base_url, path, headers, args.concurrency, args.duration))
+            rows.append({"target": label, "endpoint": endpoint, "concurrency": args.concurrency, **result})
+    print(json.dumps({"loadtest": "read_endpoints", "results": rows}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
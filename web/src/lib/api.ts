@@ -109,6 +109,12 @@ export type AssetRecord = {
   [key: string]: unknown
 }
 
+export type PaginatedResponse<T> = {
+  next?: string | null
+  previous?: string | null
+  results?: T[]
+}
+
 export type CreateAssetInput = {
   asset_tag: string
   name: string
@@ -198,20 +204,34 @@ export async function getAuthContext(accessToken: string, tenantId: string): Pro
 }
 
 export async function listAssets(accessToken: string, tenantId: string): Promise<AssetRecord[]> {
-  const response = await fetch(getAssetsUrl(), {
-    headers: {
-      Accept: 'application/json',
-      Authorization: `Bearer ${accessToken}`,
-      'X-Tenant-ID': tenantId,
-    },
-  })
+  const records: AssetRecord[] = []
+  let url: string | null = getAssetsUrl()
+
+  // The list is cursor-paginated: follow `next` until the last page.
+  while (url) {
+    const response = await fetch(url, {
+      headers: {
+        Accept: 'application/json',
+        Authorization: `Bearer ${accessToken}`,
+        'X-Tenant-ID': tenantId,
+      },
+    })
+
+    if (!response.ok) {
+      throw await buildApiError(response, `Assets request failed: ${response.status}`)
+    }
 
-  if (!response.ok) {
-    throw await buildApiError(response, `Assets request failed: ${response.status}`)
+    const payload = (await response.json()) as AssetRecord[] | PaginatedResponse<AssetRecord>
+    if (Array.isArray(payload)) {
+      return payload
+    }
+    records.push(...(payload.results ?? []))
+    // Keep only the cursor query so later pages go through the same base URL as the first.
+    const nextQuery = payload.next?.split('?')[1]
+    url = nextQuery ? `${getAssetsUrl()}?${nextQuery}` : null
   }
 
-  const payload = (await response.json()) as AssetRecord[] | { results?: AssetRecord[] }
-  return Array.isArray(payload) ? payload : payload.results ?? []
+  return records
 }
 
 export async function getAssetDetail(